@@ -9,8 +9,12 @@ __license__ = "MIT"
 
 from .core.master_agent import MasterAgent
 from .core.worker_agent import WorkerAgent
+from .core.async_master_agent import AsyncMasterAgent
+from .core.async_worker_agent import AsyncWorkerAgent
 from .memory.project_memory import ProjectMemory
+from .memory.async_project_memory import AsyncProjectMemory
 from .lifecycle.agent_lifecycle import AgentLifecycleManager
+from .lifecycle.async_agent_lifecycle import AsyncAgentLifecycleManager
 from .quality.l1_self_check import SelfChecker
 from .quality.l2_cross_validation import CrossValidator
 from .quality.l3_iam_sdai import IAMSDAI
@@ -18,8 +22,12 @@ from .quality.l3_iam_sdai import IAMSDAI
 __all__ = [
     'MasterAgent',
     'WorkerAgent',
+    'AsyncMasterAgent',
+    'AsyncWorkerAgent',
     'ProjectMemory',
+    'AsyncProjectMemory',
     'AgentLifecycleManager',
+    'AsyncAgentLifecycleManager',
     'SelfChecker',
     'CrossValidator',
     'IAMSDAI'
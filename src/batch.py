@@ -0,0 +1,172 @@
+"""
+Batch entry point for Master Agent System V4.0-B
+
+    python -m src.batch queries.jsonl --output results.jsonl --projects 8 --requests-per-minute 50
+
+Runs many projects concurrently on one event loop (AsyncMasterAgent).
+SOURCE is a JSONL file of {"query": ..., "project_id": ...} objects
+(project_id optional) or a directory of such files plus *.txt / *.md
+files holding one query each (project ID: the file name). All Claude
+calls share one RateLimiter; each project's result and timing is
+appended to --output as soon as it finishes.
+"""
+
+from pathlib import Path
+from typing import Dict, List, Optional
+import asyncio
+import json
+import os
+import sys
+import time
+
+import click
+from dotenv import load_dotenv
+
+from src.core.async_master_agent import AsyncMasterAgent
+from src.core.prompt_registry import get_prompt_registry
+from src.core.rate_limiter import RateLimiter, get_rate_limiter, set_rate_limiter
+from src.lifecycle.agent_lifecycle import AgentLifecycleManager
+from src.memory.storage import parse_scores
+from src.utils.config import get_setting
+from src.utils.metrics import start_metrics_server
+
+
+QUERY_SUFFIXES = (".txt", ".md")
+
+
+def load_projects(source: Path) -> List[Dict]:
+    """{"project_id", "query"} for every query in a JSONL file or directory."""
+    if source.is_dir():
+        files = sorted(p for p in source.iterdir() if p.suffix == ".jsonl" or p.suffix in QUERY_SUFFIXES)
+    else:
+        files = [source]
+
+    projects = []
+    for path in files:
+        if path.suffix in QUERY_SUFFIXES:
+            projects.append({"project_id": path.stem, "query": path.read_text(encoding="utf-8").strip()})
+            continue
+        for line_num, line in enumerate(path.read_text(encoding="utf-8").splitlines(), start=1):
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError as e:
+                raise click.BadParameter(f"{path}:{line_num}: invalid JSON ({e})")
+            if not isinstance(entry, dict) or not entry.get("query"):
+                raise click.BadParameter(f"{path}:{line_num}: expected an object with a \"query\"")
+            projects.append({
+                "project_id": str(entry.get("project_id") or f"{path.stem}_{line_num:04d}"),
+                "query": entry["query"],
+            })
+
+    seen = set()
+    for project in projects:
+        if not project["query"]:
+            raise click.BadParameter(f"Project {project['project_id']}: empty query")
+        if project["project_id"] in seen:
+            raise click.BadParameter(f"Duplicate project ID: {project['project_id']}")
+        seen.add(project["project_id"])
+    return projects
+
+
+async def run_one(api_key: str, project: Dict, resume: bool) -> Dict:
+    """Run one project to completion; failures become a status, not an exception."""
+    master = AsyncMasterAgent(api_key=api_key, resume=resume)
+    started = time.perf_counter()
+    record = {"project_id": project["project_id"], "query": project["query"]}
+    try:
+        await master.run_project(project["query"], project["project_id"])
+        record.update(
+            status="ok",
+            scores=parse_scores(await master.project_memory.read_section("iam_sdai_scores")),
+            critical_path=await master.project_memory.read_section("critical_path"),
+        )
+    except Exception as e:
+        record.update(status="error", error=f"{type(e).__name__}: {e}")
+    finally:
+        if master.project_memory is not None:
+            await master.project_memory.aflush()
+    record.update(
+        seconds=round(time.perf_counter() - started, 3),
+        api_calls=sum(1 for r in master.usage_log + master.worker_usage if not r.get("response_cache_hit")),
+        tokens=master.token_usage(),
+    )
+    return record
+
+
+async def run_batch(api_key: str, projects: List[Dict], output, max_projects: int, resume: bool) -> List[Dict]:
+    """Run up to `max_projects` at once, writing each record to `output` as it finishes."""
+    semaphore = asyncio.Semaphore(max(1, max_projects))
+    started = time.perf_counter()
+
+    async def bounded(project: Dict) -> Dict:
+        async with semaphore:
+            print(f"🚀 Starting project: {project['project_id']}", file=sys.stderr)
+            record = await run_one(api_key, project, resume)
+        record["finished_at"] = round(time.perf_counter() - started, 3)
+        output.write(json.dumps(record, ensure_ascii=False) + "\n")
+        output.flush()
+        icon = "✅" if record["status"] == "ok" else "❌"
+        print(f"{icon} {record['project_id']}: {record['status']} in {record['seconds']:.1f}s", file=sys.stderr)
+        return record
+
+    return list(await asyncio.gather(*(bounded(project) for project in projects)))
+
+
+def configure_rate_limiter(max_concurrent_calls: Optional[int], requests_per_minute: Optional[float],
+                           tokens_per_minute: Optional[float]) -> Optional[RateLimiter]:
+    """Process-wide limiter: command-line limits override api.rate_limits."""
+    overrides = (max_concurrent_calls, requests_per_minute, tokens_per_minute)
+    if all(limit is None for limit in overrides):
+        return get_rate_limiter()
+    settings = get_setting("api", "rate_limits", default={}) or {}
+    configured = (
+        settings.get("max_concurrent_calls"),
+        settings.get("requests_per_minute"),
+        settings.get("tokens_per_minute"),
+    )
+    limiter = RateLimiter(*(o if o is not None else c for o, c in zip(overrides, configured)))
+    set_rate_limiter(limiter)
+    return limiter
+
+
+@click.command()
+@click.argument("source", type=click.Path(exists=True, path_type=Path))
+@click.option("--output", "-o", required=True, type=click.Path(dir_okay=False, path_type=Path),
+              help="JSONL file receiving one record per finished project.")
+@click.option("--projects", "max_projects", default=4, show_default=True,
+              help="Projects running at the same time.")
+@click.option("--max-concurrent-calls", type=int, help="Claude calls in flight (default: api.rate_limits).")
+@click.option("--requests-per-minute", type=float, help="Claude requests per minute (default: api.rate_limits).")
+@click.option("--tokens-per-minute", type=float, help="Claude tokens per minute (default: api.rate_limits).")
+@click.option("--resume/--no-resume", default=False, help="Reuse checkpoints of earlier runs of the same projects.")
+@click.option("--append/--overwrite", default=False, help="Append to --output instead of replacing it.")
+def main(source, output, max_projects, max_concurrent_calls, requests_per_minute, tokens_per_minute,
+         resume, append):
+    """Run every query in SOURCE as a project and stream results to --output."""
+    load_dotenv()
+    api_key = os.getenv("ANTHROPIC_API_KEY")
+    if not api_key:
+        raise click.UsageError("ANTHROPIC_API_KEY not found in environment")
+
+    projects = load_projects(source)
+    start_metrics_server()
+    get_prompt_registry().validate(AgentLifecycleManager.all_worker_types())
+    configure_rate_limiter(max_concurrent_calls, requests_per_minute, tokens_per_minute)
+
+    print(f"📦 {len(projects)} projects from {source}, {max_projects} at a time", file=sys.stderr)
+    started = time.perf_counter()
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "a" if append else "w", encoding="utf-8") as f:
+        records = asyncio.run(run_batch(api_key, projects, f, max_projects, resume))
+
+    failed = sum(1 for record in records if record["status"] != "ok")
+    print(f"📊 {len(records)} projects ({len(records) - failed} ok, {failed} failed) "
+          f"in {time.perf_counter() - started:.1f}s -> {output}", file=sys.stderr)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,5 +2,7 @@
 
 from .master_agent import MasterAgent
 from .worker_agent import WorkerAgent
+from .async_master_agent import AsyncMasterAgent
+from .async_worker_agent import AsyncWorkerAgent
 
-__all__ = ['MasterAgent', 'WorkerAgent']
\ No newline at end of file
+__all__ = ['MasterAgent', 'WorkerAgent', 'AsyncMasterAgent', 'AsyncWorkerAgent']
\ No newline at end of file
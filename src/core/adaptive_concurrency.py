@@ -0,0 +1,248 @@
+"""
+Adaptive concurrency and retries for Claude calls
+An AIMD limit on calls in flight, shared by the whole process: it grows
+by about one call per round of healthy calls and halves on 429 / 529,
+so parallelism settles at what the API sustains instead of a hand-tuned
+max_parallel_workers. Retries use full-jitter exponential backoff, honor
+retry-after and stop at performance.timeouts.worker_execution.
+"""
+
+from contextlib import asynccontextmanager, contextmanager
+from typing import Optional
+import asyncio
+import random
+import threading
+import time
+
+import anthropic
+
+from ..utils import metrics
+from ..utils.config import get_setting
+from .deadline import check_deadline, current_deadline
+
+
+# 429 rate limited, 529 overloaded: the API asks us to slow down
+OVERLOAD_STATUSES = (429, 529)
+RETRYABLE_STATUSES = (408, 409, 429, 500, 502, 503, 504, 529)
+
+
+def status_code(error: BaseException) -> Optional[int]:
+    return getattr(error, "status_code", None) if isinstance(error, anthropic.APIStatusError) else None
+
+
+def is_overloaded(error: BaseException) -> bool:
+    return status_code(error) in OVERLOAD_STATUSES
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Transient API failures: throttling, overload, 5xx, timeouts and dropped connections."""
+    return isinstance(error, anthropic.APIConnectionError) or status_code(error) in RETRYABLE_STATUSES
+
+
+def retry_after_seconds(error: BaseException) -> Optional[float]:
+    """The retry-after header of an API error (seconds form), if any."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    for header in ("retry-after-ms", "retry-after"):
+        value = headers.get(header)
+        if value is None:
+            continue
+        try:
+            seconds = float(value)
+        except ValueError:  # HTTP-date form: fall back to backoff
+            continue
+        return seconds / 1000 if header == "retry-after-ms" else seconds
+    return None
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD limit on Claude calls in flight. A successful call whose latency
+    stays within `latency_tolerance` x the running average adds 1/limit;
+    a 429 / 529 multiplies the limit by `decrease` (once per congestion
+    event: calls already in flight when it was cut do not cut it again)
+    and a retry-after pauses all new calls until it has passed.
+    """
+
+    def __init__(self, initial: float = 8, minimum: float = 1, maximum: float = 64,
+                 decrease: float = 0.5, latency_tolerance: float = 2.0, poll_interval: float = 0.05):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease = decrease
+        self.latency_tolerance = latency_tolerance
+        self.poll_interval = poll_interval
+        self.limit = float(min(max(initial, minimum), maximum))
+
+        self._in_flight = 0
+        self._latency: Optional[float] = None  # EWMA of successful calls
+        self._last_decrease = float("-inf")
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+        metrics.ADAPTIVE_LIMIT.set(self.limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @contextmanager
+    def slot(self):
+        """Block for a slot; the block's outcome adjusts the limit."""
+        while True:
+            wait = self._try_acquire()
+            if not wait:
+                break
+            check_deadline(wait, "concurrency slot")
+            time.sleep(wait)
+        with self._outcome():
+            yield
+
+    @asynccontextmanager
+    async def aslot(self):
+        """slot() without blocking the event loop."""
+        while True:
+            wait = self._try_acquire()
+            if not wait:
+                break
+            check_deadline(wait, "concurrency slot")
+            await asyncio.sleep(wait)
+        with self._outcome():
+            yield
+
+    @contextmanager
+    def _outcome(self):
+        started = time.monotonic()
+        error: Optional[BaseException] = None
+        succeeded = False
+        try:
+            yield
+            succeeded = True
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self._release(started, succeeded, error)
+
+    def _try_acquire(self) -> float:
+        """0.0 once admitted, else seconds to wait before retrying."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._blocked_until:
+                return self._blocked_until - now
+            if self._in_flight >= int(self.limit):
+                return self.poll_interval
+            self._in_flight += 1
+            return 0.0
+
+    def _release(self, started: float, succeeded: bool, error: Optional[BaseException]):
+        with self._lock:
+            self._in_flight -= 1
+            now = time.monotonic()
+            if succeeded:
+                latency = now - started
+                healthy = self._latency is None or latency <= self.latency_tolerance * self._latency
+                self._latency = latency if self._latency is None else 0.9 * self._latency + 0.1 * latency
+                if healthy:
+                    self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            elif error is not None and is_overloaded(error):
+                if started >= self._last_decrease:
+                    self.limit = max(self.minimum, self.limit * self.decrease)
+                    self._last_decrease = now
+                retry_after = retry_after_seconds(error)
+                if retry_after:
+                    self._blocked_until = max(self._blocked_until, now + retry_after)
+            metrics.ADAPTIVE_LIMIT.set(self.limit)
+
+
+class RetryPolicy:
+    """
+    Full-jitter exponential backoff (uniform in [0, min(max_delay,
+    base_delay * 2^attempt)]), never shorter than the server's
+    retry-after, within `deadline` seconds of the first attempt and
+    before the current project / Worker deadline.
+    """
+
+    def __init__(self, max_retries: int = 5, base_delay: float = 1.0, max_delay: float = 30.0,
+                 deadline: Optional[float] = None, rng: Optional[random.Random] = None):
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.deadline = deadline
+        self.rng = rng or random.Random()
+
+    @classmethod
+    def from_config(cls) -> "RetryPolicy":
+        settings = get_setting("api", "retries", default={}) or {}
+        return cls(
+            max_retries=settings.get("max_retries", 5),
+            base_delay=settings.get("base_delay", 1.0),
+            max_delay=settings.get("max_delay", 30.0),
+            deadline=get_setting("performance", "timeouts", "worker_execution", default=None),
+        )
+
+    def delay(self, error: BaseException, attempt: int, started: float) -> Optional[float]:
+        """
+        Seconds to sleep before retry number `attempt` + 1 of a call first
+        tried at `started` (time.monotonic()), or None to give up.
+        """
+        if not is_retryable(error) or attempt >= self.max_retries:
+            return None
+        backoff = self.rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+        delay = max(backoff, retry_after_seconds(error) or 0.0)
+        if self.deadline is not None and time.monotonic() + delay - started > self.deadline:
+            return None
+        current = current_deadline()
+        if current is not None and current.remaining() <= delay:
+            return None
+        return delay
+
+
+_shared_concurrency: Optional[AdaptiveConcurrency] = None
+_shared_policy: Optional[RetryPolicy] = None
+_shared_lock = threading.Lock()
+_configured = False
+
+
+def get_adaptive_concurrency() -> Optional[AdaptiveConcurrency]:
+    """Process-wide limiter from api.adaptive_concurrency, or None when disabled."""
+    global _shared_concurrency, _configured
+    if _configured:
+        return _shared_concurrency
+
+    with _shared_lock:
+        if not _configured:
+            settings = get_setting("api", "adaptive_concurrency", default={}) or {}
+            if settings.get("enabled", False):
+                _shared_concurrency = AdaptiveConcurrency(
+                    initial=settings.get("initial", 8),
+                    minimum=settings.get("min", 1),
+                    maximum=settings.get("max", 64),
+                    decrease=settings.get("decrease_factor", 0.5),
+                    latency_tolerance=settings.get("latency_tolerance", 2.0),
+                )
+            _configured = True
+    return _shared_concurrency
+
+
+def set_adaptive_concurrency(concurrency: Optional[AdaptiveConcurrency]):
+    """Install (or, with None, disable) the process-wide limiter."""
+    global _shared_concurrency, _configured
+    with _shared_lock:
+        _shared_concurrency = concurrency
+        _configured = True
+
+
+def get_retry_policy() -> RetryPolicy:
+    """Process-wide RetryPolicy (api.retries unless one was installed)."""
+    global _shared_policy
+    if _shared_policy is None:
+        with _shared_lock:
+            if _shared_policy is None:
+                _shared_policy = RetryPolicy.from_config()
+    return _shared_policy
+
+
+def set_retry_policy(policy: Optional[RetryPolicy]):
+    """Install a RetryPolicy; None goes back to api.retries."""
+    global _shared_policy
+    with _shared_lock:
+        _shared_policy = policy
@@ -0,0 +1,154 @@
+"""
+Async Master Agent - Non-blocking Leader Component
+Same planning/coordination flow as MasterAgent, built on AsyncAnthropic.
+"""
+
+from typing import Dict
+from datetime import datetime
+import time
+
+from .client_pool import get_shared_async_client
+from .claude_api import acreate_message
+from .deadline import Deadline
+from .master_agent import MasterAgent
+from .prompt_registry import get_prompt_registry
+from ..utils import metrics
+from ..utils.config import get_setting
+from ..lifecycle.worker_graph import format_critical_path
+from ..memory.checkpoints import AsyncCheckpoints
+from ..utils.profiling import PhaseProfiler
+
+
+class AsyncMasterAgent(MasterAgent):
+    """
+    Awaitable Master Agent. One event loop can drive many projects at once,
+    each with its own AsyncProjectMemory and AsyncAgentLifecycleManager.
+    """
+    
+    def _create_client(self, api_key: str):
+        """Shared AsyncAnthropic client for `api_key`."""
+        return get_shared_async_client(api_key)
+    
+    async def run_project(self, user_query: str, project_id: str) -> str:
+        """Run all three phases plus L3 validation and return the final report."""
+        phase1_result = await self.start_project(user_query, project_id)
+        await self.execute_graph_with_lifecycle(phase1_result)
+        return await self.complete_project()
+    
+    async def start_project(self, user_query: str, project_id: str) -> Dict:
+        """Initialize project and create Phase 1 plan."""
+        from ..memory.async_project_memory import AsyncProjectMemory
+        
+        self._started = time.perf_counter()
+        self.deadline = Deadline.after(get_setting("performance", "timeouts", "total_execution", default=None))
+        self.project_memory = AsyncProjectMemory(project_id)
+        self.checkpoints = AsyncCheckpoints(self.project_memory, resume=self.resume)
+        self.profiler = PhaseProfiler.for_memory(self.project_memory) if self._profiling() else None
+        
+        with self._phase("start_project"):
+            if not (self.resume and await self.project_memory.read_section("user_query") == user_query):
+                await self.project_memory.write_sections({
+                    "user_query": user_query,
+                    "start_time": str(datetime.now())
+                })
+            
+            system_prompt = await self._get_master_prompt()
+            plan_hash = self._plan_fingerprint(system_prompt, user_query)
+            phase_plan = await self.checkpoints.load("plan", plan_hash)
+            if phase_plan is None:
+                phase_plan = await self._call_claude(
+                    system_prompt=system_prompt,
+                    user_message=f"Create Phase 1 plan for: {user_query}"
+                )
+                await self.project_memory.write_sections({
+                    "phase1_plan": phase_plan,
+                    **self.checkpoints.sections("plan", plan_hash, phase_plan)
+                })
+            else:
+                print("♻️ Restored Phase 1 plan from checkpoint")
+            
+            metrics.PHASE_SECONDS.labels("plan").observe(time.perf_counter() - self._started)
+            return {"phase": 1, "plan": phase_plan}
+    
+    async def execute_phase_with_lifecycle(self, phase_num: int, plan: Dict) -> Dict:
+        """Execute a phase using Ephemeral Workers."""
+        from ..lifecycle.async_agent_lifecycle import AsyncAgentLifecycleManager
+        
+        with self._phase(f"phase{phase_num}"):
+            started = time.perf_counter()
+            lifecycle_mgr = AsyncAgentLifecycleManager(self.project_memory, checkpoints=self.checkpoints)
+            validator = self._cross_validator()
+            worker_results = await lifecycle_mgr.execute_phase(
+                phase_num=phase_num,
+                plan=plan,
+                on_result=lambda result: self._on_worker_result(validator, result)
+            )
+            
+            validated_results = validator.validate(worker_results)
+            
+            await self.project_memory.write_section(
+                f"phase{phase_num}_results",
+                validated_results
+            )
+            metrics.PHASE_SECONDS.labels(str(phase_num)).observe(time.perf_counter() - started)
+            
+            return validated_results
+    
+    async def execute_graph_with_lifecycle(self, plan: Dict) -> Dict[int, Dict]:
+        """Execute all phases as one Worker dependency graph (see MasterAgent)."""
+        from ..lifecycle.async_agent_lifecycle import AsyncAgentLifecycleManager
+        
+        with self._phase("graph"):
+            started = time.perf_counter()
+            lifecycle_mgr = AsyncAgentLifecycleManager(self.project_memory, checkpoints=self.checkpoints)
+            validators = {phase_num: self._cross_validator() for phase_num in lifecycle_mgr.PHASE_WORKERS}
+            worker_results = await lifecycle_mgr.execute_graph(
+                tasks=self._graph_tasks(lifecycle_mgr, plan),
+                on_result=lambda result: self._on_worker_result(
+                    validators[lifecycle_mgr.GRAPH.phase(result["worker_type"])], result
+                )
+            )
+            
+            validated_results = self._phase_results(lifecycle_mgr, validators, worker_results)
+            await self.project_memory.write_sections({
+                **{f"phase{n}_results": results for n, results in validated_results.items()},
+                "critical_path": format_critical_path(lifecycle_mgr.critical_path())
+            })
+            metrics.PHASE_SECONDS.labels("graph").observe(time.perf_counter() - started)
+            
+            return validated_results
+    
+    async def complete_project(self) -> str:
+        """Finalize project and run L3 IAM-SDAI validation."""
+        from ..quality.l3_iam_sdai import IAMSDAI
+        
+        with self._phase("complete_project"):
+            final_report = await self.project_memory.read_section("phase3_results")
+            
+            l3_validator = IAMSDAI()
+            scores = l3_validator.validate(final_report)
+            
+            await self.project_memory.write_sections({
+                "iam_sdai_scores": str(scores),
+                "end_time": str(datetime.now())
+            })
+            
+            metrics.record_scores(scores)
+            if self._started is not None:
+                metrics.record_project(time.perf_counter() - self._started)
+            
+            return final_report
+    
+    async def _call_claude(self, system_prompt: str, user_message: str, use_cache: bool = True) -> str:
+        """Call Claude API without blocking the event loop."""
+        return await acreate_message(
+            self.client,
+            self._request(system_prompt, user_message),
+            use_cache=use_cache,
+            usage_log=self.usage_log,
+            caller="master"
+        )
+    
+    async def _get_master_prompt(self) -> str:
+        """Master prompt from the shared PromptRegistry (served from memory)."""
+        return get_prompt_registry().master_prompt()
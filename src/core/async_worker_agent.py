@@ -0,0 +1,92 @@
+"""
+Async Worker Agent - Non-blocking specialized executor
+Same task contract as WorkerAgent, built on AsyncAnthropic.
+"""
+
+from typing import AsyncIterator, Dict, Optional
+
+from .client_pool import get_shared_async_client
+from .claude_api import acreate_message, astream_message
+from .prompt_registry import get_prompt_registry
+from .worker_agent import WorkerAgent
+
+
+class AsyncWorkerAgent(WorkerAgent):
+    """
+    WorkerAgent whose Claude call and prompt loading are awaitable.
+    L1 Self-Check and citation extraction are CPU-only and shared with WorkerAgent.
+    """
+    
+    def _create_client(self, api_key: str):
+        """Shared AsyncAnthropic client for `api_key`."""
+        return get_shared_async_client(api_key)
+    
+    async def execute_task(self, task: Dict, project_memory: str) -> Dict:
+        """Execute assigned task with L1 Self-Check."""
+        worker_prompt = await self._load_prompt()
+        self.usage_log = []
+        
+        result = await self._call_claude(
+            system_prompt=worker_prompt,
+            user_message=self._task_message(task),
+            context=self._context_message(project_memory)
+        )
+        
+        return self._package_result(result)
+    
+    async def stream_task(self, task: Dict, project_memory: str) -> "AsyncTaskStream":
+        """Execute assigned task as an async stream (see WorkerAgent.stream_task)."""
+        from ..quality.l1_self_check import SelfChecker
+        
+        self.usage_log = []
+        request = self._request(
+            system_prompt=await self._load_prompt(),
+            user_message=self._task_message(task),
+            context=self._context_message(project_memory)
+        )
+        chunks = astream_message(self.client, request, usage_log=self.usage_log, caller=self.worker_type)
+        return AsyncTaskStream(self, chunks, SelfChecker().start(self.worker_type))
+    
+    async def _call_claude(self, system_prompt: str, user_message: str, use_cache: bool = True,
+                           context: Optional[str] = None) -> str:
+        """Call Claude API without blocking the event loop."""
+        return await acreate_message(
+            self.client,
+            self._request(system_prompt, user_message, context),
+            use_cache=use_cache,
+            usage_log=self.usage_log,
+            caller=self.worker_type
+        )
+    
+    async def _load_prompt(self) -> str:
+        """Worker-specific prompt from the shared PromptRegistry (served from memory)."""
+        return get_prompt_registry().worker_prompt(self.worker_type)
+
+
+
+class AsyncTaskStream:
+    """Async counterpart of TaskStream: `async for` chunks, then `await result()`."""
+    
+    def __init__(self, worker: AsyncWorkerAgent, chunks: AsyncIterator[str], check):
+        self.worker = worker
+        self.check = check
+        self._chunks = chunks
+        self._result: Optional[Dict] = None
+    
+    async def __aiter__(self) -> AsyncIterator[str]:
+        async for chunk in self._chunks:
+            self.check.feed(chunk)
+            yield chunk
+        self._finish()
+    
+    async def result(self) -> Dict:
+        async for _ in self:
+            pass
+        return self._result
+    
+    def _finish(self):
+        if self._result is None:
+            self._result = self.worker._package_validated(
+                self.check.finish(),
+                self.check.document
+            )
@@ -0,0 +1,446 @@
+"""
+Claude call path shared by MasterAgent, WorkerAgent and their async variants.
+Every messages.create / messages.stream request goes through here, so
+cross-cutting concerns (prompt-cache layout, response caching, rate
+limits, adaptive concurrency, retries, deadlines, hedging, usage
+accounting, metrics, ...) are applied in one place.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
+from contextlib import AsyncExitStack, ExitStack, nullcontext
+from contextvars import copy_context
+from typing import AsyncIterator, Awaitable, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple, TypeVar
+import asyncio
+import threading
+import time
+
+from ..utils import metrics
+from ..utils.config import get_setting
+from .adaptive_concurrency import RetryPolicy, get_adaptive_concurrency, get_retry_policy
+from .deadline import request_timeout
+from .hedging import get_hedging
+from .rate_limiter import UNLIMITED, get_rate_limiter, request_tokens
+from .response_cache import ResponseCache, get_response_cache
+
+
+CACHE_CONTROL = {"type": "ephemeral"}
+
+T = TypeVar("T")
+
+# Threads running hedged synchronous calls (primary and duplicate)
+HEDGE_THREADS = 128
+
+USAGE_FIELDS = (
+    "input_tokens",
+    "output_tokens",
+    "cache_creation_input_tokens",
+    "cache_read_input_tokens",
+)
+
+
+def build_request(model: str, max_tokens: int, temperature: float, system_prompt: str,
+                  user_message: str, context: Optional[str] = None,
+                  prompt_caching: Optional[bool] = None) -> Dict:
+    """
+    messages.create parameters laid out for Anthropic prompt caching:
+    stable system prompt, then stable project context, then the task -
+    with a cache_control breakpoint after each stable block.
+    """
+    if prompt_caching is None:
+        prompt_caching = get_setting("api", "prompt_caching", default=True)
+
+    if not prompt_caching:
+        content = f"{user_message}\n\n{context}" if context is not None else user_message
+        return {
+            "model": model,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "system": system_prompt,
+            "messages": [{"role": "user", "content": content}]
+        }
+
+    content = []
+    if context is not None:
+        content.append({"type": "text", "text": context, "cache_control": CACHE_CONTROL})
+    content.append({"type": "text", "text": user_message})
+
+    return {
+        "model": model,
+        "max_tokens": max_tokens,
+        "temperature": temperature,
+        "system": [{"type": "text", "text": system_prompt, "cache_control": CACHE_CONTROL}],
+        "messages": [{"role": "user", "content": content}]
+    }
+
+
+def usage_record(response, response_cache_hit: bool = False) -> Dict:
+    """Token usage of one call, including prompt-cache reads and writes."""
+    usage = getattr(response, "usage", None)
+    record = {field: int(getattr(usage, field, 0) or 0) for field in USAGE_FIELDS}
+    record["response_cache_hit"] = response_cache_hit
+    return record
+
+
+def create_message(client, request: Dict, use_cache: bool = True,
+                   usage_log: Optional[List[Dict]] = None, caller: str = "unknown") -> str:
+    """messages.create(**request) -> response text, served from cache when possible."""
+    cache, cached = _cached(request, use_cache, usage_log, caller)
+    if cached is not None:
+        return cached
+
+    response, record, started = _retrying(
+        lambda: _hedged(lambda sent: _create_once(client, request, caller, sent), caller,
+                        lambda lost: _log(usage_log, lost[1], caller, "hedge", lost[2])),
+        caller,
+    )
+    return _completed(cache, request, response.content[0].text, usage_log, record, caller, "create", started)
+
+
+async def acreate_message(client, request: Dict, use_cache: bool = True,
+                          usage_log: Optional[List[Dict]] = None, caller: str = "unknown") -> str:
+    """Awaitable create_message() for AsyncAnthropic clients."""
+    cache, cached = _cached(request, use_cache, usage_log, caller)
+    if cached is not None:
+        return cached
+
+    response, record, started = await _aretrying(
+        lambda: _ahedged(lambda sent: _acreate_once(client, request, caller, sent), caller,
+                         lambda lost: _log(usage_log, lost[1], caller, "hedge", lost[2])),
+        caller,
+    )
+    return _completed(cache, request, response.content[0].text, usage_log, record, caller, "create", started)
+
+
+def stream_message(client, request: Dict, use_cache: bool = True,
+                   usage_log: Optional[List[Dict]] = None, caller: str = "unknown") -> Iterator[str]:
+    """
+    messages.stream(**request) as text chunks; a cache hit is one chunk.
+    Failures are retried only until the first chunk has arrived.
+    """
+    cache, cached = _cached(request, use_cache, usage_log, caller)
+    if cached is not None:
+        yield cached
+        return
+
+    opened = _retrying(lambda: _open_stream(client, request, caller), caller)
+    chunks = [opened.first]
+    with opened.contexts:
+        try:
+            if opened.first:
+                yield opened.first
+            for text in opened.chunks:
+                chunks.append(text)
+                yield text
+            stream = opened.stream
+            final = stream.get_final_message() if hasattr(stream, "get_final_message") else None
+        except Exception as e:
+            metrics.record_call_error(caller, e)
+            raise
+        record = usage_record(final)
+        opened.permit.settle(record)
+    _completed(cache, request, "".join(chunks), usage_log, record, caller, "stream", opened.started)
+
+
+async def astream_message(client, request: Dict, use_cache: bool = True,
+                          usage_log: Optional[List[Dict]] = None, caller: str = "unknown") -> AsyncIterator[str]:
+    """Awaitable stream_message() for AsyncAnthropic clients."""
+    cache, cached = _cached(request, use_cache, usage_log, caller)
+    if cached is not None:
+        yield cached
+        return
+
+    opened = await _aretrying(lambda: _aopen_stream(client, request, caller), caller)
+    chunks = [opened.first]
+    async with opened.contexts:
+        try:
+            if opened.first:
+                yield opened.first
+            async for text in opened.chunks:
+                chunks.append(text)
+                yield text
+            stream = opened.stream
+            final = await stream.get_final_message() if hasattr(stream, "get_final_message") else None
+        except Exception as e:
+            metrics.record_call_error(caller, e)
+            raise
+        record = usage_record(final)
+        opened.permit.settle(record)
+    _completed(cache, request, "".join(chunks), usage_log, record, caller, "stream", opened.started)
+
+
+def _cached(request: Dict, use_cache: bool, usage_log: Optional[List[Dict]],
+            caller: str) -> Tuple[Optional[ResponseCache], Optional[str]]:
+    """The response cache (None when not used) and its entry for `request`, logging a hit."""
+    cache = get_response_cache() if use_cache else None
+    cached = cache.get(request) if cache is not None else None
+    if cached is not None:
+        _log(usage_log, usage_record(None, response_cache_hit=True), caller)
+    return cache, cached
+
+
+def _completed(cache: Optional[ResponseCache], request: Dict, text: str, usage_log: Optional[List[Dict]],
+               record: Dict, caller: str, mode: str, started: float) -> str:
+    """Log a finished call and cache its text."""
+    _log(usage_log, record, caller, mode, started)
+    if cache is not None:
+        cache.put(request, text)
+    return text
+
+
+def _retrying(attempt: Callable[[], T], caller: str) -> T:
+    """attempt() until it succeeds or the retry policy gives up."""
+    policy, first_try, retries = get_retry_policy(), time.monotonic(), 0
+    while True:
+        try:
+            return attempt()
+        except Exception as e:
+            delay = _retry_delay(policy, e, caller, retries, first_try)
+            if delay is None:
+                raise
+            time.sleep(delay)
+            retries += 1
+
+
+async def _aretrying(attempt: Callable[[], Awaitable[T]], caller: str) -> T:
+    """Awaitable _retrying()."""
+    policy, first_try, retries = get_retry_policy(), time.monotonic(), 0
+    while True:
+        try:
+            return await attempt()
+        except Exception as e:
+            delay = _retry_delay(policy, e, caller, retries, first_try)
+            if delay is None:
+                raise
+            await asyncio.sleep(delay)
+            retries += 1
+
+
+class _OpenStream(NamedTuple):
+    """A streaming attempt that has produced its first chunk."""
+    contexts: ExitStack  # permit, slot and stream, still open (AsyncExitStack for async)
+    permit: object
+    stream: object
+    chunks: Iterator[str]  # after `first` (AsyncIterator for async)
+    first: str  # "" for an empty stream
+    started: float
+
+
+def _open_stream(client, request: Dict, caller: str) -> _OpenStream:
+    """
+    One streaming attempt up to its first chunk: permit, slot, then
+    messages.stream within the current deadline, left open for the caller.
+    """
+    with ExitStack() as contexts:
+        permit = contexts.enter_context(_limit(request))
+        contexts.enter_context(_slot())
+        _admitted(permit, caller)
+        started = time.perf_counter()
+        stream = contexts.enter_context(client.messages.stream(**request, **request_timeout()))
+        chunks = iter(stream.text_stream)
+        first = next(chunks, "")
+        return _OpenStream(contexts.pop_all(), permit, stream, chunks, first, started)
+
+
+async def _aopen_stream(client, request: Dict, caller: str) -> _OpenStream:
+    """Awaitable _open_stream()."""
+    async with AsyncExitStack() as contexts:
+        permit = await contexts.enter_async_context(_alimit(request))
+        await contexts.enter_async_context(_aslot())
+        _admitted(permit, caller)
+        started = time.perf_counter()
+        stream = await contexts.enter_async_context(client.messages.stream(**request, **request_timeout()))
+        chunks = stream.text_stream.__aiter__()
+        first = await anext(chunks, "")
+        return _OpenStream(contexts.pop_all(), permit, stream, chunks, first, started)
+
+
+def _create_once(client, request: Dict, caller: str, sent: Optional[threading.Event] = None) -> Tuple:
+    """
+    One attempt: permit, slot, then messages.create within the current
+    deadline. `sent` is set once the request is admitted and goes out.
+    """
+    with _limit(request) as permit, _slot():
+        _admitted(permit, caller)
+        if sent is not None:
+            sent.set()
+        started = time.perf_counter()
+        response = client.messages.create(**request, **request_timeout())
+        record = usage_record(response)
+        permit.settle(record)
+    return response, record, started
+
+
+async def _acreate_once(client, request: Dict, caller: str, sent: Optional[asyncio.Event] = None) -> Tuple:
+    """Awaitable _create_once()."""
+    async with _alimit(request) as permit, _aslot():
+        _admitted(permit, caller)
+        if sent is not None:
+            sent.set()
+        started = time.perf_counter()
+        response = await client.messages.create(**request, **request_timeout())
+        record = usage_record(response)
+        permit.settle(record)
+    return response, record, started
+
+
+_hedge_executor: Optional[ThreadPoolExecutor] = None
+_hedge_lock = threading.Lock()
+
+
+def _hedge_pool() -> ThreadPoolExecutor:
+    global _hedge_executor
+    with _hedge_lock:
+        if _hedge_executor is None:
+            _hedge_executor = ThreadPoolExecutor(max_workers=HEDGE_THREADS, thread_name_prefix="claude-hedge")
+        return _hedge_executor
+
+
+def _hedged(attempt: Callable[[Optional[threading.Event]], Tuple], caller: str,
+            settle_loser: Callable[[Tuple], None]) -> Tuple:
+    """
+    attempt(sent), duplicated once it has been in flight for the caller's
+    hedging delay; the first success wins. The delay runs from when the
+    primary is admitted (attempt sets `sent`), the clock latency samples
+    use: time queued for the rate limiter or a concurrency slot never
+    triggers a hedge. A primary beaten by its hedge is still sampled, at
+    the latency it had reached, so slow calls keep their place in the
+    window. A losing thread cannot be interrupted: it runs to completion
+    (or its deadline) and, if it succeeds, settle_loser() accounts for it.
+    """
+    hedging = get_hedging()
+    delay = hedging.delay(caller) if hedging is not None else None
+    if delay is None:
+        return attempt(None)
+
+    pool = _hedge_pool()
+    sent = threading.Event()
+    primary = pool.submit(copy_context().run, attempt, sent)
+    primary.add_done_callback(lambda _: sent.set())  # failed before being sent
+    sent.wait()
+    sent_at = time.perf_counter()
+    if wait([primary], timeout=delay).done:
+        return primary.result()
+
+    attempts = {primary: "primary", pool.submit(copy_context().run, attempt, None): "hedge"}
+    error = None
+    for future in as_completed(attempts):
+        try:
+            result = future.result()
+        except Exception as e:
+            error = e
+            continue
+        metrics.HEDGES.labels(caller, attempts[future]).inc()
+        if future is not primary:
+            hedging.record(caller, time.perf_counter() - sent_at)
+        for loser in attempts:
+            if loser is not future:
+                loser.add_done_callback(lambda lost: _settle(lost, settle_loser))
+        return result
+    metrics.HEDGES.labels(caller, "none").inc()
+    raise error
+
+
+async def _ahedged(attempt: Callable[[Optional[asyncio.Event]], Awaitable[Tuple]], caller: str,
+                   settle_loser: Callable[[Tuple], None]) -> Tuple:
+    """Awaitable _hedged(); the losing request is cancelled unless it already finished."""
+    hedging = get_hedging()
+    delay = hedging.delay(caller) if hedging is not None else None
+    if delay is None:
+        return await attempt(None)
+
+    sent = asyncio.Event()
+    primary = asyncio.ensure_future(attempt(sent))
+    primary.add_done_callback(lambda _: sent.set())
+    attempts = {primary: "primary"}
+    winner = None
+    try:
+        await sent.wait()
+        sent_at = time.perf_counter()
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return primary.result()
+
+        attempts[asyncio.ensure_future(attempt(None))] = "hedge"
+        pending, error = set(attempts), None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    winner = task
+                    metrics.HEDGES.labels(caller, attempts[task]).inc()
+                    if task is not primary:
+                        hedging.record(caller, time.perf_counter() - sent_at)
+                    return task.result()
+                error = task.exception()
+        metrics.HEDGES.labels(caller, "none").inc()
+        raise error
+    finally:
+        for task in attempts:
+            if not task.done():
+                task.cancel()
+            elif task is not winner and winner is not None:
+                _settle(task, settle_loser)
+            elif not task.cancelled():
+                task.exception()  # retrieved: no "exception never retrieved" warning
+
+
+def _settle(attempt, settle_loser: Callable[[Tuple], None]):
+    """Account for a finished losing attempt (a future or task) if it succeeded."""
+    if not attempt.cancelled() and attempt.exception() is None:
+        settle_loser(attempt.result())
+
+
+def _limit(request: Dict):
+    """Slot from the process-wide RateLimiter (a no-op permit without one)."""
+    limiter = get_rate_limiter()
+    return limiter.limit(request_tokens(request)) if limiter is not None else nullcontext(UNLIMITED)
+
+
+def _alimit(request: Dict):
+    """Awaitable _limit()."""
+    limiter = get_rate_limiter()
+    return limiter.alimit(request_tokens(request)) if limiter is not None else nullcontext(UNLIMITED)
+
+
+def _slot():
+    """Slot from the process-wide AdaptiveConcurrency (a no-op without one)."""
+    concurrency = get_adaptive_concurrency()
+    return concurrency.slot() if concurrency is not None else nullcontext()
+
+
+def _aslot():
+    """Awaitable _slot()."""
+    concurrency = get_adaptive_concurrency()
+    return concurrency.aslot() if concurrency is not None else nullcontext()
+
+
+def _retry_delay(policy: RetryPolicy, error: Exception, caller: str, attempt: int,
+                 first_try: float) -> Optional[float]:
+    """Record a failed attempt; seconds until the next one, or None to give up."""
+    metrics.record_call_error(caller, error)
+    delay = policy.delay(error, attempt, first_try)
+    if delay is not None:
+        metrics.RETRIES.labels(caller, type(error).__name__).inc()
+        print(f"⚠️ {caller}: {type(error).__name__}, retry {attempt + 1} in {delay:.1f}s")
+    return delay
+
+
+def _admitted(permit, caller: str):
+    """Export how long the call waited for the rate limiter."""
+    if permit.limiter is not None:
+        metrics.RATE_LIMIT_WAIT_SECONDS.labels(caller).observe(permit.waited)
+
+
+def _log(usage_log: Optional[List[Dict]], record: Dict, caller: str,
+         mode: str = "cache", started: Optional[float] = None):
+    """
+    Append the call's usage record and export it as metrics (and, for
+    create, to hedging; a hedged call's losing attempt is logged as "hedge").
+    """
+    elapsed = time.perf_counter() - started if started is not None else 0.0
+    metrics.record_call(caller, mode, elapsed, record)
+    hedging = get_hedging() if mode == "create" else None
+    if hedging is not None:
+        hedging.record(caller, elapsed)
+    if usage_log is not None:
+        usage_log.append(record)
@@ -0,0 +1,115 @@
+"""
+Shared Anthropic Client Pool
+One process-wide client (and HTTP connection pool) per API key, shared by
+the Master and every Worker so TLS sessions stay warm across phases.
+"""
+
+from typing import Dict, Optional
+import threading
+
+import anthropic
+
+from ..utils.config import get_setting
+
+try:  # anthropic >= 1.0 ships its transport as httpx2
+    import httpx2 as httpx
+except ImportError:
+    import httpx
+
+
+_sync_clients: Dict[Optional[str], anthropic.Anthropic] = {}
+_async_clients: Dict[Optional[str], anthropic.AsyncAnthropic] = {}
+_lock = threading.Lock()
+
+
+def _pool_settings() -> Dict:
+    """Connection pool settings from api.anthropic.connection_pool."""
+    settings = get_setting("api", "anthropic", "connection_pool", default={}) or {}
+    return {
+        "max_connections": settings.get("max_connections", 100),
+        "max_keepalive_connections": settings.get("max_keepalive_connections", 20),
+        "keepalive_expiry": settings.get("keepalive_expiry", 30.0),
+        "timeout": settings.get("timeout", 600.0),
+    }
+
+
+def _limits(settings: Dict) -> "httpx.Limits":
+    return httpx.Limits(
+        max_connections=settings["max_connections"],
+        max_keepalive_connections=settings["max_keepalive_connections"],
+        keepalive_expiry=settings["keepalive_expiry"],
+    )
+
+
+def get_shared_client(api_key: Optional[str] = None) -> anthropic.Anthropic:
+    """Return the process-wide sync client for `api_key`, creating it once."""
+    client = _sync_clients.get(api_key)
+    if client is not None:
+        return client
+    
+    with _lock:
+        if api_key not in _sync_clients:
+            settings = _pool_settings()
+            _sync_clients[api_key] = anthropic.Anthropic(
+                api_key=api_key,
+                max_retries=0,  # claude_api retries (with adaptive concurrency) instead
+                http_client=anthropic.DefaultHttpxClient(
+                    limits=_limits(settings),
+                    timeout=settings["timeout"],
+                ),
+            )
+        return _sync_clients[api_key]
+
+
+def get_shared_async_client(api_key: Optional[str] = None) -> anthropic.AsyncAnthropic:
+    """
+    Return the process-wide async client for `api_key`, creating it once.
+    The underlying pool is bound to the event loop that first uses it.
+    """
+    client = _async_clients.get(api_key)
+    if client is not None:
+        return client
+    
+    with _lock:
+        if api_key not in _async_clients:
+            settings = _pool_settings()
+            _async_clients[api_key] = anthropic.AsyncAnthropic(
+                api_key=api_key,
+                max_retries=0,  # claude_api retries (with adaptive concurrency) instead
+                http_client=anthropic.DefaultAsyncHttpxClient(
+                    limits=_limits(settings),
+                    timeout=settings["timeout"],
+                ),
+            )
+        return _async_clients[api_key]
+
+
+def set_shared_client(api_key: Optional[str], client, async_client: bool = False):
+    """
+    Install `client` as the shared client for `api_key` (e.g. an offline
+    stand-in for benchmarks); None removes the entry.
+    """
+    clients = _async_clients if async_client else _sync_clients
+    with _lock:
+        if client is None:
+            clients.pop(api_key, None)
+        else:
+            clients[api_key] = client
+
+
+def close_shared_clients():
+    """Close pooled sync clients and forget async ones (e.g. at shutdown or in tests)."""
+    with _lock:
+        for client in _sync_clients.values():
+            client.close()
+        _sync_clients.clear()
+        _async_clients.clear()
+
+
+async def aclose_shared_clients():
+    """Close pooled async clients from within their event loop."""
+    with _lock:
+        clients = list(_async_clients.values())
+        _async_clients.clear()
+    for client in clients:
+        await client.close()
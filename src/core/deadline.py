@@ -0,0 +1,85 @@
+"""
+Deadline propagation for Master Agent V4.0-B
+A project gets performance.timeouts.total_execution, each Worker task at
+most performance.timeouts.worker_execution of what is left. The current
+deadline travels in a context variable, so every Claude call made on a
+project's behalf (threads via copy_context(), asyncio tasks implicitly)
+sees it without being passed it explicitly.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+import time
+
+
+class DeadlineExceeded(TimeoutError):
+    """Work was abandoned because its project or Worker ran out of time."""
+
+
+class Deadline:
+    """Absolute point in time.monotonic() by which work must finish."""
+
+    def __init__(self, expires_at: float):
+        self.expires_at = expires_at
+
+    @classmethod
+    def after(cls, seconds: Optional[float]) -> Optional["Deadline"]:
+        return cls(time.monotonic() + seconds) if seconds else None
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def child(self, seconds: Optional[float]) -> "Deadline":
+        """A deadline `seconds` from now, never later than this one."""
+        if not seconds:
+            return self
+        return Deadline(min(self.expires_at, time.monotonic() + seconds))
+
+
+_current: ContextVar[Optional[Deadline]] = ContextVar("deadline", default=None)
+
+
+def current_deadline() -> Optional[Deadline]:
+    return _current.get()
+
+
+def child_deadline(seconds: Optional[float]) -> Optional[Deadline]:
+    """`seconds` from now, capped by the current deadline (None: no limit at all)."""
+    parent = _current.get()
+    if parent is None:
+        return Deadline.after(seconds)
+    return parent.child(seconds)
+
+
+@contextmanager
+def deadline_scope(deadline: Optional[Deadline]):
+    """Make `deadline` current for the block (None leaves the current one)."""
+    if deadline is None:
+        yield _current.get()
+        return
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+
+def check_deadline(wait: float = 0.0, what: str = "call"):
+    """Raise DeadlineExceeded if the current deadline passes within `wait` seconds."""
+    deadline = _current.get()
+    if deadline is not None and deadline.remaining() <= wait:
+        raise DeadlineExceeded(f"Deadline exceeded before {what}")
+
+
+def request_timeout() -> dict:
+    """messages.create keyword: the current deadline's remaining seconds as the HTTP timeout."""
+    deadline = _current.get()
+    if deadline is None:
+        return {}
+    check_deadline()
+    return {"timeout": deadline.remaining()}
+
@@ -0,0 +1,78 @@
+"""
+Hedged Claude requests
+A call still running after the `percentile`-th latency of its caller's
+recent calls gets a duplicate; whichever finishes first wins and the
+other is cancelled (async) or abandoned (threads cannot be interrupted).
+Costs roughly (100 - percentile)% extra calls, caps tail latency near
+the percentile instead of the slowest call.
+"""
+
+from collections import defaultdict, deque
+from typing import Deque, Dict, Optional
+import threading
+
+from ..utils.config import get_setting
+
+
+class Hedging:
+    """Per-caller latency window deciding when to fire a duplicate request."""
+
+    def __init__(self, percentile: float = 95, min_samples: int = 20, window: int = 200,
+                 min_delay: float = 0.0):
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.window = window
+        self.min_delay = min_delay
+        self._latencies: Dict[str, Deque[float]] = defaultdict(lambda: deque(maxlen=self.window))
+        self._lock = threading.Lock()
+
+    def record(self, caller: str, seconds: float):
+        """
+        Latency of one successful non-streaming call, or of a primary beaten
+        by its hedge up to that moment (a lower bound, but keeping slow calls
+        out of the window would drag the percentile, and the delay, down).
+        """
+        with self._lock:
+            self._latencies[caller].append(seconds)
+
+    def delay(self, caller: str) -> Optional[float]:
+        """Seconds to wait before hedging a call, or None until enough samples exist."""
+        with self._lock:
+            samples = sorted(self._latencies.get(caller, ()))
+        if len(samples) < max(1, self.min_samples):
+            return None
+        index = min(len(samples) - 1, int(len(samples) * self.percentile / 100))
+        return max(self.min_delay, samples[index])
+
+
+_shared_hedging: Optional[Hedging] = None
+_shared_lock = threading.Lock()
+_configured = False
+
+
+def get_hedging() -> Optional[Hedging]:
+    """Process-wide Hedging from api.hedging, or None when disabled."""
+    global _shared_hedging, _configured
+    if _configured:
+        return _shared_hedging
+
+    with _shared_lock:
+        if not _configured:
+            settings = get_setting("api", "hedging", default={}) or {}
+            if settings.get("enabled", False):
+                _shared_hedging = Hedging(
+                    percentile=settings.get("percentile", 95),
+                    min_samples=settings.get("min_samples", 20),
+                    window=settings.get("window", 200),
+                    min_delay=settings.get("min_delay", 0.0),
+                )
+            _configured = True
+    return _shared_hedging
+
+
+def set_hedging(hedging: Optional[Hedging]):
+    """Install (or, with None, disable) process-wide hedging."""
+    global _shared_hedging, _configured
+    with _shared_lock:
+        _shared_hedging = hedging
+        _configured = True
@@ -3,9 +3,19 @@ Master Agent V4.0-B - Leader Component
 Handles strategic planning and Worker coordination only.
 """
 
+from contextlib import contextmanager, nullcontext
 from typing import Dict, List, Optional
 from datetime import datetime
-import anthropic
+import time
+from .client_pool import get_shared_client
+from .claude_api import USAGE_FIELDS, build_request, create_message
+from .deadline import Deadline, deadline_scope
+from .prompt_registry import get_prompt_registry
+from ..utils import metrics
+from ..utils.config import get_setting
+from ..lifecycle.worker_graph import format_critical_path
+from ..memory.checkpoints import Checkpoints, fingerprint
+from ..utils.profiling import PhaseProfiler
 
 
 class MasterAgent:
@@ -14,89 +24,224 @@ class MasterAgent:
     Never performs actual research - only strategizes and coordinates.
     """
     
-    def __init__(self, api_key: str, model: str = "claude-opus-4-20250514"):
-        self.client = anthropic.Anthropic(api_key=api_key)
+    def __init__(self, api_key: str, model: str = "claude-opus-4-20250514", profile: Optional[bool] = None,
+                 resume: bool = False):
+        self.client = self._create_client(api_key)
         self.model = model
         self.temperature = 0.1
         self.project_memory = None
+        self.usage_log: List[Dict] = []  # Token usage per Claude call
+        self.worker_usage: List[Dict] = []  # Token usage of this project's Worker calls
+        self._started: Optional[float] = None  # perf_counter() at start_project
+        self.deadline: Optional[Deadline] = None  # performance.timeouts.total_execution from start_project
+        self.profile = profile  # None: performance.profiling.enabled
+        self.profiler: Optional[PhaseProfiler] = None
+        self.resume = resume  # Reuse checkpoints whose inputs are unchanged
+        self.checkpoints = None
         
     def start_project(self, user_query: str, project_id: str) -> Dict:
         """Initialize project and create Phase 1 plan."""
         from ..memory.project_memory import ProjectMemory
         
         # Initialize PROJECT_MEMORY.md
+        self._started = time.perf_counter()
+        self.deadline = Deadline.after(get_setting("performance", "timeouts", "total_execution", default=None))
         self.project_memory = ProjectMemory(project_id)
-        self.project_memory.write_section("user_query", user_query)
-        self.project_memory.write_section("start_time", str(datetime.now()))
+        self.checkpoints = Checkpoints(self.project_memory, resume=self.resume)
+        self.profiler = PhaseProfiler.for_memory(self.project_memory) if self._profiling() else None
         
-        # Create Phase 1 plan (delegation to Workers)
-        system_prompt = self._get_master_prompt()
-        phase_plan = self._call_claude(
-            system_prompt=system_prompt,
-            user_message=f"Create Phase 1 plan for: {user_query}"
-        )
-        
-        self.project_memory.write_section("phase1_plan", phase_plan)
-        return {"phase": 1, "plan": phase_plan}
+        with self._phase("start_project"):
+            if not (self.resume and self.project_memory.read_section("user_query") == user_query):
+                self.project_memory.write_sections({
+                    "user_query": user_query,
+                    "start_time": str(datetime.now())
+                })
+            
+            # Create Phase 1 plan (delegation to Workers), unless a resumed
+            # run already has one for the same query and prompt
+            system_prompt = self._get_master_prompt()
+            plan_hash = self._plan_fingerprint(system_prompt, user_query)
+            phase_plan = self.checkpoints.load("plan", plan_hash)
+            if phase_plan is None:
+                phase_plan = self._call_claude(
+                    system_prompt=system_prompt,
+                    user_message=f"Create Phase 1 plan for: {user_query}"
+                )
+                self.project_memory.write_sections({
+                    "phase1_plan": phase_plan,
+                    **self.checkpoints.sections("plan", plan_hash, phase_plan)
+                })
+            else:
+                print("♻️ Restored Phase 1 plan from checkpoint")
+            
+            metrics.PHASE_SECONDS.labels("plan").observe(time.perf_counter() - self._started)
+            return {"phase": 1, "plan": phase_plan}
     
     def execute_phase_with_lifecycle(self, phase_num: int, plan: Dict) -> Dict:
         """Execute a phase using Ephemeral Workers."""
         from ..lifecycle.agent_lifecycle import AgentLifecycleManager
         
-        lifecycle_mgr = AgentLifecycleManager(self.project_memory)
-        
-        # Summon Workers for this phase
-        worker_results = lifecycle_mgr.execute_phase(
-            phase_num=phase_num,
-            plan=plan
-        )
-        
-        # Aggregate results and perform L2 Cross-Validation
-        validated_results = self._cross_validate(worker_results)
-        
-        # Store in PROJECT_MEMORY
-        self.project_memory.write_section(
-            f"phase{phase_num}_results",
-            validated_results
-        )
+        with self._phase(f"phase{phase_num}"):
+            started = time.perf_counter()
+            lifecycle_mgr = AgentLifecycleManager(self.project_memory, checkpoints=self.checkpoints)
+            
+            # L2 Cross-Validation runs as each Worker finishes
+            validator = self._cross_validator()
+            
+            # Summon Workers for this phase
+            worker_results = lifecycle_mgr.execute_phase(
+                phase_num=phase_num,
+                plan=plan,
+                on_result=lambda result: self._on_worker_result(validator, result)
+            )
+            
+            # Aggregate results (already cross-validated)
+            validated_results = validator.validate(worker_results)
+            
+            # Store in PROJECT_MEMORY
+            self.project_memory.write_section(
+                f"phase{phase_num}_results",
+                validated_results
+            )
+            metrics.PHASE_SECONDS.labels(str(phase_num)).observe(time.perf_counter() - started)
+            
+            return validated_results
+    
+    def execute_graph_with_lifecycle(self, plan: Dict) -> Dict[int, Dict]:
+        """
+        Execute all phases as one Worker dependency graph: each Worker starts
+        as soon as the Workers it depends on finish, not at phase boundaries.
+        Results are still cross-validated and stored per phase.
+        """
+        from ..lifecycle.agent_lifecycle import AgentLifecycleManager
         
-        return validated_results
+        with self._phase("graph"):
+            started = time.perf_counter()
+            lifecycle_mgr = AgentLifecycleManager(self.project_memory, checkpoints=self.checkpoints)
+            
+            # One incremental L2 validator per phase, fed as Workers finish
+            validators = {phase_num: self._cross_validator() for phase_num in lifecycle_mgr.PHASE_WORKERS}
+            worker_results = lifecycle_mgr.execute_graph(
+                tasks=self._graph_tasks(lifecycle_mgr, plan),
+                on_result=lambda result: self._on_worker_result(
+                    validators[lifecycle_mgr.GRAPH.phase(result["worker_type"])], result
+                )
+            )
+            
+            # Store each phase's results plus the critical path in PROJECT_MEMORY
+            validated_results = self._phase_results(lifecycle_mgr, validators, worker_results)
+            self.project_memory.write_sections({
+                **{f"phase{n}_results": results for n, results in validated_results.items()},
+                "critical_path": format_critical_path(lifecycle_mgr.critical_path())
+            })
+            metrics.PHASE_SECONDS.labels("graph").observe(time.perf_counter() - started)
+            
+            return validated_results
     
     def complete_project(self) -> str:
         """Finalize project and run L3 IAM-SDAI validation."""
         from ..quality.l3_iam_sdai import IAMSDAI
         
         # Get final report from PROJECT_MEMORY
-        final_report = self.project_memory.read_section("phase3_results")
-        
-        # L3 Validation
-        l3_validator = IAMSDAI()
-        scores = l3_validator.validate(final_report)
-        
-        self.project_memory.write_section("iam_sdai_scores", str(scores))
-        self.project_memory.write_section("end_time", str(datetime.now()))
-        
-        return final_report
+        with self._phase("complete_project"):
+            final_report = self.project_memory.read_section("phase3_results")
+            
+            # L3 Validation
+            l3_validator = IAMSDAI()
+            scores = l3_validator.validate(final_report)
+            
+            self.project_memory.write_sections({
+                "iam_sdai_scores": str(scores),
+                "end_time": str(datetime.now())
+            })
+            
+            metrics.record_scores(scores)
+            if self._started is not None:
+                metrics.record_project(time.perf_counter() - self._started)
+            
+            return final_report
     
     def _cross_validate(self, worker_results: List[Dict]) -> Dict:
         """L2: Cross-validate Worker outputs for contradictions."""
+        return self._cross_validator().validate(worker_results)
+    
+    def _cross_validator(self):
+        """Fresh incremental L2 validator for one phase."""
         from ..quality.l2_cross_validation import CrossValidator
-        
-        validator = CrossValidator()
-        return validator.validate(worker_results)
+        return CrossValidator()
+    
+    def token_usage(self) -> Dict[str, int]:
+        """Tokens of every Claude call of the project so far (Master and Workers)."""
+        records = self.usage_log + self.worker_usage
+        return {field: sum(record.get(field, 0) for record in records) for field in USAGE_FIELDS}
+    
+    def _on_worker_result(self, validator, result: Dict):
+        """L2 on a just-finished Worker: surface contradictions immediately."""
+        if not result.get("restored"):
+            self.worker_usage.extend(result.get("usage", []))
+        for contradiction in validator.add(result):
+            print(f"⚠️ L2 contradiction: {contradiction}")
+    
+    def _graph_tasks(self, lifecycle_mgr, plan: Dict) -> Dict:
+        """Task per Worker type: its own plan entry, else the Phase 1 plan."""
+        tasks = {}
+        for worker_type in lifecycle_mgr.GRAPH.order:
+            task = plan.get(worker_type) or plan.get("plan")
+            if task:
+                tasks[worker_type] = task
+        return tasks
+    
+    def _phase_results(self, lifecycle_mgr, validators: Dict, worker_results: Dict[str, Dict]) -> Dict[int, Dict]:
+        """L2-validated results per phase, Workers in declaration order."""
+        return {
+            phase_num: validators[phase_num].validate(
+                [worker_results[t] for t in worker_types if t in worker_results]
+            )
+            for phase_num, worker_types in lifecycle_mgr.PHASE_WORKERS.items()
+        }
+    
+    def _plan_fingerprint(self, system_prompt: str, user_query: str) -> str:
+        """Checkpoint key of the Phase 1 plan: everything the plan call depends on."""
+        return fingerprint(self.model, self.temperature, system_prompt, user_query)
+    
+    def _profiling(self) -> bool:
+        """Opt-in per-phase profiling (constructor flag, else config)."""
+        return PhaseProfiler.enabled() if self.profile is None else self.profile
     
-    def _call_claude(self, system_prompt: str, user_message: str) -> str:
-        """Call Claude API."""
-        response = self.client.messages.create(
+    def _profiled(self, phase: str):
+        """cProfile + tracemalloc around a phase when profiling is on."""
+        return self.profiler.phase(phase) if self.profiler is not None else nullcontext()
+    
+    @contextmanager
+    def _phase(self, phase: str):
+        """A step of the project: within the project deadline, profiled when profiling is on."""
+        with deadline_scope(self.deadline), self._profiled(phase):
+            yield
+    
+    def _create_client(self, api_key: str):
+        """Shared Anthropic client for `api_key` (the only state async subclasses swap)."""
+        return get_shared_client(api_key)
+    
+    def _call_claude(self, system_prompt: str, user_message: str, use_cache: bool = True) -> str:
+        """Call Claude API (through the response cache when enabled)."""
+        return create_message(
+            self.client,
+            self._request(system_prompt, user_message),
+            use_cache=use_cache,
+            usage_log=self.usage_log,
+            caller="master"
+        )
+    
+    def _request(self, system_prompt: str, user_message: str) -> Dict:
+        """messages.create parameters (cacheable system prompt first)."""
+        return build_request(
             model=self.model,
             max_tokens=4096,
             temperature=self.temperature,
-            system=system_prompt,
-            messages=[{"role": "user", "content": user_message}]
+            system_prompt=system_prompt,
+            user_message=user_message
         )
-        return response.content[0].text
     
     def _get_master_prompt(self) -> str:
-        """Load Master prompt from file."""
-        with open("prompts/master_prompt_v4.0b.md", "r") as f:
-            return f.read()
\ No newline at end of file
+        """Master prompt from the shared PromptRegistry."""
+        return get_prompt_registry().master_prompt()
\ No newline at end of file
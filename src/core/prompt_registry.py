@@ -0,0 +1,123 @@
+"""
+Prompt Registry
+Preloads prompts/ once, serves them from memory and reloads a file only when
+its mtime changes. Each prompt carries a content hash so caches and
+checkpoints can key on prompt versions.
+"""
+
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+import hashlib
+import os
+import threading
+import time
+
+
+DEFAULT_PROMPT_DIR = Path(__file__).resolve().parents[2] / "prompts"
+MASTER_PROMPT = "master_prompt_v4.0b"
+
+
+class PromptRegistry:
+    """
+    In-memory registry of prompt files, keyed by path relative to prompt_dir
+    without the .md suffix (e.g. "master_prompt_v4.0b",
+    "worker_prompts/market_research").
+    """
+
+    def __init__(self, prompt_dir: Optional[str] = None, check_interval: float = 1.0):
+        self.prompt_dir = Path(prompt_dir or os.getenv("PROMPT_DIR") or DEFAULT_PROMPT_DIR)
+        self.check_interval = check_interval
+        # name -> (content, sha256, mtime_ns, last_checked)
+        self._prompts: Dict[str, Tuple[str, str, int, float]] = {}
+        self._lock = threading.Lock()
+
+    def preload(self) -> List[str]:
+        """Load every *.md under prompt_dir (except README.md); returns the names."""
+        names = []
+        for path in sorted(self.prompt_dir.rglob("*.md")):
+            if path.name.lower() == "readme.md":
+                continue
+            name = path.relative_to(self.prompt_dir).with_suffix("").as_posix()
+            self._load(name)
+            names.append(name)
+        return names
+
+    def validate(self, worker_types: Iterable[str]) -> None:
+        """Raise FileNotFoundError naming every missing Master / Worker prompt."""
+        required = [MASTER_PROMPT] + [f"worker_prompts/{w}" for w in worker_types]
+        missing = [name for name in required if not self._path(name).exists()]
+        if missing:
+            raise FileNotFoundError(
+                f"Missing prompts in {self.prompt_dir}: " + ", ".join(f"{m}.md" for m in missing)
+            )
+
+    def get(self, name: str) -> str:
+        """Prompt text, reloaded only if the file's mtime changed."""
+        return self._entry(name)[0]
+
+    def content_hash(self, name: str) -> str:
+        """SHA-256 of the prompt text currently served for `name`."""
+        return self._entry(name)[1]
+
+    def master_prompt(self) -> str:
+        return self.get(MASTER_PROMPT)
+
+    def worker_prompt(self, worker_type: str) -> str:
+        return self.get(f"worker_prompts/{worker_type}")
+
+    def _entry(self, name: str) -> Tuple[str, str, int, float]:
+        entry = self._prompts.get(name)
+        if entry is None:
+            return self._load(name)
+
+        now = time.monotonic()
+        if now - entry[3] < self.check_interval:
+            return entry
+
+        mtime_ns = self._path(name).stat().st_mtime_ns
+        if mtime_ns != entry[2]:
+            return self._load(name)
+
+        entry = entry[:3] + (now,)
+        self._prompts[name] = entry
+        return entry
+
+    def _load(self, name: str) -> Tuple[str, str, int, float]:
+        path = self._path(name)
+        with self._lock:
+            mtime_ns = path.stat().st_mtime_ns
+            content = path.read_text(encoding="utf-8")
+            entry = (
+                content,
+                hashlib.sha256(content.encode("utf-8")).hexdigest(),
+                mtime_ns,
+                time.monotonic()
+            )
+            self._prompts[name] = entry
+            return entry
+
+    def _path(self, name: str) -> Path:
+        return self.prompt_dir / f"{name}.md"
+
+
+_shared_registry: Optional[PromptRegistry] = None
+_shared_lock = threading.Lock()
+
+
+def get_prompt_registry() -> PromptRegistry:
+    """Process-wide registry (preloaded on first use)."""
+    global _shared_registry
+    if _shared_registry is None:
+        with _shared_lock:
+            if _shared_registry is None:
+                registry = PromptRegistry()
+                registry.preload()
+                _shared_registry = registry
+    return _shared_registry
+
+
+def set_prompt_registry(registry: Optional[PromptRegistry]):
+    """Install a registry (e.g. a different prompt_dir); None resets to default."""
+    global _shared_registry
+    with _shared_lock:
+        _shared_registry = registry
@@ -0,0 +1,185 @@
+"""
+Process-wide rate limiting for Claude calls
+Token buckets for requests per minute and tokens per minute plus a cap on
+calls in flight, shared by MasterAgent, every Worker and every project in
+the process - threads and event loops alike.
+"""
+
+from contextlib import asynccontextmanager, contextmanager
+from typing import Dict, Optional
+import asyncio
+import threading
+import time
+
+from .deadline import check_deadline
+from ..utils.config import get_setting
+from ..utils.tokens import estimate_tokens
+
+
+class Permit:
+    """One admitted call. settle() replaces the token estimate with the billed usage."""
+
+    def __init__(self, limiter: Optional["RateLimiter"], tokens: int):
+        self.limiter = limiter
+        self.tokens = tokens
+        self.waited = 0.0
+
+    def settle(self, usage: Optional[Dict]):
+        if self.limiter is not None and usage:
+            billed = sum(usage.get(field, 0) for field in RateLimiter.BILLED_FIELDS)
+            self.limiter._adjust(billed - self.tokens)
+            self.tokens = billed
+
+
+class RateLimiter:
+    """
+    Admits a call once a concurrency slot, one request and its estimated
+    input tokens are available. Buckets hold one minute's worth and refill
+    continuously; settle() charges output tokens (and any estimate error)
+    after the call, so an overshoot delays the calls that follow it.
+    None / 0 for a limit means unlimited.
+    """
+
+    # Usage counted against tokens_per_minute (cache reads are not)
+    BILLED_FIELDS = ("input_tokens", "cache_creation_input_tokens", "output_tokens")
+
+    def __init__(self, max_concurrent: Optional[int] = None, requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None, poll_interval: float = 0.05):
+        self.max_concurrent = max_concurrent or None
+        self.requests_per_minute = requests_per_minute or None
+        self.tokens_per_minute = tokens_per_minute or None
+        self.poll_interval = poll_interval
+
+        self._requests = float(self.requests_per_minute or 0)
+        self._tokens = float(self.tokens_per_minute or 0)
+        self._updated = time.monotonic()
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def limit(self, tokens: int):
+        """Block until the call may start; the slot is freed on exit."""
+        permit = Permit(self, tokens)
+        started = time.perf_counter()
+        while True:
+            wait = self._try_acquire(tokens)
+            if not wait:
+                break
+            check_deadline(wait, "rate limit")
+            time.sleep(wait)
+        permit.waited = time.perf_counter() - started
+        try:
+            yield permit
+        finally:
+            self._release()
+
+    @asynccontextmanager
+    async def alimit(self, tokens: int):
+        """limit() without blocking the event loop."""
+        permit = Permit(self, tokens)
+        started = time.perf_counter()
+        while True:
+            wait = self._try_acquire(tokens)
+            if not wait:
+                break
+            check_deadline(wait, "rate limit")
+            await asyncio.sleep(wait)
+        permit.waited = time.perf_counter() - started
+        try:
+            yield permit
+        finally:
+            self._release()
+
+    def _try_acquire(self, tokens: int) -> float:
+        """0.0 once the call is admitted, else seconds to wait before retrying."""
+        with self._lock:
+            self._refill()
+            waits = []
+            if self.max_concurrent and self._in_flight >= self.max_concurrent:
+                waits.append(self.poll_interval)
+            if self.requests_per_minute and self._requests < 1:
+                waits.append((1 - self._requests) * 60 / self.requests_per_minute)
+            # A call larger than the whole bucket waits for a full bucket
+            needed = min(tokens, self.tokens_per_minute or 0)
+            if self.tokens_per_minute and self._tokens < needed:
+                waits.append((needed - self._tokens) * 60 / self.tokens_per_minute)
+            if waits:
+                return max(max(waits), 0.001)
+
+            self._in_flight += 1
+            self._requests -= 1
+            self._tokens -= tokens
+            return 0.0
+
+    def _release(self):
+        with self._lock:
+            self._in_flight -= 1
+
+    def _adjust(self, tokens: float):
+        """Charge (or refund, if negative) tokens after the fact."""
+        with self._lock:
+            self._refill()
+            self._tokens -= tokens
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed, self._updated = now - self._updated, now
+        if self.requests_per_minute:
+            self._requests = min(
+                self.requests_per_minute, self._requests + elapsed * self.requests_per_minute / 60
+            )
+        if self.tokens_per_minute:
+            self._tokens = min(self.tokens_per_minute, self._tokens + elapsed * self.tokens_per_minute / 60)
+
+
+UNLIMITED = Permit(None, 0)
+
+
+def request_tokens(request: Dict) -> int:
+    """Estimated input tokens of a messages.create request (system + messages)."""
+    texts = []
+    system = request.get("system")
+    if isinstance(system, str):
+        texts.append(system)
+    elif system:
+        texts.extend(block.get("text", "") for block in system)
+    for message in request.get("messages", []):
+        content = message.get("content")
+        if isinstance(content, str):
+            texts.append(content)
+        elif content:
+            texts.extend(block.get("text", "") for block in content)
+    return sum(estimate_tokens(text) for text in texts)
+
+
+_shared_limiter: Optional[RateLimiter] = None
+_shared_lock = threading.Lock()
+_configured = False
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    """Process-wide limiter from api.rate_limits, or None when no limit is set."""
+    global _shared_limiter, _configured
+    if _configured:
+        return _shared_limiter
+
+    with _shared_lock:
+        if not _configured:
+            settings = get_setting("api", "rate_limits", default={}) or {}
+            limits = (
+                settings.get("max_concurrent_calls"),
+                settings.get("requests_per_minute"),
+                settings.get("tokens_per_minute"),
+            )
+            if any(limits):
+                _shared_limiter = RateLimiter(*limits)
+            _configured = True
+    return _shared_limiter
+
+
+def set_rate_limiter(limiter: Optional[RateLimiter]):
+    """Install (or, with None, remove) the process-wide limiter."""
+    global _shared_limiter, _configured
+    with _shared_lock:
+        _shared_limiter = limiter
+        _configured = True
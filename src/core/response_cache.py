@@ -0,0 +1,171 @@
+"""
+Content-addressed response cache for Claude calls
+Identical requests (model, system, messages, temperature, max_tokens) are
+answered from an in-memory LRU tier or an on-disk tier instead of re-billed.
+"""
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+import hashlib
+import json
+import os
+import threading
+import time
+
+from ..utils.config import get_setting
+
+
+class ResponseCache:
+    """
+    Two-tier cache keyed by a SHA-256 of the canonical request.
+    - Memory tier: LRU of `memory_entries` responses
+    - Disk tier: one JSON file per response, evicted by `ttl_seconds` and,
+      least recently used first, once the tier exceeds `max_disk_bytes`
+    """
+
+    def __init__(self, cache_dir: str = "./data/response_cache", memory_entries: int = 256,
+                 max_disk_bytes: int = 512 * 1024 * 1024, ttl_seconds: Optional[float] = 7 * 24 * 3600):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.memory_entries = memory_entries
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl_seconds = ttl_seconds
+
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+        # Disk index (key -> size) in least-recently-used order, built with one scan
+        entries = sorted(
+            (path.stat().st_mtime, path.stem, path.stat().st_size)
+            for path in self.cache_dir.glob("*/*.json")
+        )
+        self._disk: "OrderedDict[str, int]" = OrderedDict((key, size) for _, key, size in entries)
+        self._disk_bytes = sum(self._disk.values())
+
+    @staticmethod
+    def key_for(request: Dict) -> str:
+        """Stable hash of the full request."""
+        canonical = json.dumps(request, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+    def get(self, request: Dict) -> Optional[str]:
+        """Cached response text for `request`, or None."""
+        key = self.key_for(request)
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return self._memory[key]
+
+            text = self._disk_get(key)
+            if text is None:
+                self.stats["misses"] += 1
+                return None
+
+            self.stats["disk_hits"] += 1
+            self._memory_put(key, text)
+            return text
+
+    def put(self, request: Dict, text: str):
+        """Store the response for `request` in both tiers."""
+        key = self.key_for(request)
+        with self._lock:
+            self._memory_put(key, text)
+            self._disk_put(key, text)
+            self.stats["writes"] += 1
+
+    def clear(self):
+        """Drop every cached response."""
+        with self._lock:
+            self._memory.clear()
+            for key in list(self._disk):
+                self._disk_remove(key)
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _memory_put(self, key: str, text: str):
+        self._memory[key] = text
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def _disk_get(self, key: str) -> Optional[str]:
+        if key not in self._disk:
+            return None
+
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self._disk_remove(key)
+            return None
+
+        if self.ttl_seconds is not None and time.time() - entry["created"] > self.ttl_seconds:
+            self._disk_remove(key)
+            self.stats["evictions"] += 1
+            return None
+
+        os.utime(path)
+        self._disk.move_to_end(key)
+        return entry["text"]
+
+    def _disk_put(self, key: str, text: str):
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        payload = json.dumps({"created": time.time(), "text": text}, ensure_ascii=False)
+
+        tmp_path = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_path.write_text(payload, encoding="utf-8")
+        os.replace(tmp_path, path)
+
+        self._disk_bytes -= self._disk.pop(key, 0)
+        self._disk[key] = path.stat().st_size
+        self._disk_bytes += self._disk[key]
+
+        # Evict least recently used entries over the size budget
+        while self._disk_bytes > self.max_disk_bytes and len(self._disk) > 1:
+            self._disk_remove(next(iter(self._disk)))
+            self.stats["evictions"] += 1
+
+    def _disk_remove(self, key: str):
+        self._disk_bytes -= self._disk.pop(key, 0)
+        try:
+            self._path(key).unlink()
+        except FileNotFoundError:
+            pass
+
+
+_shared_cache: Optional[ResponseCache] = None
+_shared_lock = threading.Lock()
+_configured = False
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Process-wide cache from api.response_cache, or None when disabled."""
+    global _shared_cache, _configured
+    if _configured:
+        return _shared_cache
+
+    with _shared_lock:
+        if not _configured:
+            settings = get_setting("api", "response_cache", default={}) or {}
+            if settings.get("enabled", False):
+                _shared_cache = ResponseCache(
+                    cache_dir=settings.get("dir", "./data/response_cache"),
+                    memory_entries=settings.get("memory_entries", 256),
+                    max_disk_bytes=int(settings.get("max_disk_mb", 512) * 1024 * 1024),
+                    ttl_seconds=settings.get("ttl_seconds", 7 * 24 * 3600)
+                )
+            _configured = True
+    return _shared_cache
+
+
+def set_response_cache(cache: Optional[ResponseCache]):
+    """Install (or, with None, disable) the process-wide cache."""
+    global _shared_cache, _configured
+    with _shared_lock:
+        _shared_cache = cache
+        _configured = True
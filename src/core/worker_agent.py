@@ -3,8 +3,11 @@ Worker Agent Base Class - Specialized executors
 Performs actual research and analysis tasks.
 """
 
-from typing import Dict, List
-import anthropic
+from typing import Dict, Iterator, List, Optional
+from .client_pool import get_shared_client
+from .claude_api import build_request, create_message, stream_message
+from .prompt_registry import get_prompt_registry
+from ..quality.document import AnalyzedDocument, analyze
 
 
 class WorkerAgent:
@@ -13,30 +16,89 @@ class WorkerAgent:
     Each Worker has a specific skill (market research, tech analysis, etc.)
     """
     
+    # Attributes that survive reset(); everything else is per-task state
+    SHELL_ATTRIBUTES = ("client", "model", "temperature", "worker_type")
+    
     def __init__(self, api_key: str, worker_type: str, model: str = "claude-opus-4-20250514"):
-        self.client = anthropic.Anthropic(api_key=api_key)
+        self.client = self._create_client(api_key)
         self.model = model
         self.temperature = 0.3  # Higher creativity for Workers
         self.worker_type = worker_type
+        self.usage_log: List[Dict] = []  # Token usage of the current task
+        
+    def reset(self):
+        """Drop per-task state so a pooled shell starts from a clean context."""
+        for name in list(vars(self)):
+            if name not in self.SHELL_ATTRIBUTES:
+                delattr(self, name)
+        self.usage_log = []
         
     def execute_task(self, task: Dict, project_memory: str) -> Dict:
         """Execute assigned task with L1 Self-Check."""
         # Load Worker-specific prompt
         worker_prompt = self._load_prompt()
+        self.usage_log = []
         
-        # Perform task
+        # Perform task (stable prompt + project context first, for prompt caching)
         result = self._call_claude(
             system_prompt=worker_prompt,
-            user_message=f"Task: {task}\n\nProject Context: {project_memory}"
+            user_message=self._task_message(task),
+            context=self._context_message(project_memory)
         )
         
-        # L1 Self-Check
-        validated_result = self._self_check(result)
+        return self._package_result(result)
+    
+    def stream_task(self, task: Dict, project_memory: str) -> "TaskStream":
+        """
+        Execute assigned task as a stream. Iterate the returned TaskStream for
+        text chunks as they arrive; L1 runs chunk by chunk, so result() is
+        ready the moment the stream ends.
+        """
+        from ..quality.l1_self_check import SelfChecker
         
+        self.usage_log = []
+        request = self._request(
+            system_prompt=self._load_prompt(),
+            user_message=self._task_message(task),
+            context=self._context_message(project_memory)
+        )
+        chunks = stream_message(self.client, request, usage_log=self.usage_log, caller=self.worker_type)
+        return TaskStream(self, chunks, SelfChecker().start(self.worker_type))
+    
+    def input_fingerprint(self, task: Dict, project_memory: str) -> str:
+        """Hash of everything that determines this task's output (checkpoint key)."""
+        from ..memory.checkpoints import fingerprint
+        
+        return fingerprint(
+            self.worker_type, self.model, self.temperature,
+            get_prompt_registry().content_hash(f"worker_prompts/{self.worker_type}"),
+            self._task_message(task), self._context_message(project_memory)
+        )
+    
+    def _task_message(self, task: Dict) -> str:
+        """Build the (per-call) task part of the user message."""
+        return f"Task: {task}"
+    
+    def _context_message(self, project_memory: str) -> str:
+        """Build the (per-phase, cacheable) project context part of the user message."""
+        return f"Project Context: {project_memory}"
+    
+    def _package_result(self, result: str) -> Dict:
+        """Run L1 Self-Check and wrap the output for the Master."""
+        validated_result = self._self_check(result)
+        return self._package_validated(validated_result, analyze(result))
+    
+    def _package_validated(self, validated_result: str, document: AnalyzedDocument) -> Dict:
+        """
+        Wrap an L1-validated output for the Master. `document` is the
+        analysis of the raw output, passed on so L2 does not re-tokenize it.
+        """
         return {
             "worker_type": self.worker_type,
             "result": validated_result,
-            "citations": self._extract_citations(validated_result)
+            "citations": list(document.citations),
+            "analysis": document,
+            "usage": list(self.usage_log)
         }
     
     def _self_check(self, result: str) -> str:
@@ -48,21 +110,66 @@ class WorkerAgent:
     
     def _extract_citations(self, text: str) -> List[str]:
         """Extract [cite:X] citations from output."""
-        import re
-        return re.findall(r'\[cite:\d+\]', text)
+        return list(analyze(text).citations)
+    
+    def _create_client(self, api_key: str):
+        """Shared Anthropic client for `api_key` (the only state async subclasses swap)."""
+        return get_shared_client(api_key)
+    
+    def _call_claude(self, system_prompt: str, user_message: str, use_cache: bool = True,
+                     context: Optional[str] = None) -> str:
+        """Call Claude API (through the response cache when enabled)."""
+        return create_message(
+            self.client,
+            self._request(system_prompt, user_message, context),
+            use_cache=use_cache,
+            usage_log=self.usage_log,
+            caller=self.worker_type
+        )
     
-    def _call_claude(self, system_prompt: str, user_message: str) -> str:
-        """Call Claude API."""
-        response = self.client.messages.create(
+    def _request(self, system_prompt: str, user_message: str, context: Optional[str] = None) -> Dict:
+        """messages.create / messages.stream parameters for one task."""
+        return build_request(
             model=self.model,
             max_tokens=8192,
             temperature=self.temperature,
-            system=system_prompt,
-            messages=[{"role": "user", "content": user_message}]
+            system_prompt=system_prompt,
+            user_message=user_message,
+            context=context
         )
-        return response.content[0].text
     
     def _load_prompt(self) -> str:
-        """Load Worker-specific prompt from file."""
-        with open(f"prompts/worker_prompts/{self.worker_type}.md", "r") as f:
-            return f.read()
\ No newline at end of file
+        """Worker-specific prompt from the shared PromptRegistry."""
+        return get_prompt_registry().worker_prompt(self.worker_type)
+
+
+class TaskStream:
+    """
+    Streamed Worker output. Iterating yields text chunks while the L1
+    IncrementalCheck consumes them; result() returns the packaged result,
+    draining any chunks not yet read.
+    """
+    
+    def __init__(self, worker: WorkerAgent, chunks: Iterator[str], check):
+        self.worker = worker
+        self.check = check
+        self._chunks = chunks
+        self._result: Optional[Dict] = None
+    
+    def __iter__(self) -> Iterator[str]:
+        for chunk in self._chunks:
+            self.check.feed(chunk)
+            yield chunk
+        self._finish()
+    
+    def result(self) -> Dict:
+        for _ in self:
+            pass
+        return self._result
+    
+    def _finish(self):
+        if self._result is None:
+            self._result = self.worker._package_validated(
+                self.check.finish(),
+                self.check.document
+            )
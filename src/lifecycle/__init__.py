@@ -1,5 +1,7 @@
 """Worker lifecycle management"""
 
 from .agent_lifecycle import AgentLifecycleManager
+from .async_agent_lifecycle import AsyncAgentLifecycleManager
+from .worker_pool import WorkerPool
 
-__all__ = ['AgentLifecycleManager']
\ No newline at end of file
+__all__ = ['AgentLifecycleManager', 'AsyncAgentLifecycleManager', 'WorkerPool']
\ No newline at end of file
@@ -3,9 +3,18 @@ Agent Lifecycle Manager (Pattern 3: Ephemeral Workers)
 Manages Worker summoning, execution, and retirement.
 """
 
-from typing import Dict, List
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from contextvars import copy_context
+from typing import Callable, Dict, List, Optional, Tuple
+import time
+from ..core.deadline import DeadlineExceeded, child_deadline, current_deadline, deadline_scope
 from ..core.worker_agent import WorkerAgent
+from ..memory.checkpoints import Checkpoints, fingerprint
 from ..memory.project_memory import ProjectMemory
+from ..utils import metrics
+from ..utils.config import get_setting
+from .worker_graph import WORKER_DEPENDENCIES, WorkerGraph, critical_path, format_critical_path
+from .worker_pool import WorkerPool, get_shared_worker_pool
 
 
 class AgentLifecycleManager:
@@ -14,44 +23,334 @@ class AgentLifecycleManager:
     1. Summon: Create fresh Workers for each Phase
     2. Execute: Run tasks with clean context
     3. Retire: Destroy Workers immediately after task completion
+    
+    With retirement_strategy "lazy", retired Workers are reset and parked in a
+    warm WorkerPool instead, and the next phase reuses them.
+    
+    Each Worker task runs within performance.timeouts.worker_execution
+    seconds of its start (capped by the caller's deadline, e.g. the
+    project's). A Worker still running at its deadline is abandoned with a
+    DeadlineExceeded result; its Claude calls time out on their own.
     """
     
-    def __init__(self, project_memory: ProjectMemory):
+    worker_class = WorkerAgent
+    
+    # Worker dependencies; phases are the graph's depth levels
+    GRAPH = WorkerGraph(WORKER_DEPENDENCIES)
+    PHASE_WORKERS = GRAPH.phases()
+    
+    def __init__(self, project_memory: ProjectMemory, max_parallel_workers: Optional[int] = None,
+                 retirement_strategy: Optional[str] = None, worker_pool: Optional[WorkerPool] = None,
+                 checkpoints: Optional[Checkpoints] = None, worker_timeout: Optional[float] = None):
         self.project_memory = project_memory
+        self.checkpoints = checkpoints  # None: no checkpointing (see execute_phase)
         self.active_workers = {}
+        if max_parallel_workers is None:
+            max_parallel_workers = get_setting("lifecycle", "max_parallel_workers", default=0)
+        # 0: no fixed bound - every Worker may run; the adaptive limiter paces API calls
+        self.max_parallel_workers = max(0, int(max_parallel_workers)) or len(self.GRAPH.order)
+        
+        self.retirement_strategy = retirement_strategy or get_setting(
+            "lifecycle", "retirement_strategy", default="immediate"
+        )
+        if self.retirement_strategy not in ("immediate", "lazy"):
+            raise ValueError(f"Unknown retirement_strategy: {self.retirement_strategy}")
+        
+        self.worker_pool = worker_pool
+        if self.retirement_strategy == "lazy" and self.worker_pool is None:
+            pool_config = get_setting("lifecycle", "lazy_pool", default={}) or {}
+            self.worker_pool = get_shared_worker_pool(
+                self.worker_class,
+                capacity_per_type=pool_config.get("capacity_per_type", 2),
+                idle_timeout=pool_config.get("idle_timeout", 300)
+            )
+        self.force_gc = get_setting("lifecycle", "force_gc", default=False)
+        self.stream_workers = get_setting("lifecycle", "stream_workers", default=False)
+        self.worker_timeout = worker_timeout if worker_timeout is not None else get_setting(
+            "performance", "timeouts", "worker_execution", default=None
+        )
+        
+        # (start, end) seconds of each Worker of the last execute_graph()
+        self.schedule: Dict[str, Tuple[float, float]] = {}
+        # Workers left running past their deadline: never parked for reuse
+        self._abandoned = set()
+        
+    def execute_phase(self, phase_num: int, plan: Dict,
+                      on_result: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        """
+        Execute a complete phase with fresh Workers. `on_result` is called
+        (in this thread) with each result as soon as its Worker finishes.
         
-    def execute_phase(self, phase_num: int, plan: Dict) -> List[Dict]:
-        """Execute a complete phase with fresh Workers."""
+        With checkpoints, every successful Worker result and the whole phase
+        are saved with a fingerprint of their inputs; a resumed run reuses
+        them and only executes Workers that failed or never finished.
+        """
         # Determine required Workers for this phase
         worker_types = self._get_phase_workers(phase_num)
         
         # Summon Workers
         workers = self._summon_workers(worker_types)
         
-        # Execute tasks in parallel
-        results = []
-        for worker_type, worker in workers.items():
-            task = plan.get(worker_type)
-            if task:
-                result = worker.execute_task(
-                    task=task,
-                    project_memory=self.project_memory.get_summary()
-                )
-                results.append(result)
+        # Project context packed once per phase, to each Worker type's budget
+        contexts = self.project_memory.get_worker_contexts(list(workers), phase_num=phase_num)
+        assignments = self._fingerprinted([
+            (worker, plan.get(worker_type), contexts[worker_type])
+            for worker_type, worker in workers.items()
+            if plan.get(worker_type)
+        ])
+        
+        phase_hash = self._phase_hash(assignments)
+        results = self._load_checkpoint(f"phase{phase_num}", phase_hash)
+        if results is not None:
+            print(f"♻️ Restored Phase {phase_num} from checkpoint")
+            results = self._restored(results, on_result)
+        else:
+            # Execute tasks in parallel (bounded by max_parallel_workers)
+            results = self._run_parallel(assignments, on_result)
+            if not any("error" in result for result in results):
+                self._save_checkpoint(f"phase{phase_num}", phase_hash, results)
         
         # Retire Workers immediately
         self._retire_workers(workers)
         
         return results
     
+    def execute_graph(self, tasks: Dict, on_result: Optional[Callable[[Dict], None]] = None) -> Dict[str, Dict]:
+        """
+        Execute Workers as a dependency graph (GRAPH) instead of phase by
+        phase: each Worker with a task starts as soon as the Workers it
+        depends on have finished, at most max_parallel_workers at a time,
+        with a context packed from its upstream results. Returns results by
+        Worker type; `on_result` is called (in this thread) as each finishes.
+        
+        Each Worker's (start, end) is kept in self.schedule and the critical
+        path is reported (see critical_path()).
+        """
+        scheduled = [t for t in self.GRAPH.order if tasks.get(t)]
+        waiting = list(scheduled)
+        results: Dict[str, Dict] = {}
+        self.schedule = {}
+        started = time.perf_counter()
+        
+        pool = ThreadPoolExecutor(max_workers=self.max_parallel_workers, thread_name_prefix="worker")
+        try:
+            running = {}
+            while waiting or running:
+                for worker_type in [t for t in waiting if self._inputs_ready(t, scheduled, results)]:
+                    waiting.remove(worker_type)
+                    worker = self._summon_workers([worker_type])[worker_type]
+                    context = self.project_memory.get_graph_context(
+                        worker_type, self._upstream(worker_type, results)
+                    )
+                    assignment = self._fingerprinted([(worker, tasks[worker_type], context)])[0]
+                    self._submit(pool, running, worker, self._run_timed, started, *assignment)
+                
+                for worker, result in self._next_finished(running):
+                    results[worker.worker_type] = result
+                    end = time.perf_counter() - started
+                    self.schedule[worker.worker_type] = (self.schedule.get(worker.worker_type, (end,))[0], end)
+                    self._retire_workers({worker.worker_type: worker})
+                    if on_result:
+                        on_result(result)
+        finally:
+            # Abandoned Workers must not hold up the project
+            pool.shutdown(wait=False, cancel_futures=True)
+        
+        print(f"📊 Critical path: {format_critical_path(self.critical_path())}")
+        return results
+    
+    def critical_path(self) -> List[Dict]:
+        """Critical path of the last execute_graph() (see worker_graph.critical_path)."""
+        return critical_path(self.GRAPH, self.schedule)
+    
+    def _inputs_ready(self, worker_type: str, scheduled: List[str], results: Dict[str, Dict]) -> bool:
+        """Every scheduled dependency has a result (unscheduled ones have nothing to wait for)."""
+        return all(d in results or d not in scheduled for d in self.GRAPH.dependencies[worker_type])
+    
+    def _upstream(self, worker_type: str, results: Dict[str, Dict]) -> List[Tuple[str, Dict]]:
+        """(section, result) of every finished Worker `worker_type` transitively depends on."""
+        return [
+            (f"phase{self.GRAPH.phase(t)}_results", results[t])
+            for t in self.GRAPH.ancestors(worker_type) if t in results
+        ]
+    
+    def _run_timed(self, started: float, worker: WorkerAgent, *assignment) -> Dict:
+        """_run_worker, recording the Worker's start in self.schedule (execute_graph records its end)."""
+        start = time.perf_counter() - started
+        self.schedule[worker.worker_type] = (start, start)
+        return self._run_worker(worker, *assignment)
+    
+    def _submit(self, pool: ThreadPoolExecutor, running: Dict[Future, Dict], worker: WorkerAgent,
+                run: Callable, *args):
+        """
+        Submit run(*args) for `worker`; in its thread the Worker's deadline
+        starts when it does. running[future] holds the Worker and the deadline
+        it is held to (the caller's while still queued).
+        """
+        entry = {"worker": worker, "deadline": current_deadline()}
+        
+        def bounded():
+            entry["deadline"] = child_deadline(self.worker_timeout)
+            with deadline_scope(entry["deadline"]):
+                return run(*args)
+        
+        running[pool.submit(copy_context().run, bounded)] = entry
+    
+    def _next_finished(self, running: Dict[Future, Dict]) -> List[Tuple[WorkerAgent, Dict]]:
+        """
+        Wait until a Worker finishes or passes its deadline; (worker, result)
+        of each such Worker, removed from `running`. Overdue Workers are
+        abandoned: their threads cannot be interrupted, only left behind.
+        """
+        deadlines = [entry["deadline"].remaining() for entry in running.values() if entry["deadline"]]
+        done, _ = wait(running, timeout=min(deadlines) if deadlines else None, return_when=FIRST_COMPLETED)
+        
+        finished = []
+        for future, entry in list(running.items()):
+            if future in done:
+                finished.append((entry["worker"], future.result()))
+            elif entry["deadline"] is not None and entry["deadline"].expired():
+                future.cancel()
+                finished.append((entry["worker"], self._timed_out(entry["worker"])))
+            else:
+                continue
+            del running[future]
+        return finished
+    
+    def _timed_out(self, worker: WorkerAgent) -> Dict:
+        """Failed result of a Worker cancelled at its deadline."""
+        metrics.DEADLINES_EXCEEDED.labels(worker.worker_type).inc()
+        self._abandoned.add(worker)
+        return self._failed_result(worker, DeadlineExceeded(f"{worker.worker_type} ran past its deadline"))
+    
+    def _fingerprinted(self, assignments: List[tuple]) -> List[tuple]:
+        """Append each (worker, task, context)'s input fingerprint when checkpointing."""
+        if self.checkpoints is None:
+            return assignments
+        return [
+            (worker, task, context, self._input_fingerprint(worker, task, context))
+            for worker, task, context in assignments
+        ]
+    
+    def _input_fingerprint(self, worker: WorkerAgent, task, context: str) -> Optional[str]:
+        """
+        worker.input_fingerprint(), or None (no checkpoint) when its inputs
+        cannot be read - e.g. a missing prompt, which then fails that Worker
+        alone in _run_worker.
+        """
+        try:
+            return worker.input_fingerprint(task, context)
+        except Exception as e:
+            print(f"⚠️ No checkpoint for {worker.worker_type} ({type(e).__name__}: {e})")
+            return None
+    
+    def _phase_hash(self, assignments: List[tuple]) -> Optional[str]:
+        """A phase's fingerprint: that of all its Workers' inputs (None if any is unknown)."""
+        if self.checkpoints is None or not assignments or any(a[3] is None for a in assignments):
+            return None
+        return fingerprint(sorted((a[0].worker_type, a[3]) for a in assignments))
+    
+    def _load_checkpoint(self, name: str, input_hash: Optional[str]):
+        """checkpoints.load(); an unreadable checkpoint counts as a miss."""
+        if input_hash is None:
+            return None
+        try:
+            return self.checkpoints.load(name, input_hash)
+        except Exception as e:
+            print(f"⚠️ Checkpoint {name} unreadable ({type(e).__name__}: {e})")
+            return None
+    
+    def _save_checkpoint(self, name: str, input_hash: Optional[str], value):
+        """checkpoints.save(); a storage error only loses the checkpoint, never the result."""
+        if input_hash is None:
+            return
+        try:
+            self.checkpoints.save(name, input_hash, value)
+        except Exception as e:
+            print(f"⚠️ Checkpoint {name} not saved ({type(e).__name__}: {e})")
+    
+    def _restored(self, results: List[Dict], on_result: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        """Checkpointed results, marked and reported like fresh ones."""
+        results = [dict(result, restored=True) for result in results]
+        if on_result:
+            for result in results:
+                on_result(result)
+        return results
+    
+    def _run_parallel(self, assignments: List[tuple],
+                      on_result: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        """
+        Run (worker, task, context[, input_hash]) assignments concurrently;
+        results keep assignment order.
+        """
+        if not assignments:
+            return []
+        
+        pool_size = min(self.max_parallel_workers, len(assignments))
+        if pool_size == 1:
+            # In this thread: the deadline bounds the Worker's calls, nothing can abandon it
+            results = []
+            for assignment in assignments:
+                with deadline_scope(child_deadline(self.worker_timeout)):
+                    results.append(self._run_worker(*assignment))
+                if on_result:
+                    on_result(results[-1])
+            return results
+        
+        pool = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="worker")
+        try:
+            running = {}
+            for assignment in assignments:
+                self._submit(pool, running, assignment[0], self._run_worker, *assignment)
+            results = {}
+            while running:
+                for worker, result in self._next_finished(running):
+                    results[id(worker)] = result
+                    if on_result:
+                        on_result(result)
+            return [results[id(assignment[0])] for assignment in assignments]
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+    
+    def _run_worker(self, worker: WorkerAgent, task, project_context: str,
+                    input_hash: Optional[str] = None) -> Dict:
+        """Execute a single task; a failing Worker (or its checkpoint) never aborts its siblings."""
+        restored = self._load_checkpoint(worker.worker_type, input_hash)
+        if restored is not None:
+            print(f"♻️ Restored Worker: {worker.worker_type}")
+            return dict(restored, restored=True)
+        
+        with metrics.track_worker(worker.worker_type) as outcome:
+            try:
+                if self.stream_workers:
+                    result = worker.stream_task(task=task, project_memory=project_context).result()
+                else:
+                    result = worker.execute_task(task=task, project_memory=project_context)
+            except Exception as e:
+                outcome["status"] = "error"
+                return self._failed_result(worker, e)
+        
+        self._save_checkpoint(worker.worker_type, input_hash, result)
+        return result
+    
+    def _failed_result(self, worker: WorkerAgent, error: Exception) -> Dict:
+        """Placeholder result recorded for a Worker whose task raised."""
+        print(f"❌ Worker failed: {worker.worker_type} ({type(error).__name__}: {error})")
+        return {
+            "worker_type": worker.worker_type,
+            "result": "",
+            "citations": [],
+            "error": f"{type(error).__name__}: {error}"
+        }
+    
+    @classmethod
+    def all_worker_types(cls) -> List[str]:
+        """Every Worker type used by any phase (for prompt validation)."""
+        return cls.GRAPH.order
+    
     def _get_phase_workers(self, phase_num: int) -> List[str]:
         """Define which Workers are needed for each phase."""
-        phase_workers = {
-            1: ["market_research", "tech_analysis", "competition", "patent_analysis"],
-            2: ["risk_analysis", "future_prediction", "new_business"],
-            3: ["report_writer"]
-        }
-        return phase_workers.get(phase_num, [])
+        return list(self.PHASE_WORKERS.get(phase_num, []))
     
     def _summon_workers(self, worker_types: List[str]) -> Dict[str, WorkerAgent]:
         """Create fresh Worker instances."""
@@ -60,20 +359,29 @@ class AgentLifecycleManager:
         
         workers = {}
         for worker_type in worker_types:
-            workers[worker_type] = WorkerAgent(
-                api_key=api_key,
-                worker_type=worker_type
-            )
-            print(f"⚡ Summoned Worker: {worker_type}")
+            worker = self.worker_pool.acquire(worker_type) if self.worker_pool else None
+            if worker is not None:
+                print(f"♻️ Reused Worker: {worker_type}")
+            else:
+                worker = self.worker_class(
+                    api_key=api_key,
+                    worker_type=worker_type
+                )
+                print(f"⚡ Summoned Worker: {worker_type}")
+            workers[worker_type] = worker
         
         return workers
     
     def _retire_workers(self, workers: Dict[str, WorkerAgent]):
-        """Destroy Workers to free memory."""
-        for worker_type in workers.keys():
-            del workers[worker_type]
-            print(f"💀 Retired Worker: {worker_type}")
-        
-        # Force garbage collection
-        import gc
-        gc.collect()
\ No newline at end of file
+        """Destroy Workers (immediate) or park them in the warm pool (lazy)."""
+        for worker_type in list(workers.keys()):
+            worker = workers.pop(worker_type)
+            if self.worker_pool is not None and worker not in self._abandoned and self.worker_pool.release(worker):
+                print(f"💤 Parked Worker: {worker_type}")
+            else:
+                print(f"💀 Retired Worker: {worker_type}")
+        
+        # Full collections pause large heaps; only run them when asked to
+        if self.force_gc:
+            import gc
+            gc.collect()
\ No newline at end of file
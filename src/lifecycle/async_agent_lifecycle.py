@@ -0,0 +1,152 @@
+"""
+Async Agent Lifecycle Manager
+Ephemeral Workers driven by an event loop instead of a thread pool.
+"""
+
+from typing import Callable, Dict, List, Optional
+import asyncio
+import time
+
+from ..core.async_worker_agent import AsyncWorkerAgent
+from ..core.deadline import child_deadline, deadline_scope
+from ..utils import metrics
+from .agent_lifecycle import AgentLifecycleManager
+from .worker_graph import format_critical_path
+
+
+class AsyncAgentLifecycleManager(AgentLifecycleManager):
+    """
+    Summon / Execute / Retire with awaitable Workers.
+    Concurrency within a phase is bounded by max_parallel_workers via a semaphore,
+    so many projects can share one loop without oversubscribing any single phase.
+    `checkpoints` must be AsyncCheckpoints (awaitable load / save).
+    A Worker still running at its deadline is cancelled.
+    """
+    
+    worker_class = AsyncWorkerAgent
+    
+    async def execute_phase(self, phase_num: int, plan: Dict,
+                            on_result: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        """Execute a complete phase with fresh Workers (see AgentLifecycleManager)."""
+        worker_types = self._get_phase_workers(phase_num)
+        workers = self._summon_workers(worker_types)
+        
+        contexts = await self.project_memory.get_worker_contexts(list(workers), phase_num=phase_num)
+        assignments = self._fingerprinted([
+            (worker, plan.get(worker_type), contexts[worker_type])
+            for worker_type, worker in workers.items()
+            if plan.get(worker_type)
+        ])
+        
+        phase_hash = self._phase_hash(assignments)
+        results = await self._load_checkpoint(f"phase{phase_num}", phase_hash)
+        if results is not None:
+            print(f"♻️ Restored Phase {phase_num} from checkpoint")
+            results = self._restored(results, on_result)
+        else:
+            results = await self._run_parallel(assignments, on_result)
+            if not any("error" in result for result in results):
+                await self._save_checkpoint(f"phase{phase_num}", phase_hash, results)
+        
+        self._retire_workers(workers)
+        
+        return results
+    
+    async def execute_graph(self, tasks: Dict,
+                            on_result: Optional[Callable[[Dict], None]] = None) -> Dict[str, Dict]:
+        """Execute Workers as a dependency graph (see AgentLifecycleManager.execute_graph)."""
+        scheduled = [t for t in self.GRAPH.order if tasks.get(t)]
+        results: Dict[str, Dict] = {}
+        runs: Dict[str, asyncio.Task] = {}
+        semaphore = asyncio.Semaphore(self.max_parallel_workers)
+        self.schedule = {}
+        started = time.perf_counter()
+        
+        async def run(worker_type: str) -> Dict:
+            await asyncio.gather(*(runs[d] for d in self.GRAPH.dependencies[worker_type] if d in runs))
+            worker = self._summon_workers([worker_type])[worker_type]
+            context = await self.project_memory.get_graph_context(
+                worker_type, self._upstream(worker_type, results)
+            )
+            assignment = self._fingerprinted([(worker, tasks[worker_type], context)])[0]
+            async with semaphore:
+                start = time.perf_counter() - started
+                results[worker_type] = await self._run_worker(*assignment)
+                self.schedule[worker_type] = (start, time.perf_counter() - started)
+            self._retire_workers({worker_type: worker})
+            if on_result:
+                on_result(results[worker_type])
+            return results[worker_type]
+        
+        # Topological order: every dependency's task exists before its dependents'
+        for worker_type in scheduled:
+            runs[worker_type] = asyncio.create_task(run(worker_type))
+        await asyncio.gather(*runs.values())
+        
+        print(f"📊 Critical path: {format_critical_path(self.critical_path())}")
+        return results
+    
+    async def _run_parallel(self, assignments: List[tuple],
+                            on_result: Optional[Callable[[Dict], None]] = None) -> List[Dict]:
+        """Await (worker, task, context[, input_hash]) assignments concurrently; results keep assignment order."""
+        semaphore = asyncio.Semaphore(self.max_parallel_workers)
+        
+        async def bounded(*assignment):
+            async with semaphore:
+                result = await self._run_worker(*assignment)
+            if on_result:
+                on_result(result)
+            return result
+        
+        return list(await asyncio.gather(*(bounded(*assignment) for assignment in assignments)))
+    
+    async def _run_worker(self, worker: AsyncWorkerAgent, task, project_context: str,
+                          input_hash: Optional[str] = None) -> Dict:
+        """Execute a single task; a failing Worker (or its checkpoint) never aborts its siblings."""
+        restored = await self._load_checkpoint(worker.worker_type, input_hash)
+        if restored is not None:
+            print(f"♻️ Restored Worker: {worker.worker_type}")
+            return dict(restored, restored=True)
+        
+        deadline = child_deadline(self.worker_timeout)
+        with metrics.track_worker(worker.worker_type) as outcome, deadline_scope(deadline):
+            try:
+                execution = self._execute(worker, task, project_context)
+                if deadline is not None:
+                    execution = asyncio.wait_for(execution, timeout=deadline.remaining())
+                result = await execution
+            except asyncio.TimeoutError:
+                outcome["status"] = "error"
+                return self._timed_out(worker)
+            except Exception as e:
+                outcome["status"] = "error"
+                return self._failed_result(worker, e)
+        
+        await self._save_checkpoint(worker.worker_type, input_hash, result)
+        return result
+    
+    async def _load_checkpoint(self, name: str, input_hash: Optional[str]):
+        """Awaitable AgentLifecycleManager._load_checkpoint()."""
+        if input_hash is None:
+            return None
+        try:
+            return await self.checkpoints.load(name, input_hash)
+        except Exception as e:
+            print(f"⚠️ Checkpoint {name} unreadable ({type(e).__name__}: {e})")
+            return None
+    
+    async def _save_checkpoint(self, name: str, input_hash: Optional[str], value):
+        """Awaitable AgentLifecycleManager._save_checkpoint()."""
+        if input_hash is None:
+            return
+        try:
+            await self.checkpoints.save(name, input_hash, value)
+        except Exception as e:
+            print(f"⚠️ Checkpoint {name} not saved ({type(e).__name__}: {e})")
+    
+    async def _execute(self, worker: AsyncWorkerAgent, task, project_context: str) -> Dict:
+        """The Worker's task (streamed when stream_workers is set)."""
+        if self.stream_workers:
+            stream = await worker.stream_task(task=task, project_memory=project_context)
+            return await stream.result()
+        return await worker.execute_task(task=task, project_memory=project_context)
@@ -0,0 +1,126 @@
+"""
+Worker dependency graph
+Which Workers each Worker needs results from, as declared (with context
+relevance weights) in context_packer.WORKER_INPUTS. A Worker's phase is
+its depth in the graph, so the Phase 1-3 grouping follows from the
+dependencies instead of being a separate table. The lifecycle manager
+starts each Worker as soon as its dependencies have finished, and the
+critical path of a finished run shows which Workers set its latency.
+"""
+
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from ..memory.context_packer import DEPENDENCY, WORKER_INPUTS
+
+
+# Worker type -> Worker types whose results it needs, in declaration order:
+# the DEPENDENCY-weight inputs of context_packer.WORKER_INPUTS, so context
+# relevance and scheduling cannot disagree
+WORKER_DEPENDENCIES: Dict[str, Tuple[str, ...]] = {
+    worker_type: tuple(source for source, weight in inputs.items() if weight >= DEPENDENCY)
+    for worker_type, inputs in WORKER_INPUTS.items()
+}
+
+
+class WorkerGraph:
+    """
+    Validated dependency DAG of Worker types. Raises ValueError for
+    dependencies on undeclared Workers and for cycles.
+    """
+
+    def __init__(self, dependencies: Dict[str, Iterable[str]]):
+        self.dependencies: Dict[str, Tuple[str, ...]] = {
+            worker_type: tuple(inputs) for worker_type, inputs in dependencies.items()
+        }
+        for worker_type, inputs in self.dependencies.items():
+            unknown = [d for d in inputs if d not in self.dependencies]
+            if unknown:
+                raise ValueError(f"Worker {worker_type} depends on undeclared Workers: {unknown}")
+
+        self._phases: Dict[str, int] = {}
+        for worker_type in self.dependencies:
+            self._phase(worker_type, ())
+        self._ancestors: Dict[str, Tuple[str, ...]] = {}
+
+    @property
+    def order(self) -> List[str]:
+        """Worker types in topological (phase, then declaration) order."""
+        declared = list(self.dependencies)
+        return sorted(declared, key=lambda t: (self._phases[t], declared.index(t)))
+
+    def phase(self, worker_type: str) -> int:
+        """1 for Workers without dependencies, else one past their latest dependency."""
+        return self._phases[worker_type]
+
+    def phases(self) -> Dict[int, List[str]]:
+        """Worker types grouped by phase (the former PHASE_WORKERS table)."""
+        grouped: Dict[int, List[str]] = {}
+        for worker_type in self.order:
+            grouped.setdefault(self._phases[worker_type], []).append(worker_type)
+        return grouped
+
+    def ancestors(self, worker_type: str) -> Tuple[str, ...]:
+        """Every Worker `worker_type` transitively depends on, in topological order."""
+        if worker_type not in self._ancestors:
+            found = set()
+            stack = list(self.dependencies[worker_type])
+            while stack:
+                dependency = stack.pop()
+                if dependency not in found:
+                    found.add(dependency)
+                    stack.extend(self.dependencies[dependency])
+            self._ancestors[worker_type] = tuple(t for t in self.order if t in found)
+        return self._ancestors[worker_type]
+
+    def _phase(self, worker_type: str, visiting: Tuple[str, ...]) -> int:
+        if worker_type in visiting:
+            cycle = " -> ".join(visiting[visiting.index(worker_type):] + (worker_type,))
+            raise ValueError(f"Worker dependency cycle: {cycle}")
+        if worker_type not in self._phases:
+            inputs = self.dependencies[worker_type]
+            self._phases[worker_type] = 1 + max(
+                (self._phase(d, visiting + (worker_type,)) for d in inputs), default=0
+            )
+        return self._phases[worker_type]
+
+
+def critical_path(graph: WorkerGraph, schedule: Dict[str, Tuple[float, float]]) -> List[Dict]:
+    """
+    The chain of Workers that determined a run's end-to-end latency.
+    `schedule` maps each executed Worker to its (start, end) seconds; the
+    path runs back from the last Worker to finish, through the dependency
+    that finished last at every step. `waited` is the time between that
+    dependency finishing and the Worker starting (summoning, context
+    packing, queueing behind max_parallel_workers).
+    """
+    if not schedule:
+        return []
+    path: List[Dict] = []
+    current: Optional[str] = max(schedule, key=lambda t: schedule[t][1])
+    while current is not None:
+        start, end = schedule[current]
+        inputs = [d for d in graph.dependencies[current] if d in schedule]
+        previous = max(inputs, key=lambda d: schedule[d][1]) if inputs else None
+        ready = schedule[previous][1] if previous else 0.0
+        path.append({
+            "worker_type": current,
+            "start": start,
+            "end": end,
+            "seconds": end - start,
+            "waited": max(0.0, start - ready),
+        })
+        current = previous
+    path.reverse()
+    return path
+
+
+def format_critical_path(path: List[Dict]) -> str:
+    """One-line rendering, e.g. "market_research 4.1s -> risk_analysis 3.0s (7.2s total)"."""
+    if not path:
+        return "(no Workers ran)"
+    steps = " -> ".join(
+        f"{step['worker_type']} {step['seconds']:.2f}s"
+        + (f" (after {step['waited']:.2f}s wait)" if step["waited"] >= 0.005 else "")
+        for step in path
+    )
+    return f"{steps} ({path[-1]['end']:.2f}s total)"
@@ -0,0 +1,78 @@
+"""
+Warm Worker Pool ("lazy" retirement strategy)
+Parks retired Worker shells per type so later phases can reuse them.
+"""
+
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+import threading
+import time
+
+from ..core.worker_agent import WorkerAgent
+
+
+class WorkerPool:
+    """
+    Keyed pool of reusable Worker shells.
+    - Capacity: at most `capacity_per_type` idle shells per worker_type
+    - Eviction: shells idle longer than `idle_timeout` seconds are dropped
+    - Fresh context: every shell is reset() before it is parked
+    """
+    
+    def __init__(self, capacity_per_type: int = 2, idle_timeout: float = 300.0):
+        self.capacity_per_type = capacity_per_type
+        self.idle_timeout = idle_timeout
+        self._idle: Dict[str, Deque[Tuple[float, WorkerAgent]]] = {}
+        self._lock = threading.Lock()
+    
+    def acquire(self, worker_type: str) -> Optional[WorkerAgent]:
+        """Pop the most recently parked shell for `worker_type`, if any."""
+        with self._lock:
+            self._evict_idle(time.monotonic())
+            shells = self._idle.get(worker_type)
+            if shells:
+                return shells.pop()[1]
+        return None
+    
+    def release(self, worker: WorkerAgent) -> bool:
+        """Reset and park `worker`; returns False if its type is at capacity."""
+        worker.reset()
+        with self._lock:
+            now = time.monotonic()
+            self._evict_idle(now)
+            shells = self._idle.setdefault(worker.worker_type, deque())
+            if len(shells) >= self.capacity_per_type:
+                return False
+            shells.append((now, worker))
+            return True
+    
+    def idle_count(self, worker_type: Optional[str] = None) -> int:
+        """Number of parked shells (for one type, or overall)."""
+        with self._lock:
+            if worker_type is not None:
+                return len(self._idle.get(worker_type, ()))
+            return sum(len(shells) for shells in self._idle.values())
+    
+    def clear(self):
+        """Drop every parked shell."""
+        with self._lock:
+            self._idle.clear()
+    
+    def _evict_idle(self, now: float):
+        """Drop shells parked longer than idle_timeout (oldest sit on the left)."""
+        for shells in self._idle.values():
+            while shells and now - shells[0][0] > self.idle_timeout:
+                shells.popleft()
+
+
+_shared_pools: Dict[type, WorkerPool] = {}
+_shared_lock = threading.Lock()
+
+
+def get_shared_worker_pool(worker_class: type, capacity_per_type: int = 2,
+                           idle_timeout: float = 300.0) -> WorkerPool:
+    """Process-wide pool per Worker class (sync and async shells never mix)."""
+    with _shared_lock:
+        if worker_class not in _shared_pools:
+            _shared_pools[worker_class] = WorkerPool(capacity_per_type, idle_timeout)
+        return _shared_pools[worker_class]
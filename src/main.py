@@ -2,13 +2,23 @@
 Main entry point for Master Agent System V4.0-B
 """
 
+import argparse
 import os
 from dotenv import load_dotenv
 from src.core.master_agent import MasterAgent
+from src.core.prompt_registry import get_prompt_registry
+from src.lifecycle.agent_lifecycle import AgentLifecycleManager
+from src.memory.project_memory import ProjectMemory
+from src.utils.metrics import start_metrics_server
 
 
 def main():
-    """Run a complete research project."""
+    """Run a complete research project (or resume an interrupted one)."""
+    parser = argparse.ArgumentParser(description="Master Agent System V4.0-B")
+    parser.add_argument("--resume", metavar="PROJECT_ID",
+                        help="Resume a project, reusing its checkpointed plan, Workers and phases")
+    args = parser.parse_args()
+    
     # Load environment variables
     load_dotenv()
     
@@ -17,26 +27,37 @@ def main():
     if not api_key:
         raise ValueError("ANTHROPIC_API_KEY not found in environment")
     
-    master = MasterAgent(api_key=api_key)
+    # Expose Prometheus metrics (monitoring.enable_metrics / metrics_port)
+    start_metrics_server()
+    
+    # Preload prompts once and fail fast if any Worker prompt is missing
+    prompts = get_prompt_registry()
+    prompts.validate(AgentLifecycleManager.all_worker_types())
     
-    # Example query
-    user_query = input("Enter research query: ")
-    project_id = input("Enter project ID: ")
+    master = MasterAgent(api_key=api_key, resume=bool(args.resume))
     
-    print(f"\n🚀 Starting project: {project_id}")
+    if args.resume:
+        # Same query as the interrupted run, so its checkpoints still match
+        project_id = args.resume
+        user_query = ProjectMemory(project_id).read_section("user_query")
+        if not user_query:
+            raise ValueError(f"No stored query for project {project_id}; nothing to resume")
+        print(f"\n♻️ Resuming project: {project_id}")
+    else:
+        # Example query
+        user_query = input("Enter research query: ")
+        project_id = input("Enter project ID: ")
+        print(f"\n🚀 Starting project: {project_id}")
     print(f"📝 Query: {user_query}\n")
     
-    # Phase 1: Information Gathering
-    print("⚡ Phase 1: Information Gathering...")
+    # Phase 1 plan
+    print("⚡ Planning...")
     phase1_result = master.start_project(user_query, project_id)
     
-    # Phase 2: Strategic Analysis
-    print("⚡ Phase 2: Strategic Analysis...")
-    phase2_result = master.execute_phase_with_lifecycle(2, phase1_result)
-    
-    # Phase 3: Report Synthesis
-    print("⚡ Phase 3: Report Synthesis...")
-    phase3_result = master.execute_phase_with_lifecycle(3, phase2_result)
+    # Phases 1-3: Information Gathering -> Strategic Analysis -> Report Synthesis,
+    # each Worker starting as soon as the Workers it depends on have finished
+    print("⚡ Running Workers (Information Gathering → Strategic Analysis → Report Synthesis)...")
+    master.execute_graph_with_lifecycle(phase1_result)
     
     # Finalize with L3 validation
     print("\n✅ Finalizing project with L3 IAM-SDAI validation...")
@@ -1,5 +1,16 @@
 """Memory management for Master Agent V4.0-B"""
 
 from .project_memory import ProjectMemory
+from .async_project_memory import AsyncProjectMemory
+from .storage import MemoryStorage, open_storage
+from .markdown_storage import MarkdownStorage
+from .sqlite_storage import SQLiteStorage
 
-__all__ = ['ProjectMemory']
\ No newline at end of file
+__all__ = [
+    'ProjectMemory',
+    'AsyncProjectMemory',
+    'MemoryStorage',
+    'MarkdownStorage',
+    'SQLiteStorage',
+    'open_storage'
+]
@@ -0,0 +1,81 @@
+"""
+Async PROJECT_MEMORY.md Manager
+Non-blocking counterpart of ProjectMemory for event-loop hosted services.
+"""
+
+from typing import Dict, Iterable, Optional, Tuple
+import asyncio
+
+from .project_memory import ProjectMemory
+from .storage import MemoryStorage
+from ..utils import metrics
+
+
+class AsyncProjectMemory(ProjectMemory):
+    """
+    ProjectMemory whose refreshes use the store's async path (aiofiles for
+    markdown) and whose atomic commits run off the event loop.
+    Pending updates and the write-behind timer are shared with the sync class.
+    """
+    
+    def __init__(self, project_id: str, base_dir: str = "./data/project_memories",
+                 write_behind: Optional[bool] = None, flush_interval: Optional[float] = None,
+                 storage: Optional[MemoryStorage] = None):
+        super().__init__(project_id, base_dir, write_behind, flush_interval, storage)
+        self._lock = asyncio.Lock()
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.aflush()
+    
+    async def write_section(self, section_name: str, content: str):
+        """Write or update a specific section."""
+        await self.write_sections({section_name: content})
+    
+    async def write_sections(self, sections: Dict[str, str]):
+        """Write several sections with a single persisted write."""
+        async with self._lock:
+            with self._mutex:
+                self._pending.update(sections)
+                if self.write_behind:
+                    self._schedule_flush()
+                    return
+            await self.aflush()
+    
+    async def read_section(self, section_name: str) -> Optional[str]:
+        """Read specific section."""
+        with metrics.timed(metrics.MEMORY_SECONDS, "read"):
+            await self._store.arefresh()
+            return self._lookup(section_name)
+    
+    async def read_all(self) -> str:
+        """Read entire PROJECT_MEMORY.md."""
+        with metrics.timed(metrics.MEMORY_SECONDS, "read"):
+            await self._store.arefresh()
+            return self._store.render(self._pending)
+    
+    async def get_summary(self) -> str:
+        """Get condensed summary for Master Agent context."""
+        with metrics.timed(metrics.MEMORY_SECONDS, "summary"):
+            await self._store.arefresh()
+            return self._build_summary()
+    
+    async def get_worker_contexts(self, worker_types: Iterable[str], budget_tokens: Optional[int] = None,
+                                  phase_num: Optional[int] = None) -> Dict[str, str]:
+        """Per-Worker packed project context (see ProjectMemory.get_worker_contexts)."""
+        with metrics.timed(metrics.MEMORY_SECONDS, "summary"):
+            await self._store.arefresh()
+            return self._build_worker_contexts(worker_types, budget_tokens, phase_num)
+    
+    async def get_graph_context(self, worker_type: str, upstream: Iterable[Tuple[str, Dict]],
+                                budget_tokens: Optional[int] = None) -> str:
+        """Packed context for one graph Worker (see ProjectMemory.get_graph_context)."""
+        with metrics.timed(metrics.MEMORY_SECONDS, "summary"):
+            await self._store.arefresh()
+            return self._build_graph_context(worker_type, upstream, budget_tokens)
+    
+    async def aflush(self):
+        """Commit pending updates without blocking the event loop."""
+        await asyncio.to_thread(self.flush)
@@ -0,0 +1,85 @@
+"""
+Phase / Worker checkpoints stored in PROJECT_MEMORY
+Each completed step is saved as a checkpoint_{name} section holding a
+fingerprint of its inputs and its output. A resumed run reuses a step
+only if its inputs hash to the same fingerprint.
+"""
+
+from typing import Any, Dict, Optional
+import hashlib
+import json
+
+from .project_memory import ProjectMemory
+
+
+CHECKPOINT_PREFIX = "checkpoint_"
+
+# Result keys that only describe this process (unserializable analysis, restore marker)
+TRANSIENT_KEYS = ("analysis", "restored")
+
+
+def fingerprint(*inputs) -> str:
+    """Content hash of a step's inputs (any JSON-representable values)."""
+    encoded = json.dumps(inputs, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def encode(input_hash: str, value: Any) -> str:
+    """One-line section content (json escapes newlines, so no markdown heading can leak)."""
+    if isinstance(value, dict):
+        value = {k: v for k, v in value.items() if k not in TRANSIENT_KEYS}
+    elif isinstance(value, list):
+        value = [
+            {k: v for k, v in item.items() if k not in TRANSIENT_KEYS} if isinstance(item, dict) else item
+            for item in value
+        ]
+    return json.dumps({"fingerprint": input_hash, "value": value}, ensure_ascii=False, default=str)
+
+
+def decode(content: Optional[str], input_hash: str) -> Optional[Any]:
+    """The stored value if `content` is a checkpoint for `input_hash`, else None."""
+    if not content:
+        return None
+    try:
+        checkpoint = json.loads(content)
+    except ValueError:
+        return None
+    if not isinstance(checkpoint, dict) or checkpoint.get("fingerprint") != input_hash:
+        return None
+    return checkpoint.get("value")
+
+
+class Checkpoints:
+    """
+    Checkpoints of one project. save() always persists; load() only returns
+    stored values when `resume` is set, so every run can later be resumed
+    but only a resumed run skips work.
+    """
+
+    def __init__(self, project_memory: ProjectMemory, resume: bool = False):
+        self.project_memory = project_memory
+        self.resume = resume
+
+    def load(self, name: str, input_hash: str) -> Optional[Any]:
+        if not self.resume:
+            return None
+        return decode(self.project_memory.read_section(CHECKPOINT_PREFIX + name), input_hash)
+
+    def save(self, name: str, input_hash: str, value: Any):
+        self.project_memory.write_section(CHECKPOINT_PREFIX + name, encode(input_hash, value))
+
+    def sections(self, name: str, input_hash: str, value: Any) -> Dict[str, str]:
+        """save() as a section dict, to batch with other writes."""
+        return {CHECKPOINT_PREFIX + name: encode(input_hash, value)}
+
+
+class AsyncCheckpoints(Checkpoints):
+    """Checkpoints over an AsyncProjectMemory."""
+
+    async def load(self, name: str, input_hash: str) -> Optional[Any]:
+        if not self.resume:
+            return None
+        return decode(await self.project_memory.read_section(CHECKPOINT_PREFIX + name), input_hash)
+
+    async def save(self, name: str, input_hash: str, value: Any):
+        await self.project_memory.write_section(CHECKPOINT_PREFIX + name, encode(input_hash, value))
@@ -0,0 +1,254 @@
+"""
+Token-aware context packing for PROJECT_MEMORY
+Splits the project's context sections into items (phase results per
+Worker), measures them in estimated tokens and fills a token budget by
+priority and relevance to the Worker type that will read the context.
+"""
+
+from collections import OrderedDict
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+import ast
+import re
+import threading
+
+from ..utils.config import get_setting
+from ..utils.tokens import estimate_tokens
+
+
+# Sections Workers may see, in the order they are rendered
+CONTEXT_SECTIONS = (
+    "user_query",
+    "phase1_plan", "phase1_results",
+    "phase2_plan", "phase2_results",
+    "phase3_plan", "phase3_results",
+)
+# Phase number of a phaseN_* section
+SECTION_PHASE = re.compile(r"phase(\d+)_")
+
+# Base priority per kind of item; relevance to the Worker scales it
+PRIORITY = {"query": 3.0, "plan": 1.0, "results": 1.0, "contradictions": 0.8}
+
+# Which earlier Workers' results matter to a Worker type (missing: DEFAULT_RELEVANCE).
+# The single declaration of the Worker graph too: DEPENDENCY-weight inputs are
+# the Workers it waits for (lifecycle.worker_graph.WORKER_DEPENDENCIES), in order
+DEPENDENCY = 1.0
+WORKER_INPUTS: Dict[str, Dict[str, float]] = {
+    "market_research": {},
+    "tech_analysis": {},
+    "competition": {},
+    "patent_analysis": {},
+    "risk_analysis": {"market_research": 1.0, "competition": 1.0, "tech_analysis": 0.8, "patent_analysis": 0.8},
+    "future_prediction": {"tech_analysis": 1.0, "market_research": 1.0, "patent_analysis": 1.0, "competition": 0.6},
+    "new_business": {"market_research": 1.0, "competition": 1.0, "tech_analysis": 0.7, "patent_analysis": 0.6},
+    "report_writer": {
+        "risk_analysis": 1.0, "future_prediction": 1.0, "new_business": 1.0,
+        "market_research": 0.6, "tech_analysis": 0.6, "competition": 0.6, "patent_analysis": 0.5,
+    },
+}
+DEFAULT_RELEVANCE = 0.3
+PLAN_RELEVANCE = 0.8
+CONTRADICTION_RELEVANCE = 0.6
+
+# Shortest remainder worth filling with a truncated item
+MIN_PART_TOKENS = 48
+CHARS_PER_TOKEN = 4
+
+class TokenCounter:
+    """
+    estimate_tokens() memoized per section version: an item's key plus its
+    content, so an unchanged section is measured once however many phases
+    and Workers read it.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._counts: "OrderedDict[Tuple, int]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def count(self, key: Tuple, text: str) -> int:
+        version = (key, text)
+        with self._lock:
+            if version in self._counts:
+                self._counts.move_to_end(version)
+                self.hits += 1
+                return self._counts[version]
+        tokens = estimate_tokens(text)
+        with self._lock:
+            self.misses += 1
+            self._counts[version] = tokens
+            if len(self._counts) > self.max_entries:
+                self._counts.popitem(last=False)
+        return tokens
+
+
+_token_counter = TokenCounter()
+
+
+class ContextItem(NamedTuple):
+    key: Tuple[str, str]      # (section, part): part is the Worker type for results
+    kind: str                 # "query", "plan", "results" or "contradictions"
+    title: str
+    text: str
+    tokens: int
+    order: int                # render position
+
+
+def phase_sections(phase_num: Optional[int] = None) -> Tuple[str, ...]:
+    """
+    CONTEXT_SECTIONS a Worker of `phase_num` may see: the query, earlier
+    phases and its own phase's plan (None: all). Keeps a phase's context,
+    and so its checkpoint fingerprints, independent of later phases.
+    """
+    if phase_num is None:
+        return CONTEXT_SECTIONS
+    visible = []
+    for section in CONTEXT_SECTIONS:
+        match = SECTION_PHASE.match(section)
+        phase = int(match.group(1)) if match else None
+        if phase is None or phase < phase_num or (phase == phase_num and section.endswith("_plan")):
+            visible.append(section)
+    return tuple(visible)
+
+
+def context_items(lookup, counter: Optional[TokenCounter] = None,
+                  phase_num: Optional[int] = None) -> List[ContextItem]:
+    """
+    Items of every phase_sections(phase_num) section `lookup(section)`
+    returns. Phase results (the aggregated L2 dict) are split per Worker.
+    """
+    counter = counter or _token_counter
+    items: List[ContextItem] = []
+
+    def add(key, kind, title, text):
+        text = str(text).strip()
+        if text:
+            items.append(ContextItem(key, kind, title, text, counter.count(key, text), len(items)))
+
+    for section in phase_sections(phase_num):
+        content = lookup(section)
+        if not content:
+            continue
+        if section == "user_query":
+            add((section, ""), "query", section, content)
+        elif section.endswith("_plan"):
+            add((section, ""), "plan", section, content)
+        else:
+            results = _parse_results(content)
+            if results is None:
+                add((section, ""), "results", section, content)
+                continue
+            for worker_type, result in zip(results.get("workers", []), results.get("results", [])):
+                add((section, worker_type), "results", f"{section} ({worker_type})", result)
+            if results.get("contradictions"):
+                add((section, "contradictions"), "contradictions", f"{section} (L2 contradictions)",
+                    "\n".join(f"- {c}" for c in results["contradictions"]))
+    return items
+
+
+def result_items(results: Iterable[Tuple[str, Dict]], counter: Optional[TokenCounter] = None,
+                 order: int = 0) -> List[ContextItem]:
+    """
+    Items of individual Worker results given as (section, result) pairs,
+    e.g. upstream results in the dependency graph before their phase's
+    aggregated section exists. Numbered from `order` on.
+    """
+    counter = counter or _token_counter
+    items: List[ContextItem] = []
+    for section, result in results:
+        worker_type, text = result.get("worker_type", ""), str(result.get("result", "")).strip()
+        if text:
+            key = (section, worker_type)
+            items.append(ContextItem(key, "results", f"{section} ({worker_type})", text,
+                                     counter.count(key, text), order + len(items)))
+    return items
+
+
+def relevance(item: ContextItem, worker_type: Optional[str]) -> float:
+    """How much `item` matters to `worker_type` (None: no particular Worker)."""
+    if item.kind == "query":
+        return 1.0
+    if item.kind == "plan":
+        return PLAN_RELEVANCE
+    if item.kind == "contradictions":
+        return CONTRADICTION_RELEVANCE
+    source = item.key[1]
+    if worker_type is None or worker_type not in WORKER_INPUTS:
+        return DEFAULT_RELEVANCE
+    return WORKER_INPUTS[worker_type].get(source, DEFAULT_RELEVANCE)
+
+
+def worker_budget() -> int:
+    """memory.worker_context_tokens, capped by what the context window leaves."""
+    window = get_setting("performance", "context_window", default={}) or {}
+    available = (
+        window.get("max_size", 200000) - window.get("buffer_size", 10000)
+        - get_setting("api", "anthropic", "max_tokens_worker", default=8192)
+    )
+    return max(0, min(get_setting("memory", "worker_context_tokens", default=3000), available))
+
+
+class ContextPacker:
+    """
+    Fills a token budget (and optionally a character budget) from
+    ContextItems: highest priority x relevance first, truncating the item
+    that only partly fits. The packed context is rendered in
+    CONTEXT_SECTIONS order so it reads like the memory.
+    """
+
+    def __init__(self, budget_tokens: Optional[int] = None, max_chars: Optional[int] = None):
+        self.budget_tokens = worker_budget() if budget_tokens is None else budget_tokens
+        self.max_chars = max_chars
+
+    @classmethod
+    def for_summary(cls) -> "ContextPacker":
+        """Packer for the Master summary: memory.summary_max_chars."""
+        max_chars = get_setting("memory", "summary_max_chars", default=1000)
+        return cls(budget_tokens=max_chars, max_chars=max_chars)
+
+    def pack(self, items: List[ContextItem], worker_type: Optional[str] = None) -> str:
+        ranked = sorted(
+            (item for item in items if relevance(item, worker_type) > 0),
+            key=lambda item: (-PRIORITY[item.kind] * relevance(item, worker_type), item.order)
+        )
+
+        tokens_left = self.budget_tokens
+        chars_left = self.max_chars if self.max_chars is not None else float("inf")
+        chosen: List[Tuple[ContextItem, str]] = []
+        for item in ranked:
+            overhead = len(item.title) + 7  # "**title**: " plus the newline
+            if item.tokens <= tokens_left and overhead + len(item.text) <= chars_left:
+                chosen.append((item, item.text))
+                tokens_left -= item.tokens
+                chars_left -= overhead + len(item.text)
+            elif tokens_left >= MIN_PART_TOKENS and chars_left - overhead >= MIN_PART_TOKENS * CHARS_PER_TOKEN:
+                chars = min(len(item.text) * tokens_left // max(1, item.tokens), chars_left - overhead - 3)
+                chosen.append((item, _truncate(item.text, chars)))
+                tokens_left = chars_left = 0
+
+        chosen.sort(key=lambda pair: pair[0].order)
+        return "\n".join(f"**{item.title}**: {text}" for item, text in chosen)
+
+    def pack_all(self, items: List[ContextItem], worker_types: Iterable[str]) -> Dict[str, str]:
+        """One packed context per Worker type, from a single set of items."""
+        return {worker_type: self.pack(items, worker_type) for worker_type in worker_types}
+
+
+def _parse_results(content: str) -> Optional[Dict]:
+    """The aggregated L2 dict a phase stores as its results, if it parses."""
+    if not content.startswith("{"):
+        return None
+    try:
+        results = ast.literal_eval(content)
+    except (ValueError, SyntaxError):
+        return None
+    return results if isinstance(results, dict) and "results" in results else None
+
+
+def _truncate(text: str, chars: int) -> str:
+    """At most `chars` characters of `text` plus "...", cut at a word boundary."""
+    cut = text[:max(0, chars)]
+    if " " in cut:
+        cut = cut[:cut.rindex(" ")]
+    return cut.rstrip() + "..."
@@ -0,0 +1,289 @@
+"""
+Markdown storage backend: one PROJECT_MEMORY_{id}.md file per project.
+"""
+
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import os
+import re
+import threading
+
+import aiofiles
+
+from .storage import (
+    MemoryStorage,
+    SectionStore,
+    SCORES_SECTION,
+    parse_scores,
+    score_in_range,
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows: in-process locking only
+    fcntl = None
+
+
+FILE_PREFIX = "PROJECT_MEMORY_"
+
+
+class MarkdownDocument:
+    """
+    PROJECT_MEMORY.md parsed once into heading blocks plus a name index.
+    blocks[0] is the preamble; every other block starts with a '##'-prefixed
+    heading line (same boundaries as the markdown itself).
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.blocks: List[List[str]] = [[]]
+        self.index: Dict[str, int] = {}
+
+        for line in text.split('\n'):
+            if line.startswith('##'):
+                self.blocks.append([line])
+                if line.startswith('## '):
+                    self.index.setdefault(line[3:], len(self.blocks) - 1)
+            else:
+                self.blocks[-1].append(line)
+
+    def find(self, section_name: str) -> Optional[int]:
+        """Block number of `section_name`; falls back to heading-prefix match."""
+        block_num = self.index.get(section_name)
+        if block_num is not None:
+            return block_num
+
+        section_marker = f"## {section_name}"
+        for block_num, block in enumerate(self.blocks[1:], start=1):
+            if block[0].startswith(section_marker):
+                return block_num
+        return None
+
+    def lookup(self, section_name: str) -> Optional[str]:
+        """Section body, or None."""
+        block_num = self.find(section_name)
+        if block_num is None:
+            return None
+        return '\n'.join(self.blocks[block_num][1:]).strip()
+
+    def updated(self, section_name: str, content: str) -> "MarkdownDocument":
+        """New document with `section_name` replaced (or appended)."""
+        if not isinstance(content, str):
+            content = str(content)
+
+        block_num = self.find(section_name)
+        if block_num is not None:
+            # Update existing section
+            blocks = list(self.blocks)
+            blocks[block_num] = [blocks[block_num][0], content]
+            current = '\n'.join('\n'.join(block) for block in blocks if block)
+        else:
+            # Append new section
+            current = self.text + f"\n\n## {section_name}\n{content}\n"
+
+        # Update timestamp
+        return MarkdownDocument(re.sub(
+            r'^\*\*Last Updated\*\*:.*$',
+            f"**Last Updated**: {datetime.now().isoformat()}",
+            current,
+            flags=re.MULTILINE
+        ))
+
+
+class MarkdownSectionStore(SectionStore):
+    """
+    Sections of one PROJECT_MEMORY.md file.
+    Reads are served from the parsed document, which is rebuilt only when the
+    file's (mtime, size) changes. Commits re-read the file under an exclusive
+    lock on the file itself, apply the batch and replace the file atomically.
+    """
+
+    def __init__(self, file_path: Path, project_id: str):
+        self.file_path = file_path
+        self.project_id = project_id
+        self._doc = MarkdownDocument("")
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._mutex = threading.RLock()
+
+        if not self.file_path.exists():
+            self._initialize_file()
+
+    def _initialize_file(self):
+        """Create new PROJECT_MEMORY.md with template (unless another process just did)."""
+        template = f"""# PROJECT_MEMORY: {self.project_id}
+
+**Created**: {datetime.now().isoformat()}
+**Version**: V4.0-B
+
+---
+
+## User Query
+[To be filled]
+
+## Phase 1: Information Gathering
+### Plan
+[To be filled]
+
+### Results
+[To be filled]
+
+## Phase 2: Strategic Analysis
+### Plan
+[To be filled]
+
+### Results
+[To be filled]
+
+## Phase 3: Report Synthesis
+### Plan
+[To be filled]
+
+### Results
+[To be filled]
+
+## Quality Metrics
+### IAM-SDAI Scores
+[To be filled]
+
+---
+**Last Updated**: {datetime.now().isoformat()}
+"""
+        tmp_path = self._write_temp(template)
+        try:
+            # Hard link: creates the file only if it does not exist yet, atomically
+            os.link(tmp_path, self.file_path)
+        except FileExistsError:
+            pass
+        except OSError:  # No hard links on this filesystem
+            if not self.file_path.exists():
+                os.replace(tmp_path, self.file_path)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+        self._sync_dir()
+
+    def refresh(self):
+        """Re-parse the file only if it changed since the last parse."""
+        with self._mutex:
+            stamp = self._file_stamp()
+            if stamp != self._stamp:
+                self._load(self.file_path.read_text(encoding='utf-8'), stamp)
+
+    async def arefresh(self):
+        """refresh() with the file read through aiofiles."""
+        stamp = self._file_stamp()
+        if stamp != self._stamp:
+            async with aiofiles.open(self.file_path, "r", encoding="utf-8") as f:
+                text = await f.read()
+            self._load(text, stamp)
+
+    def lookup(self, section_name: str) -> Optional[str]:
+        return self._doc.lookup(section_name)
+
+    def render(self, overrides: Optional[Dict[str, str]] = None) -> str:
+        doc = self._doc
+        for section_name, content in (overrides or {}).items():
+            doc = doc.updated(section_name, content)
+        return doc.text
+
+    def commit(self, updates: Dict[str, str]):
+        with self._mutex, self._file_lock():
+            # Merge onto exactly what other writers left: a replacement can
+            # match the cached (mtime, size) stamp, so always re-read here
+            self._load(self.file_path.read_text(encoding='utf-8'), self._file_stamp())
+            doc = self._doc
+            for section_name, content in updates.items():
+                doc = doc.updated(section_name, content)
+            self._atomic_write(doc.text)
+            self._doc = doc
+            self._stamp = self._file_stamp()
+
+    def _load(self, text: str, stamp: Tuple[int, int]):
+        with self._mutex:
+            self._doc = MarkdownDocument(text)
+            self._stamp = stamp
+
+    def _file_stamp(self) -> Tuple[int, int]:
+        """(mtime_ns, size) of the memory file - the index cache key."""
+        stat = self.file_path.stat()
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _atomic_write(self, text: str):
+        """Write via temp file + fsync + rename so readers never see a torn file."""
+        os.replace(self._write_temp(text), self.file_path)
+        self._sync_dir()
+
+    def _write_temp(self, text: str) -> Path:
+        """`text` fsynced to a temp file next to the memory file."""
+        tmp_path = self.file_path.with_name(
+            f".{self.file_path.name}.{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        return tmp_path
+
+    def _sync_dir(self):
+        if hasattr(os, "O_DIRECTORY"):
+            dir_fd = os.open(self.file_path.parent, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(dir_fd)
+            finally:
+                os.close(dir_fd)
+
+    @contextmanager
+    def _file_lock(self):
+        """
+        Exclusive advisory lock on the memory file itself, shared by every
+        process using it (no lock file left behind). Commits replace the
+        file, so a lock won on a file that has since been replaced is
+        dropped and taken again on the current one.
+        """
+        while True:
+            with open(self.file_path, "rb") as locked:
+                if fcntl is not None:
+                    fcntl.flock(locked.fileno(), fcntl.LOCK_EX)
+                    if os.fstat(locked.fileno()).st_ino != os.stat(self.file_path).st_ino:
+                        continue
+                try:
+                    yield
+                finally:
+                    if fcntl is not None:
+                        fcntl.flock(locked.fileno(), fcntl.LOCK_UN)
+                return
+
+
+class MarkdownStorage(MemoryStorage):
+    """
+    Directory of PROJECT_MEMORY_{id}.md files.
+    Cross-project queries scan the directory; use SQLiteStorage at scale.
+    """
+
+    def __init__(self, base_dir: str = "./data/project_memories"):
+        self.base_dir = Path(base_dir)
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+
+    def open(self, project_id: str) -> MarkdownSectionStore:
+        return MarkdownSectionStore(self.path_for(project_id), project_id)
+
+    def path_for(self, project_id: str) -> Path:
+        return self.base_dir / f"{FILE_PREFIX}{project_id}.md"
+
+    def list_projects(self) -> List[str]:
+        return sorted(
+            path.stem[len(FILE_PREFIX):]
+            for path in self.base_dir.glob(f"{FILE_PREFIX}*.md")
+        )
+
+    def find_projects(self, dimension: str = "overall", below: Optional[float] = None,
+                      at_least: Optional[float] = None) -> List[str]:
+        matches = []
+        for project_id in self.list_projects():
+            text = self.path_for(project_id).read_text(encoding='utf-8')
+            scores = parse_scores(MarkdownDocument(text).lookup(SCORES_SECTION))
+            if dimension in scores and score_in_range(scores[dimension], below, at_least):
+                matches.append(project_id)
+        return matches
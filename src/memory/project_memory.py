@@ -4,137 +4,172 @@ Persistent storage that bypasses context window limits.
 """
 
 from pathlib import Path
-from typing import Optional
-from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple
+import atexit
+import threading
+import weakref
+
+from ..utils import metrics
+from ..utils.config import get_setting
+from .context_packer import ContextPacker, context_items, result_items
+from .storage import MemoryStorage, open_storage
+
+
+# Write-behind memories still holding pending updates at interpreter exit
+_write_behind_memories = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_write_behind_memories():
+    for memory in list(_write_behind_memories):
+        memory.flush()
 
 
 class ProjectMemory:
     """
     Manages PROJECT_MEMORY.md - the external memory for persistent project state.
     All decisions, results, and metadata stored here.
+    
+    Sections live in a pluggable MemoryStorage (memory.storage_backend):
+    - "markdown": one PROJECT_MEMORY_{id}.md per project, parsed once into a
+      section index that is rebuilt only when the file's mtime or size changes
+    - "sqlite": one WAL-mode database with version history and indexed
+      cross-project queries; PROJECT_MEMORY.md is rendered on demand
+    
+    Commits are atomic. With write_behind=True, section updates are coalesced
+    in memory and committed in one batch on flush(), on context-manager exit,
+    or at most flush_interval seconds after the first pending update.
     """
     
-    def __init__(self, project_id: str, base_dir: str = "./data/project_memories"):
+    def __init__(self, project_id: str, base_dir: str = "./data/project_memories",
+                 write_behind: Optional[bool] = None, flush_interval: Optional[float] = None,
+                 storage: Optional[MemoryStorage] = None):
         self.project_id = project_id
         self.file_path = Path(base_dir) / f"PROJECT_MEMORY_{project_id}.md"
-        self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        self.storage = storage or open_storage(base_dir=base_dir)
+        self._store = self.storage.open(project_id)
+        
+        if write_behind is None:
+            write_behind = get_setting("memory", "write_behind", default=False)
+        if flush_interval is None:
+            flush_interval = get_setting("memory", "flush_interval", default=5.0)
+        self.write_behind = write_behind
+        self.flush_interval = flush_interval
         
-        if not self.file_path.exists():
-            self._initialize_file()
+        # Coalesced updates not yet committed (section -> latest content)
+        self._pending: Dict[str, str] = {}
+        self._mutex = threading.RLock()
+        self._flush_timer: Optional[threading.Timer] = None
+        if self.write_behind:
+            _write_behind_memories.add(self)
     
-    def _initialize_file(self):
-        """Create new PROJECT_MEMORY.md with template."""
-        template = f"""# PROJECT_MEMORY: {self.project_id}
-
-**Created**: {datetime.now().isoformat()}
-**Version**: V4.0-B
-
----
-
-## User Query
-[To be filled]
-
-## Phase 1: Information Gathering
-### Plan
-[To be filled]
-
-### Results
-[To be filled]
-
-## Phase 2: Strategic Analysis
-### Plan
-[To be filled]
-
-### Results
-[To be filled]
-
-## Phase 3: Report Synthesis
-### Plan
-[To be filled]
-
-### Results
-[To be filled]
-
-## Quality Metrics
-### IAM-SDAI Scores
-[To be filled]
-
----
-**Last Updated**: {datetime.now().isoformat()}
-"""
-        self.file_path.write_text(template, encoding='utf-8')
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.flush()
     
     def write_section(self, section_name: str, content: str):
         """Write or update a specific section."""
-        current = self.file_path.read_text(encoding='utf-8')
-        
-        # Replace section content
-        section_marker = f"## {section_name}"
-        if section_marker in current:
-            # Update existing section
-            lines = current.split('\n')
-            new_lines = []
-            in_section = False
-            
-            for line in lines:
-                if line.startswith(section_marker):
-                    in_section = True
-                    new_lines.append(line)
-                    new_lines.append(content)
-                elif in_section and line.startswith('##'):
-                    in_section = False
-                    new_lines.append(line)
-                elif not in_section:
-                    new_lines.append(line)
-            
-            current = '\n'.join(new_lines)
-        else:
-            # Append new section
-            current += f"\n\n## {section_name}\n{content}\n"
-        
-        # Update timestamp
-        current = current.replace(
-            "**Last Updated**:",
-            f"**Last Updated**: {datetime.now().isoformat()}"
-        )
-        
-        self.file_path.write_text(current, encoding='utf-8')
+        self.write_sections({section_name: content})
+    
+    def write_sections(self, sections: Dict[str, str]):
+        """Write several sections with a single persisted write."""
+        with self._mutex:
+            self._pending.update(sections)
+            if self.write_behind:
+                self._schedule_flush()
+                return
+        self.flush()
     
     def read_section(self, section_name: str) -> Optional[str]:
         """Read specific section."""
-        content = self.file_path.read_text(encoding='utf-8')
-        section_marker = f"## {section_name}"
-        
-        if section_marker not in content:
-            return None
-        
-        lines = content.split('\n')
-        section_lines = []
-        in_section = False
-        
-        for line in lines:
-            if line.startswith(section_marker):
-                in_section = True
-                continue
-            elif in_section and line.startswith('##'):
-                break
-            elif in_section:
-                section_lines.append(line)
-        
-        return '\n'.join(section_lines).strip()
+        with self._mutex, metrics.timed(metrics.MEMORY_SECONDS, "read"):
+            self._store.refresh()
+            return self._lookup(section_name)
     
     def read_all(self) -> str:
         """Read entire PROJECT_MEMORY.md."""
-        return self.file_path.read_text(encoding='utf-8')
+        with self._mutex, metrics.timed(metrics.MEMORY_SECONDS, "read"):
+            self._store.refresh()
+            return self._store.render(self._pending)
     
     def get_summary(self) -> str:
-        """Get condensed summary for Master Agent context."""
-        sections = ["user_query", "phase1_plan", "phase2_plan", "phase3_plan"]
-        summary = []
-        
-        for section in sections:
-            content = self.read_section(section)
-            if content:
-                summary.append(f"**{section}**: {content[:200]}...")
-        
-        return '\n'.join(summary)
\ No newline at end of file
+        """Get condensed summary for Master Agent context (memory.summary_max_chars)."""
+        with self._mutex, metrics.timed(metrics.MEMORY_SECONDS, "summary"):
+            self._store.refresh()
+            return self._build_summary()
+    
+    def get_worker_contexts(self, worker_types: Iterable[str], budget_tokens: Optional[int] = None,
+                            phase_num: Optional[int] = None) -> Dict[str, str]:
+        """
+        Project context for each Worker type of a phase, packed to a token
+        budget (memory.worker_context_tokens) by relevance to that type.
+        Sections are read and measured once for the whole phase; with
+        `phase_num`, only sections that precede that phase are used.
+        """
+        with self._mutex, metrics.timed(metrics.MEMORY_SECONDS, "summary"):
+            self._store.refresh()
+            return self._build_worker_contexts(worker_types, budget_tokens, phase_num)
+    
+    def get_graph_context(self, worker_type: str, upstream: Iterable[Tuple[str, Dict]],
+                          budget_tokens: Optional[int] = None) -> str:
+        """
+        Packed context for one Worker of the dependency graph: the query,
+        the Phase 1 plan and its upstream (section, result) pairs, which
+        may finish long before their phase's results section is written.
+        """
+        with self._mutex, metrics.timed(metrics.MEMORY_SECONDS, "summary"):
+            self._store.refresh()
+            return self._build_graph_context(worker_type, upstream, budget_tokens)
+    
+    def flush(self):
+        """Commit all pending updates in one atomic write."""
+        with self._mutex:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._pending:
+                return
+            
+            with metrics.timed(metrics.MEMORY_SECONDS, "write"):
+                self._store.commit(dict(self._pending))
+            self._pending.clear()
+    
+    def export_markdown(self, path: Optional[str] = None) -> Path:
+        """Render PROJECT_MEMORY.md (for non-markdown backends) and return its path."""
+        self.flush()
+        target = Path(path) if path else self.file_path
+        if target != getattr(self._store, "file_path", None):
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_text(self.read_all(), encoding='utf-8')
+        return target
+    
+    def _schedule_flush(self):
+        """Arm a one-shot timer bounding how long updates stay uncommitted."""
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.flush_interval, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+    
+    def _lookup(self, section_name: str) -> Optional[str]:
+        """Pending update if any, else the stored section."""
+        if section_name in self._pending:
+            return str(self._pending[section_name]).strip()
+        return self._store.lookup(section_name)
+    
+    def _build_summary(self) -> str:
+        """Pack the context sections into the summary budget."""
+        items = context_items(self._lookup)
+        return ContextPacker.for_summary().pack(items)
+    
+    def _build_worker_contexts(self, worker_types: Iterable[str], budget_tokens: Optional[int] = None,
+                               phase_num: Optional[int] = None) -> Dict[str, str]:
+        items = context_items(self._lookup, phase_num=phase_num)
+        return ContextPacker(budget_tokens).pack_all(items, worker_types)
+    
+    def _build_graph_context(self, worker_type: str, upstream: Iterable[Tuple[str, Dict]],
+                             budget_tokens: Optional[int] = None) -> str:
+        items = context_items(self._lookup, phase_num=1)
+        items += result_items(upstream, order=len(items))
+        return ContextPacker(budget_tokens).pack(items, worker_type)
@@ -0,0 +1,205 @@
+"""
+SQLite storage backend: all projects in one WAL-mode database.
+(project_id, section) rows with version history; markdown is rendered on demand.
+"""
+
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import sqlite3
+import threading
+
+from .storage import MemoryStorage, SectionStore, SCORES_SECTION, parse_scores
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS projects (
+    project_id  TEXT PRIMARY KEY,
+    created_at  TEXT NOT NULL,
+    updated_at  TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sections (
+    project_id  TEXT NOT NULL,
+    section     TEXT NOT NULL,
+    content     TEXT NOT NULL,
+    version     INTEGER NOT NULL,
+    position    INTEGER NOT NULL,
+    updated_at  TEXT NOT NULL,
+    PRIMARY KEY (project_id, section)
+);
+CREATE TABLE IF NOT EXISTS section_history (
+    project_id  TEXT NOT NULL,
+    section     TEXT NOT NULL,
+    version     INTEGER NOT NULL,
+    content     TEXT NOT NULL,
+    updated_at  TEXT NOT NULL,
+    PRIMARY KEY (project_id, section, version)
+);
+CREATE TABLE IF NOT EXISTS scores (
+    project_id  TEXT NOT NULL,
+    dimension   TEXT NOT NULL,
+    value       REAL NOT NULL,
+    PRIMARY KEY (project_id, dimension)
+);
+CREATE INDEX IF NOT EXISTS idx_scores_dimension_value ON scores (dimension, value);
+"""
+
+
+class SQLiteSectionStore(SectionStore):
+    """
+    Sections of one project, read by primary key and committed in a single
+    transaction. Every commit appends to section_history.
+    """
+
+    def __init__(self, storage: "SQLiteStorage", project_id: str):
+        self.storage = storage
+        self.project_id = project_id
+
+        now = datetime.now().isoformat()
+        with storage.transaction() as conn:
+            conn.execute(
+                "INSERT OR IGNORE INTO projects (project_id, created_at, updated_at) VALUES (?, ?, ?)",
+                (project_id, now, now)
+            )
+
+    def lookup(self, section_name: str) -> Optional[str]:
+        row = self.storage.connection().execute(
+            "SELECT content FROM sections WHERE project_id = ? AND section = ?",
+            (self.project_id, section_name)
+        ).fetchone()
+        return row[0].strip() if row else None
+
+    def commit(self, updates: Dict[str, str]):
+        now = datetime.now().isoformat()
+        with self.storage.transaction() as conn:
+            for section_name, content in updates.items():
+                if not isinstance(content, str):
+                    content = str(content)
+
+                row = conn.execute(
+                    "SELECT version FROM sections WHERE project_id = ? AND section = ?",
+                    (self.project_id, section_name)
+                ).fetchone()
+                if row:
+                    version = row[0] + 1
+                    conn.execute(
+                        "UPDATE sections SET content = ?, version = ?, updated_at = ? "
+                        "WHERE project_id = ? AND section = ?",
+                        (content, version, now, self.project_id, section_name)
+                    )
+                else:
+                    version = 1
+                    conn.execute(
+                        "INSERT INTO sections (project_id, section, content, version, position, updated_at) "
+                        "SELECT ?, ?, ?, 1, COALESCE(MAX(position), 0) + 1, ? FROM sections WHERE project_id = ?",
+                        (self.project_id, section_name, content, now, self.project_id)
+                    )
+                conn.execute(
+                    "INSERT INTO section_history (project_id, section, version, content, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (self.project_id, section_name, version, content, now)
+                )
+
+                if section_name == SCORES_SECTION:
+                    conn.execute("DELETE FROM scores WHERE project_id = ?", (self.project_id,))
+                    conn.executemany(
+                        "INSERT INTO scores (project_id, dimension, value) VALUES (?, ?, ?)",
+                        [(self.project_id, dim, value) for dim, value in parse_scores(content).items()]
+                    )
+
+            conn.execute(
+                "UPDATE projects SET updated_at = ? WHERE project_id = ?",
+                (now, self.project_id)
+            )
+
+    def history(self, section_name: str) -> List[Tuple[int, str, str]]:
+        """(version, content, updated_at) for every committed version, oldest first."""
+        return self.storage.connection().execute(
+            "SELECT version, content, updated_at FROM section_history "
+            "WHERE project_id = ? AND section = ? ORDER BY version",
+            (self.project_id, section_name)
+        ).fetchall()
+
+    def render(self, overrides: Optional[Dict[str, str]] = None) -> str:
+        conn = self.storage.connection()
+        created_at, updated_at = conn.execute(
+            "SELECT created_at, updated_at FROM projects WHERE project_id = ?",
+            (self.project_id,)
+        ).fetchone()
+        sections = dict(conn.execute(
+            "SELECT section, content FROM sections WHERE project_id = ? ORDER BY position",
+            (self.project_id,)
+        ).fetchall())
+        for section_name, content in (overrides or {}).items():
+            sections[section_name] = str(content)
+
+        body = "".join(f"## {name}\n{content}\n\n" for name, content in sections.items())
+        return (
+            f"# PROJECT_MEMORY: {self.project_id}\n\n"
+            f"**Created**: {created_at}\n"
+            f"**Version**: V4.0-B\n\n"
+            f"---\n\n"
+            f"{body}"
+            f"---\n"
+            f"**Last Updated**: {updated_at}\n"
+        )
+
+
+class SQLiteStorage(MemoryStorage):
+    """
+    Every project in one SQLite database in WAL mode: one writer at a time,
+    any number of concurrent readers. Each thread gets its own connection.
+    """
+
+    def __init__(self, db_path: str = "./data/project_memories/project_memory.db"):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self.connection().executescript(SCHEMA)
+
+    def connection(self) -> sqlite3.Connection:
+        """This thread's connection (autocommit; writes use transaction())."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def transaction(self):
+        return _Transaction(self.connection())
+
+    def open(self, project_id: str) -> SQLiteSectionStore:
+        return SQLiteSectionStore(self, project_id)
+
+    def list_projects(self) -> List[str]:
+        rows = self.connection().execute("SELECT project_id FROM projects ORDER BY project_id")
+        return [row[0] for row in rows]
+
+    def find_projects(self, dimension: str = "overall", below: Optional[float] = None,
+                      at_least: Optional[float] = None) -> List[str]:
+        query = "SELECT project_id FROM scores WHERE dimension = ?"
+        params: list = [dimension]
+        if below is not None:
+            query += " AND value < ?"
+            params.append(below)
+        if at_least is not None:
+            query += " AND value >= ?"
+            params.append(at_least)
+        rows = self.connection().execute(query + " ORDER BY project_id", params)
+        return [row[0] for row in rows]
+
+
+class _Transaction:
+    """BEGIN IMMEDIATE ... COMMIT/ROLLBACK around a block of writes."""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.conn.execute("BEGIN IMMEDIATE")
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute("ROLLBACK" if exc_type else "COMMIT")
@@ -0,0 +1,123 @@
+"""
+Pluggable storage for ProjectMemory
+A MemoryStorage owns many projects; open() returns the per-project SectionStore
+that ProjectMemory reads from and commits batches to.
+"""
+
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, List, Optional
+import ast
+import threading
+
+from ..utils.config import get_setting
+
+
+SCORES_SECTION = "iam_sdai_scores"
+
+
+class SectionStore(ABC):
+    """
+    Sections of a single project.
+    - refresh()/arefresh(): pick up changes persisted by other writers
+    - lookup(): read one section (None if missing)
+    - commit(): persist a batch of section updates atomically
+    - render(): the project as PROJECT_MEMORY.md text
+    """
+
+    def refresh(self):
+        """Synchronize with persisted state (no-op for always-fresh stores)."""
+
+    async def arefresh(self):
+        """Awaitable refresh(); stores with async I/O override this."""
+        self.refresh()
+
+    @abstractmethod
+    def lookup(self, section_name: str) -> Optional[str]:
+        """Content of one section, or None if missing."""
+
+    @abstractmethod
+    def commit(self, updates: Dict[str, str]):
+        """Persist a batch of section updates atomically."""
+
+    @abstractmethod
+    def render(self, overrides: Optional[Dict[str, str]] = None) -> str:
+        """The project as PROJECT_MEMORY.md text, with `overrides` applied."""
+
+
+class MemoryStorage(ABC):
+    """
+    A collection of project memories plus cross-project queries.
+    """
+
+    @abstractmethod
+    def open(self, project_id: str) -> SectionStore:
+        """SectionStore of one project."""
+
+    @abstractmethod
+    def list_projects(self) -> List[str]:
+        """IDs of every stored project."""
+
+    @abstractmethod
+    def find_projects(self, dimension: str = "overall", below: Optional[float] = None,
+                      at_least: Optional[float] = None) -> List[str]:
+        """Projects whose IAM-SDAI `dimension` score is in [at_least, below)."""
+
+
+def parse_scores(content: Optional[str]) -> Dict[str, float]:
+    """Numeric entries of an iam_sdai_scores section (str(dict) as written by the Master)."""
+    if not content:
+        return {}
+    try:
+        scores = ast.literal_eval(content.strip())
+    except (ValueError, SyntaxError):
+        return {}
+    if not isinstance(scores, dict):
+        return {}
+    return {
+        str(name): float(value)
+        for name, value in scores.items()
+        if isinstance(value, (int, float)) and not isinstance(value, bool)
+    }
+
+
+def score_in_range(value: float, below: Optional[float], at_least: Optional[float]) -> bool:
+    if below is not None and not value < below:
+        return False
+    if at_least is not None and not value >= at_least:
+        return False
+    return True
+
+
+_storages: Dict[tuple, MemoryStorage] = {}
+_storages_lock = threading.Lock()
+
+
+def open_storage(backend: Optional[str] = None, base_dir: str = "./data/project_memories",
+                 sqlite_path: Optional[str] = None) -> MemoryStorage:
+    """
+    Shared MemoryStorage for `backend` ("markdown" or "sqlite", default from
+    memory.storage_backend). A relative SQLite path (default: memory.sqlite_path,
+    else project_memory.db) is resolved against base_dir, so memories kept
+    under different directories never share a database.
+    """
+    backend = backend or get_setting("memory", "storage_backend", default="markdown")
+    if backend == "sqlite":
+        sqlite_path = Path(sqlite_path or get_setting("memory", "sqlite_path") or "project_memory.db")
+        path = str(sqlite_path if sqlite_path.is_absolute() else Path(base_dir) / sqlite_path)
+    elif backend == "markdown":
+        path = base_dir
+    else:
+        raise ValueError(f"Unknown memory storage backend: {backend}")
+    # Relative paths name different locations once the working directory changes
+    key = (backend, str(Path(path).resolve()))
+
+    with _storages_lock:
+        if key not in _storages:
+            if backend == "sqlite":
+                from .sqlite_storage import SQLiteStorage
+                _storages[key] = SQLiteStorage(path)
+            else:
+                from .markdown_storage import MarkdownStorage
+                _storages[key] = MarkdownStorage(base_dir)
+        return _storages[key]
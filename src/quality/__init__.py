@@ -1,7 +1,8 @@
 """3-Tier Quality Validation System"""
 
+from .document import AnalyzedDocument, analyze
 from .l1_self_check import SelfChecker
 from .l2_cross_validation import CrossValidator
 from .l3_iam_sdai import IAMSDAI
 
-__all__ = ['SelfChecker', 'CrossValidator', 'IAMSDAI']
\ No newline at end of file
+__all__ = ['AnalyzedDocument', 'analyze', 'SelfChecker', 'CrossValidator', 'IAMSDAI']
\ No newline at end of file
@@ -0,0 +1,151 @@
+"""
+Analyzed Document: single-pass tokenization shared by L1, L2 and L3
+One combined regex walks the text once; citations, numbers (with units),
+ranges, source mentions and IAM-SDAI marker phrases are all collected in
+that pass and reused by every validator.
+"""
+
+from functools import lru_cache
+from typing import Dict, List, Match, NamedTuple, Optional, Tuple
+import re
+
+
+# Marker phrases scored by IAM-SDAI, grouped by dimension
+MARKER_GROUPS = {
+    "action": ["should", "must", "recommend", "suggest"],
+    "example": ["for example", "such as", "specifically"],
+    "viewpoint": ["however", "alternatively", "on the other hand", "conversely"],
+    "analysis": ["because", "therefore", "consequently", "thus", "implies"],
+    "reference": ["as mentioned", "as discussed", "referring to"],
+}
+MARKER_TO_GROUP = {phrase: group for group, phrases in MARKER_GROUPS.items() for phrase in phrases}
+
+UNIT_PATTERN = r'%|percent\b|[KMBT]\b|thousand\b|million\b|billion\b|trillion\b'
+SCALES = {
+    "k": 1e3, "thousand": 1e3,
+    "m": 1e6, "million": 1e6,
+    "b": 1e9, "billion": 1e9,
+    "t": 1e12, "trillion": 1e12,
+}
+
+# Alternation order matters: a citation hides its digits from the number
+# token, and a range is tried before a bare number at the same position.
+# A leading "$" is looked behind rather than consumed, so "$5 - 10" is
+# still the range 5-10; thousands separators belong to the number, so
+# "1,200-1,500" is one valid range rather than "200-1".
+TOKEN_PATTERN = re.compile(
+    r'(?P<cite>\[cite:\d+\])'
+    r'|(?:(?<=\$)(?P<usd>))?(?P<r1>\d+(?:,\d{3})*\.?\d*)\s*-\s*(?P<r2>\d+(?:,\d{3})*\.?\d*)(?:\s*(?P<runit>' + UNIT_PATTERN + r'))?'
+    r'|(?:(?<=\$)(?P<usd2>))?(?P<num>\d+(?:,\d{3})*(?:\.\d+)?)(?:\s*(?P<unit>' + UNIT_PATTERN + r'))?'
+    r'|(?P<source>according to|based on|per|from)(?=\s+[A-Z])'
+    r'|(?i:(?P<marker>' + '|'.join(re.escape(p) for p in sorted(MARKER_TO_GROUP, key=len, reverse=True)) + r'))'
+)
+SOURCE_NAME_PATTERN = re.compile(r'\s+([A-Z][\w\s]+)')
+
+
+class NumericSpan(NamedTuple):
+    """A number (or, with `high`, a range) as written: value * scale, in `unit`."""
+    value: float
+    unit: str      # "%", "$" or ""
+    scale: float   # 1, 1e3, 1e6, 1e9, 1e12
+    start: int
+    end: int
+    high: Optional[float] = None   # upper bound of a range; value is the lower
+
+    @property
+    def normalized(self) -> float:
+        return self.value * self.scale
+
+    @property
+    def bounds(self) -> Tuple[float, float]:
+        """(low, high) as written; equal for a single number."""
+        return (self.value, self.value if self.high is None else self.high)
+
+
+class AnalyzedDocument:
+    """
+    Everything the three validation tiers need from one text:
+    citations, numeric spans, ranges, source mentions, marker-phrase counts,
+    sentences and word count.
+    """
+
+    def __init__(self, text: str = ""):
+        self.text = text
+        self.citations: List[str] = []
+        self.numbers: List[NumericSpan] = []
+        self.ranges: List[Tuple[float, float]] = []
+        self.markers: Dict[str, int] = {group: 0 for group in MARKER_GROUPS}
+        self._source_ends: List[int] = []
+        self._sentences: Optional[List[str]] = None
+        self._word_count: Optional[int] = None
+
+    @property
+    def sources(self) -> List[str]:
+        """Names following each "according to" / "based on" / "per" / "from"."""
+        names = []
+        for pos in self._source_ends:
+            match = SOURCE_NAME_PATTERN.match(self.text, pos)
+            names.append(match.group(1) if match else "")
+        return names
+
+    @property
+    def has_sources(self) -> bool:
+        return bool(self._source_ends)
+
+    @property
+    def ranges_valid(self) -> bool:
+        return all(start <= end for start, end in self.ranges)
+
+    @property
+    def sentences(self) -> List[str]:
+        """Sentences split the way L2 claim extraction always has ('. ')."""
+        if self._sentences is None:
+            self._sentences = self.text.split('. ')
+        return self._sentences
+
+    @property
+    def word_count(self) -> int:
+        if self._word_count is None:
+            self._word_count = len(self.text.split())
+        return self._word_count
+
+    def add_token(self, match: Match, offset: int = 0):
+        """Record one TOKEN_PATTERN match; `offset` is where match.string starts in text."""
+        kind = match.lastgroup
+        if kind == "cite":
+            self.citations.append(match.group(0))
+        elif kind in ("r2", "runit"):
+            start = float(match.group("r1").replace(",", ""))
+            end = float(match.group("r2").replace(",", ""))
+            self.ranges.append((start, end))
+            unit, scale = _unit_and_scale(match.group("runit"), match.group("usd") is not None)
+            self.numbers.append(NumericSpan(start, unit, scale, match.start("r1") + offset, match.end() + offset, end))
+        elif kind in ("num", "unit"):
+            unit, scale = _unit_and_scale(match.group("unit"), match.group("usd2") is not None)
+            value = float(match.group("num").replace(",", ""))
+            self.numbers.append(NumericSpan(value, unit, scale, match.start() + offset, match.end() + offset))
+        elif kind == "source":
+            self._source_ends.append(match.end() + offset)
+        elif kind == "marker":
+            self.markers[MARKER_TO_GROUP[match.group(0).lower()]] += 1
+
+
+def _unit_and_scale(unit: Optional[str], currency: bool) -> Tuple[str, float]:
+    """Unit ("%", "$" or "") and multiplier for a matched number."""
+    if unit and unit.lower() in ("%", "percent"):
+        return ("%", 1.0)
+    return ("$" if currency else "", SCALES[unit.lower()] if unit else 1.0)
+
+
+def tokenize(text: str) -> AnalyzedDocument:
+    """Build an AnalyzedDocument with one pass of TOKEN_PATTERN."""
+    doc = AnalyzedDocument(text)
+    for match in TOKEN_PATTERN.finditer(text):
+        doc.add_token(match)
+    return doc
+
+
+@lru_cache(maxsize=256)
+def analyze(text: str) -> AnalyzedDocument:
+    """Memoized tokenize(): every tier asking about the same text shares one analysis."""
+    return tokenize(text)
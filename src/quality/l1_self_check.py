@@ -3,8 +3,9 @@ L1 Quality Validation: Worker Self-Check
 Workers validate their own outputs before submission.
 """
 
-from typing import Dict
-import re
+from typing import Dict, List
+
+from .document import AnalyzedDocument, TOKEN_PATTERN, analyze
 
 
 class SelfChecker:
@@ -12,51 +13,133 @@ class SelfChecker:
     L1 validation performed by each Worker on their own output.
     Checks: Citations, numerical accuracy, range validity.
     """
-    
+
     def check(self, output: str, worker_type: str) -> str:
         """Run L1 checks and return validated output."""
+        doc = analyze(output)
+        issues = self._issues(
+            citations=len(doc.citations),
+            ranges_valid=doc.ranges_valid,
+            sources_valid=doc.has_sources
+        )
+        return self._annotate(output, issues)
+
+    def start(self, worker_type: str) -> "IncrementalCheck":
+        """Begin a chunk-by-chunk check of a streamed output."""
+        return IncrementalCheck(self, worker_type)
+
+    def _issues(self, citations: int, ranges_valid: bool, sources_valid: bool) -> List[str]:
         issues = []
-        
+
         # Check 1: Minimum citations
-        citations = self._count_citations(output)
         if citations < 2:
             issues.append(f"Insufficient citations: {citations} (min: 2)")
-        
+
         # Check 2: Numerical ranges
-        if not self._validate_ranges(output):
+        if not ranges_valid:
             issues.append("Invalid numerical ranges detected")
-        
+
         # Check 3: Source consistency
-        if not self._validate_sources(output):
+        if not sources_valid:
             issues.append("Inconsistent sources")
-        
+
+        return issues
+
+    def _annotate(self, output: str, issues: List[str]) -> str:
         if issues:
             # Append validation warnings
             output += "\n\n**L1 Validation Warnings:**\n"
             for issue in issues:
                 output += f"- {issue}\n"
-        
+
         return output
-    
+
     def _count_citations(self, text: str) -> int:
         """Count [cite:X] citations."""
-        return len(re.findall(r'\[cite:\d+\]', text))
-    
+        return len(analyze(text).citations)
+
     def _validate_ranges(self, text: str) -> bool:
-        """Check if numerical ranges are logically valid."""
-        # Find patterns like "10-20%" or "$5M-$10M"
-        ranges = re.findall(r'(\d+\.?\d*)\s*-\s*(\d+\.?\d*)', text)
-        
-        for start, end in ranges:
-            if float(start) > float(end):
-                return False
-        
-        return True
-    
+        """Check if numerical ranges (e.g. "10-20%") are logically valid."""
+        return analyze(text).ranges_valid
+
     def _validate_sources(self, text: str) -> bool:
-        """Check if sources are mentioned consistently."""
-        # Look for source mentions
-        sources = re.findall(r'(according to|based on|per|from)\s+([A-Z][\w\s]+)', text)
-        
-        # At least some sources should be mentioned
-        return len(sources) >= 1
\ No newline at end of file
+        """Check if at least one source is mentioned."""
+        return analyze(text).has_sources
+
+
+class IncrementalCheck:
+    """
+    Streaming L1 state for one output. feed() tokenizes only new text (plus a
+    short hold-back window so no token is split across chunks), building the
+    same AnalyzedDocument that analyze() would for the full text; finish()
+    yields exactly what SelfChecker.check() would.
+    """
+
+    # Longest token that may straddle a chunk boundary
+    HOLD_BACK = 256
+
+    def __init__(self, checker: SelfChecker, worker_type: str):
+        self.checker = checker
+        self.worker_type = worker_type
+        self.document = AnalyzedDocument()
+        self._chunks: List[str] = []
+        self._buffer = ""
+        self._offset = 0   # position of _buffer[0] in the full text
+        self._pos = 0      # resume position within _buffer
+
+    @property
+    def citations(self) -> List[str]:
+        return self.document.citations
+
+    @property
+    def ranges_valid(self) -> bool:
+        return self.document.ranges_valid
+
+    @property
+    def sources_valid(self) -> bool:
+        return self.document.has_sources
+
+    def feed(self, chunk: str):
+        """Account for the next chunk of output."""
+        self._chunks.append(chunk)
+        self._buffer += chunk
+        self._scan(final=False)
+
+    def finish(self) -> str:
+        """Scan the remainder and return the validated output."""
+        self._scan(final=True)
+        self.document.text = "".join(self._chunks)
+        return self.checker._annotate(self.document.text, self.issues)
+
+    @property
+    def issues(self) -> List[str]:
+        return self.checker._issues(len(self.citations), self.ranges_valid, self.sources_valid)
+
+    def summary(self) -> Dict:
+        """Current L1 counters (usable mid-stream)."""
+        return {
+            "citations": len(self.citations),
+            "ranges_valid": self.ranges_valid,
+            "sources_valid": self.sources_valid
+        }
+
+    def _scan(self, final: bool):
+        buffer = self._buffer
+        settled = len(buffer) if final else len(buffer) - self.HOLD_BACK
+
+        pos = self._pos
+        for match in TOKEN_PATTERN.finditer(buffer, pos):
+            if not final and match.end() >= settled:
+                # A longer token may still start anywhere after `settled`
+                pos = max(pos, min(match.start(), settled))
+                break
+            self.document.add_token(match, self._offset)
+            pos = match.end()
+        else:
+            pos = pos if final else max(pos, settled)
+
+        # Drop settled text, keeping one character for the "$" look-behind
+        drop = max(0, pos - 1)
+        self._buffer = buffer[drop:]
+        self._offset += drop
+        self._pos = pos - drop
@@ -0,0 +1,174 @@
+"""
+L2 Claim Index: claim contradiction detection
+Sentences are normalized into (subject, predicate, polarity) claims and
+indexed by head noun (the subject's last term) together with what they
+assert. A new claim is only compared with the distinct subjects under its
+key that assert the opposite, so no sentence is ever compared with the
+whole phase output.
+"""
+
+from typing import Dict, FrozenSet, List, NamedTuple, Optional, Set, Tuple
+import re
+
+from .document import AnalyzedDocument
+from .l2_metric_index import STOPWORDS, WORD_PATTERN, content_words, stem
+
+
+# Verbs that turn a sentence into a definitive statement
+CLAIM_VERBS = {
+    "is", "are", "was", "were", "will", "be", "has", "have", "remains", "remain",
+    "can", "cannot", "does", "do", "did", "should", "must",
+}
+NEGATIONS = {"not", "no", "never", "none", "neither", "nor", "without", "cannot", "unlikely"}
+# Stems of contracted negations: isn't, won't, can't, doesn't, ...
+CONTRACTED_VERBS = CLAIM_VERBS | {"wo", "ca"}
+
+# Direction words: word -> (axis, sign); opposite signs on one axis contradict
+DIRECTIONS: Dict[str, Tuple[str, int]] = {}
+for axis, positive, negative in (
+    ("change", "grow grows growing grew grown growth increase increases increasing increased "
+               "rise rises rising rose expand expands expanding expanded expansion gain gains "
+               "accelerate accelerates accelerating improve improves improving improved",
+               "shrink shrinks shrinking shrank decline declines declining declined decrease "
+               "decreases decreasing decreased fall falls falling fell drop drops dropping dropped "
+               "contract contracts contracting contraction lose loses losing slow slows slowing "
+               "worsen worsens worsening deteriorate deteriorates deteriorating"),
+    ("level", "high higher highest large larger largest strong stronger strongest",
+              "low lower lowest small smaller smallest weak weaker weakest"),
+    ("outcome", "profitable viable feasible successful positive sustainable",
+                "unprofitable unviable infeasible unsuccessful negative unsustainable"),
+):
+    DIRECTIONS.update({word: (axis, 1) for word in positive.split()})
+    DIRECTIONS.update({word: (axis, -1) for word in negative.split()})
+
+SUBJECT_WORDS = 3
+PREDICATE_WORDS = 3
+# Jaccard overlap of subject terms two claims with the same head noun need
+# to be about the same thing: "european market" ~ "market", not "regulatory
+# risk" ~ "competitive risk"
+SUBJECT_OVERLAP = 0.5
+QUOTE_CHARS = 120
+
+LINE_SPLIT = re.compile(r"\n+")
+
+
+class Claim(NamedTuple):
+    worker: str
+    subject: Tuple[str, ...]            # content terms before the verb, in order
+    predicate: FrozenSet[str]           # content terms after the verb (sans direction word)
+    direction: Optional[Tuple[str, int]]
+    polarity: int                       # +1 asserted, -1 negated
+    sentence: str
+
+    @property
+    def stance(self) -> int:
+        """Net sign: direction sign flipped by negation ("will not grow" = -1)."""
+        return self.polarity * (self.direction[1] if self.direction else 1)
+
+
+def parse_claim(worker: str, sentence: str) -> Optional[Claim]:
+    """Normalize a sentence into a Claim, or None if it makes no definitive statement."""
+    if sentence.rstrip().endswith("?"):
+        return None
+
+    words = WORD_PATTERN.findall(sentence)
+    lowered = [word.lower() for word in words]
+
+    verb = None
+    for i, word in enumerate(lowered):
+        if word in CLAIM_VERBS or (word.endswith("n't") and word[:-3] in CONTRACTED_VERBS):
+            verb = i
+            break
+    if verb is None:
+        return None
+
+    subject = tuple(dict.fromkeys(content_words(words[:verb])[-SUBJECT_WORDS:]))
+    if not subject:
+        return None
+
+    tail = lowered[verb:]
+    polarity = -1 if any(w in NEGATIONS or w.endswith("n't") for w in tail) else 1
+
+    direction = None
+    predicate = []
+    for word in tail:
+        if direction is None and word in DIRECTIONS:
+            direction = DIRECTIONS[word]
+        elif word not in STOPWORDS and word not in NEGATIONS and word not in CLAIM_VERBS:
+            predicate.append(stem(word))
+        if len(predicate) >= PREDICATE_WORDS:
+            break
+
+    if direction is None and not predicate:
+        return None
+    return Claim(worker, subject, frozenset(predicate), direction, polarity, sentence.strip(" -*#>\t").rstrip("."))
+
+
+class ClaimIndex:
+    """
+    Inverted index over claims. Each claim is filed under
+    (head noun, what it asserts) -> {stance: {subject: {worker: claim}}},
+    where "what it asserts" is its direction axis or, without one, its
+    predicate terms. Only the opposite-stance bucket of the claim's key is
+    scanned, one subject comparison per distinct subject in it.
+    """
+
+    def __init__(self):
+        # Only a worker's first claim per subject is kept; later ones
+        # could only repeat a report
+        self._index: Dict[tuple, Dict[int, Dict[Tuple[str, ...], Dict[str, Claim]]]] = {}
+        self._reported: Set[tuple] = set()
+        self.claim_count = 0
+
+    def add(self, worker: str, doc: AnalyzedDocument) -> List[str]:
+        """Index one Worker's claims; return contradictions with earlier Workers."""
+        contradictions = []
+        for sentence in doc.sentences:
+            for line in LINE_SPLIT.split(sentence):
+                claim = parse_claim(worker, line)
+                if claim is not None:
+                    contradictions.extend(self._file(claim))
+        return contradictions
+
+    def _key(self, claim: Claim) -> tuple:
+        asserts = ("axis", claim.direction[0]) if claim.direction else ("predicate", claim.predicate)
+        return (claim.subject[-1], asserts)
+
+    def _file(self, claim: Claim) -> List[str]:
+        self.claim_count += 1
+        contradictions = []
+        buckets = self._index.setdefault(self._key(claim), {})
+        
+        for subject, claims in buckets.get(-claim.stance, {}).items():
+            if not self._same_subject(claim.subject, subject):
+                continue
+            for worker, other in claims.items():
+                if worker == claim.worker:
+                    continue
+                contradiction = self._report(other, claim)
+                if contradiction:
+                    contradictions.append(contradiction)
+        buckets.setdefault(claim.stance, {}).setdefault(claim.subject, {}).setdefault(claim.worker, claim)
+        
+        return contradictions
+
+    def _same_subject(self, a: Tuple[str, ...], b: Tuple[str, ...]) -> bool:
+        """Same head noun (given by the key) and Jaccard overlap of at least SUBJECT_OVERLAP."""
+        a, b = set(a), set(b)
+        return len(a & b) / len(a | b) >= SUBJECT_OVERLAP
+
+    def _report(self, a: Claim, b: Claim) -> Optional[str]:
+        subject = " ".join(term for term in a.subject if term in b.subject)
+        asserts = a.direction[0] if a.direction else tuple(sorted(a.predicate))
+        pair = (subject, asserts, *sorted((a.worker, b.worker)))
+        if pair in self._reported:
+            return None
+        self._reported.add(pair)
+        return (
+            f"Claim contradiction on '{subject}': "
+            f"{a.worker} says \"{_quote(a.sentence)}\", {b.worker} says \"{_quote(b.sentence)}\""
+        )
+
+
+def _quote(sentence: str) -> str:
+    return sentence if len(sentence) <= QUOTE_CHARS else sentence[:QUOTE_CHARS - 3] + "..."
@@ -3,82 +3,90 @@ L2 Quality Validation: Cross-Validation
 Master Agent checks for contradictions between Workers.
 """
 
-from typing import List, Dict
-import re
+from typing import List, Dict, Optional
+
+from ..utils.config import get_setting
+from .document import AnalyzedDocument, analyze
+from .l2_claim_index import ClaimIndex
+from .l2_metric_index import MetricIndex
 
 
 class CrossValidator:
     """
     L2 validation performed by Master Agent.
     Detects contradictions between Worker outputs.
+    
+    Incremental: add() indexes one Worker result as soon as it completes and
+    returns the contradictions it introduces; validate() then only indexes
+    results not yet added and aggregates.
     """
     
-    def validate(self, worker_results: List[Dict]) -> Dict:
-        """Cross-validate multiple Worker outputs."""
-        contradictions = []
+    def __init__(self, numerical_tolerance: Optional[float] = None):
+        settings = get_setting("quality", "l2_cross_validation", default={}) or {}
+        # Relative difference two Workers' values for one metric may have
+        self.numerical_tolerance = (
+            numerical_tolerance if numerical_tolerance is not None
+            else settings.get("numerical_tolerance", 0.1)
+        )
+        # Contradictions a phase may have and still pass L2
+        self.contradiction_tolerance = settings.get("contradiction_tolerance", 0)
+        self.enable_numerical_check = settings.get("enable_numerical_check", True)
+        self.enable_claim_check = settings.get("enable_claim_check", True)
+        self.reset()
+    
+    def reset(self):
+        """Forget every indexed result (start a new phase)."""
+        self.metric_index = MetricIndex(self.numerical_tolerance)
+        self.claim_index = ClaimIndex()
+        self.contradictions: List[str] = []
+        self._added: Dict[int, Dict] = {}   # id -> result (kept so ids stay unique)
+    
+    def add(self, result: Dict) -> List[str]:
+        """Index one Worker result; return the contradictions it introduces."""
+        self._added[id(result)] = result
+        new = []
         
         # Check for numerical contradictions
-        num_contradictions = self._check_numerical_contradictions(worker_results)
-        if num_contradictions:
-            contradictions.extend(num_contradictions)
+        if self.enable_numerical_check:
+            new.extend(self._check_numerical_contradictions([result]))
         
         # Check for claim contradictions
-        claim_contradictions = self._check_claim_contradictions(worker_results)
-        if claim_contradictions:
-            contradictions.extend(claim_contradictions)
+        if self.enable_claim_check:
+            new.extend(self._check_claim_contradictions([result]))
+        
+        self.contradictions.extend(new)
+        return new
+    
+    def validate(self, worker_results: List[Dict]) -> Dict:
+        """Cross-validate multiple Worker outputs (cheap if already add()ed)."""
+        for result in worker_results:
+            if id(result) not in self._added:
+                self.add(result)
         
         # Aggregate validated results
         aggregated = {
             "workers": [r["worker_type"] for r in worker_results],
             "results": [r["result"] for r in worker_results],
-            "contradictions": contradictions,
-            "validation_passed": len(contradictions) == 0
+            "contradictions": list(self.contradictions),
+            "validation_passed": len(self.contradictions) <= self.contradiction_tolerance
         }
         
         return aggregated
     
     def _check_numerical_contradictions(self, results: List[Dict]) -> List[str]:
-        """Find conflicting numbers across Workers."""
+        """Find conflicting numbers across Workers via the metric index."""
         contradictions = []
-        
-        # Extract all numbers with context
-        all_numbers = []
         for result in results:
-            text = result["result"]
-            numbers = re.findall(r'(\d+\.?\d*)\s*([%MKBT$]?)', text)
-            all_numbers.append({
-                "worker": result["worker_type"],
-                "numbers": numbers
-            })
-        
-        # Compare overlapping metrics
-        # (Simplified - production would have sophisticated logic)
-        if len(all_numbers) > 1:
-            for i, a in enumerate(all_numbers):
-                for b in all_numbers[i+1:]:
-                    # Check if same metric has vastly different values
-                    pass  # Placeholder for complex logic
-        
+            contradictions.extend(self.metric_index.add(result["worker_type"], self._document(result)))
         return contradictions
     
     def _check_claim_contradictions(self, results: List[Dict]) -> List[str]:
-        """Find contradictory claims across Workers."""
+        """Find contradictory claims across Workers via the claim index."""
         contradictions = []
-        
-        # Extract key claims (simplified)
-        claims = []
         for result in results:
-            text = result["result"]
-            # Look for definitive statements
-            sentences = text.split('. ')
-            for sent in sentences:
-                if any(word in sent.lower() for word in ['will', 'is', 'are', 'will be']):
-                    claims.append({
-                        "worker": result["worker_type"],
-                        "claim": sent
-                    })
-        
-        # Check for negation contradictions
-        # (Simplified - production would use NLP)
-        
-        return contradictions
\ No newline at end of file
+            contradictions.extend(self.claim_index.add(result["worker_type"], self._document(result)))
+        return contradictions
+    
+    def _document(self, result: Dict) -> AnalyzedDocument:
+        """The Worker's own analysis of its output, or a (memoized) fresh one."""
+        return result.get("analysis") or analyze(result["result"])
@@ -0,0 +1,238 @@
+"""
+L2 Metric Index: numerical contradiction detection
+Every number a Worker reports is filed under a (metric phrase, unit, scale,
+period) key; a new value is only compared with what other Workers filed
+under the same key, so cost grows linearly with the number of values
+reported. Numbers that name rather than measure (Q1, FY24, Phase 2, top 3)
+are not values; period tags near a value (Q1, 2024, 10-year) qualify it.
+"""
+
+from bisect import bisect_left
+from typing import Dict, List, Optional, Set, Tuple
+import re
+
+from .document import AnalyzedDocument, NumericSpan
+
+
+# Words that carry no meaning for "which metric is this"
+STOPWORDS = {
+    "a", "an", "the", "of", "in", "on", "at", "to", "by", "for", "from", "with", "and", "or",
+    "is", "are", "was", "were", "be", "been", "will", "would", "could", "may", "might", "can",
+    "has", "have", "had", "reach", "reaches", "reached", "reaching", "hit", "hits", "stand", "stands",
+    "about", "around", "approximately", "roughly", "nearly", "almost", "over", "under", "up", "down",
+    "estimated", "expected", "projected", "total", "totals", "its", "their", "this", "that", "it",
+    "than", "more", "less", "least", "most", "per", "some", "our", "we", "they", "which",
+}
+WORD_PATTERN = re.compile(r"[A-Za-z][A-Za-z'-]*")
+# A metric phrase never reaches back across a clause boundary
+CLAUSE_BREAK = re.compile(r"[.;:!?\n(\[]")
+# ...and a period tag is looked for forward up to the end of the clause,
+# parenthetical included: "$2B (FY24)"
+CLAUSE_END = re.compile(r"[.;:!?\n]")
+
+# Where the text between two values stops describing the first: "$2B in 2024, and $3B in 2030"
+VALUE_SEPARATOR = re.compile(r"[,.;:!?\n]|\b(?:and|but|while|whereas|versus|vs)\b")
+
+# Quarter / half tags, fiscal years, calendar years and horizons
+PERIOD_PATTERN = re.compile(
+    r"\b(?:[QH][1-4]|FY\s?'?\d{2,4}|(?:19|20)\d{2}|2100|\d+[\s-]?(?:year|yr|month|quarter)s?)\b",
+    re.IGNORECASE,
+)
+# Words a small unitless integer labels rather than measures: "Phase 2", "top 3", "Table 4"
+LABEL_WORDS = {
+    "phase", "stage", "step", "tier", "level", "round", "wave", "top", "bottom", "rank", "no",
+    "number", "table", "figure", "fig", "chart", "exhibit", "appendix", "section", "chapter",
+    "page", "item", "option", "scenario", "version", "gen", "generation", "series", "class", "type",
+}
+LABEL_BEFORE = re.compile(r"([A-Za-z]+)\.?\s*#?\s*$")
+LABEL_MAX = 100
+ORDINAL_SUFFIX = re.compile(r"st|nd|rd|th", re.IGNORECASE)
+
+PHRASE_WORDS = 2   # head noun plus one modifier: "global market size" -> "market size"
+PHRASE_WINDOW = 80
+
+MetricKey = Tuple[str, str, float, str]
+Period = Tuple[int, int, str]  # start, end, normalized tag
+
+
+def metric_phrase(text: str, start: int, floor: int = 0) -> str:
+    """Normalized metric phrase: the last content words before `start` in its clause."""
+    window_start = max(floor, start - PHRASE_WINDOW)
+    window = text[window_start:start]
+    breaks = [m.end() for m in CLAUSE_BREAK.finditer(window)]
+    if breaks:
+        window = window[breaks[-1]:]
+
+    window = PERIOD_PATTERN.sub(" ", window)
+    return " ".join(content_words(WORD_PATTERN.findall(window))[-PHRASE_WORDS:])
+
+
+def stem(word: str) -> str:
+    """Lowercase and strip a plural "s" ("markets" -> "market")."""
+    word = word.lower()
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        word = word[:-1]
+    return word
+
+
+def content_words(words: List[str]) -> List[str]:
+    """Stemmed words minus STOPWORDS, in order."""
+    return [stem(word) for word in words if word.lower() not in STOPWORDS]
+
+
+def is_year(span: NumericSpan) -> bool:
+    """Bare four-digit years say when, not how much; they are not indexed."""
+    return (
+        span.high is None and not span.unit and span.scale == 1.0
+        and span.value.is_integer() and 1900 <= span.value <= 2100
+    )
+
+
+def is_label(text: str, span: NumericSpan) -> bool:
+    """A small unitless integer naming an item ("Phase 2", "top 3", "Table 4", "3rd")."""
+    if span.unit or span.scale != 1.0 or not span.value.is_integer():
+        return False
+    if max(span.bounds) > LABEL_MAX:
+        return False
+    if ORDINAL_SUFFIX.match(text, span.end):
+        return True
+    before = LABEL_BEFORE.search(text, max(0, span.start - 20), span.start)
+    return before is not None and stem(before.group(1)) in LABEL_WORDS
+
+
+def value_split(text: str, after: int, before: int) -> int:
+    """Boundary between two values' shares of the text between them: its last separator, else the middle."""
+    split = None
+    for split in VALUE_SEPARATOR.finditer(text, after, before):
+        pass
+    return split.end() if split is not None else (after + before) // 2
+
+
+def periods(text: str) -> List[Period]:
+    """Period tags in `text`, normalized so "FY 24" == "FY24" and "10 years" == "10-year"."""
+    return [
+        (m.start(), m.end(), re.sub(r"[\s'-]|s$", "", m.group(0).lower()))
+        for m in PERIOD_PATTERN.finditer(text)
+    ]
+
+
+class MetricIndex:
+    """
+    (metric phrase, unit, scale, period) -> {worker: (low, high)} hull of the
+    values that Worker reported for the metric. add() returns the
+    contradictions the new Worker output introduces.
+    """
+
+    def __init__(self, tolerance: float = 0.1):
+        self.tolerance = tolerance
+        self._index: Dict[MetricKey, Dict[str, Tuple[float, float]]] = {}
+        self._reported: Set[Tuple[MetricKey, str, str]] = set()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def add(self, worker: str, doc: AnalyzedDocument) -> List[str]:
+        """Index one Worker's numbers; return contradictions with earlier Workers."""
+        text = doc.text
+        tags = periods(text)
+        tag_starts = [start for start, _, _ in tags]
+        values = [span for span in doc.numbers if not self._identifier(text, span, tags, tag_starts)]
+
+        splits = [0] + [value_split(text, a.end, b.start) for a, b in zip(values, values[1:])] + [len(text)]
+
+        contradictions = []
+        floor = 0
+        for i, span in enumerate(values):
+            key = self._key(text, span, floor, (splits[i], splits[i + 1]), tags, tag_starts)
+            floor = span.end
+            if key is None:
+                continue
+            contradictions.extend(self._file(key, worker, span.bounds))
+        return contradictions
+
+    def keys(self) -> List[MetricKey]:
+        return list(self._index)
+
+    def _identifier(self, text: str, span: NumericSpan, tags: List[Period], tag_starts: List[int]) -> bool:
+        """Years, period tags (Q1, FY24, 10-year), labels and model names (H100) say which, not how much."""
+        if is_year(span) or is_label(text, span):
+            return True
+        if span.start and text[span.start - 1].isalpha():
+            return True
+        i = bisect_left(tag_starts, span.start + 1) - 1
+        return i >= 0 and tags[i][1] >= span.end
+
+    def _key(self, text: str, span: NumericSpan, floor: int, share: Tuple[int, int],
+             tags: List[Period], tag_starts: List[int]) -> Optional[MetricKey]:
+        phrase = metric_phrase(text, span.start, floor)
+        if not phrase:
+            return None
+        return (phrase, span.unit, span.scale, self._period(text, span, share, tags, tag_starts))
+
+    def _period(self, text: str, span: NumericSpan, share: Tuple[int, int],
+                tags: List[Period], tag_starts: List[int]) -> str:
+        """Period tags in the value's clause and its `share` of the text ("" if none)."""
+        start = max(share[0], span.start - PHRASE_WINDOW)
+        breaks = [m.end() for m in CLAUSE_BREAK.finditer(text, start, span.start)]
+        if breaks:
+            start = breaks[-1]
+        end = min(share[1], span.end + PHRASE_WINDOW)
+        clause_end = CLAUSE_END.search(text, span.end, end)
+        if clause_end:
+            end = clause_end.start()
+
+        found = set()
+        for tag_start, _, tag in tags[bisect_left(tag_starts, start):]:
+            if tag_start >= end:
+                break
+            found.add(tag)
+        return " ".join(sorted(found))
+
+    def _file(self, key: MetricKey, worker: str, bounds: Tuple[float, float]) -> List[str]:
+        workers = self._index.setdefault(key, {})
+        low, high = bounds
+        if worker in workers:
+            old_low, old_high = workers[worker]
+            workers[worker] = (min(low, old_low), max(high, old_high))
+        else:
+            workers[worker] = (low, high)
+
+        contradictions = []
+        for other, other_bounds in workers.items():
+            if other == worker or not self._conflict(bounds, other_bounds):
+                continue
+            pair = (key, *sorted((worker, other)))
+            if pair in self._reported:
+                continue
+            self._reported.add(pair)
+            contradictions.append(self._describe(key, other, other_bounds, worker, bounds))
+        return contradictions
+
+    def _conflict(self, a: Tuple[float, float], b: Tuple[float, float]) -> bool:
+        """True if the intervals are further apart than `tolerance` (relative)."""
+        near, far = min(a[1], b[1]), max(a[0], b[0])
+        gap = far - near
+        return gap > self.tolerance * max(abs(near), abs(far))
+
+    def _describe(self, key: MetricKey, worker_a: str, a: Tuple[float, float],
+                  worker_b: str, b: Tuple[float, float]) -> str:
+        phrase, unit, scale, period = key
+        qualifier = f" ({period})" if period else ""
+        return (
+            f"Numerical contradiction on '{phrase}'{qualifier}: "
+            f"{worker_a} reports {_format(a, unit, scale)}, {worker_b} reports {_format(b, unit, scale)}"
+        )
+
+
+SCALE_SUFFIX = {1.0: "", 1e3: "K", 1e6: "M", 1e9: "B", 1e12: "T"}
+
+
+def _format(bounds: Tuple[float, float], unit: str, scale: float) -> str:
+    def one(value: float) -> str:
+        number = f"{value:g}"
+        if unit == "%":
+            return f"{number}%"
+        return f"{unit}{number}{SCALE_SUFFIX.get(scale, '')}"
+
+    low, high = bounds
+    return one(low) if low == high else f"{one(low)}-{one(high)}"
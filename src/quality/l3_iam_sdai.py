@@ -3,8 +3,12 @@ L3 Quality Validation: IAM-SDAI Framework
 Final 6-dimensional quality assessment.
 """
 
-from typing import Dict
-import re
+from typing import Dict, Optional
+
+from .document import AnalyzedDocument, analyze
+
+
+DIMENSIONS = ("impact", "accuracy", "coverage", "diversity", "depth", "integration")
 
 
 class IAMSDAI:
@@ -18,73 +22,119 @@ class IAMSDAI:
     - Integration: Synthesis quality
     """
     
-    def __init__(self, threshold: float = 0.85):
+    def __init__(self, threshold: float = 0.85, weights: Optional[Dict[str, float]] = None):
         self.threshold = threshold
+        # Per-dimension weights for the overall score (None: plain mean)
+        self.weights = weights
     
     def validate(self, final_report: str) -> Dict[str, float]:
-        """Calculate all 6 IAM-SDAI scores."""
+        """Calculate all 6 IAM-SDAI scores from one analysis of the report."""
+        doc = analyze(final_report)
         scores = {
-            "impact": self._score_impact(final_report),
-            "accuracy": self._score_accuracy(final_report),
-            "coverage": self._score_coverage(final_report),
-            "diversity": self._score_diversity(final_report),
-            "depth": self._score_depth(final_report),
-            "integration": self._score_integration(final_report)
+            "impact": self._score_impact(doc),
+            "accuracy": self._score_accuracy(doc),
+            "coverage": self._score_coverage(doc),
+            "diversity": self._score_diversity(doc),
+            "depth": self._score_depth(doc),
+            "integration": self._score_integration(doc)
         }
         
         # Calculate overall score
-        scores["overall"] = sum(scores.values()) / 6
+        if self.weights is None:
+            scores["overall"] = sum(scores.values()) / 6
+        else:
+            total = sum(self.weights[d] for d in DIMENSIONS)
+            scores["overall"] = sum(scores[d] * self.weights[d] for d in DIMENSIONS) / total
+        scores["passed"] = scores["overall"] >= self.threshold
+        
+        return scores
+    
+    def validate_batch(self, reports) -> Dict:
+        """
+        Score many reports at once (see l3_batch): one feature row per
+        report, then the formulas below applied column-wise. Returns arrays
+        keyed like validate()'s dict.
+        """
+        from .l3_batch import extract_features
+        return self.score_features(extract_features(reports))
+    
+    def score_features(self, features) -> Dict:
+        """
+        Vectorized validate() over an (N, len(l3_batch.FEATURES)) count
+        matrix. Re-weighting or re-thresholding a corpus only reruns this.
+        """
+        import numpy as np
+        from .l3_batch import FEATURES, round_scores
+        
+        counts = np.asarray(features, dtype=np.float64).reshape(-1, len(FEATURES))
+        column = {name: counts[:, i] for i, name in enumerate(FEATURES)}
+        
+        scores = {
+            "impact": round_scores(np.minimum(1.0, column["actions"] * 0.05 + column["examples"] * 0.1)),
+            "accuracy": round_scores(np.minimum(1.0, column["citations"] * 0.02)),
+            "coverage": round_scores(np.minimum(1.0, column["words"] / 5000)),
+            "diversity": round_scores(np.minimum(1.0, column["viewpoints"] * 0.15)),
+            "depth": round_scores(np.minimum(1.0, column["analysis"] * 0.05)),
+            "integration": round_scores(np.minimum(1.0, column["references"] * 0.1))
+        }
+        
+        matrix = np.column_stack([scores[d] for d in DIMENSIONS])
+        if self.weights is None:
+            scores["overall"] = matrix.sum(axis=1) / 6
+        else:
+            weights = np.array([self.weights[d] for d in DIMENSIONS], dtype=np.float64)
+            scores["overall"] = (matrix * weights).sum(axis=1) / weights.sum()
         scores["passed"] = scores["overall"] >= self.threshold
         
         return scores
     
-    def _score_impact(self, text: str) -> float:
+    def _score_impact(self, doc: AnalyzedDocument) -> float:
         """Measure practical business value."""
         # Count actionable recommendations
-        actions = len(re.findall(r'(should|must|recommend|suggest)', text, re.IGNORECASE))
+        actions = doc.markers["action"]
         
         # Count concrete examples
-        examples = len(re.findall(r'(for example|such as|specifically)', text, re.IGNORECASE))
+        examples = doc.markers["example"]
         
         score = min(1.0, (actions * 0.05 + examples * 0.1))
         return round(score, 2)
     
-    def _score_accuracy(self, text: str) -> float:
+    def _score_accuracy(self, doc: AnalyzedDocument) -> float:
         """Measure factual correctness via citations."""
-        citations = len(re.findall(r'\[cite:\d+\]', text))
+        citations = len(doc.citations)
         
         # More citations = higher confidence in accuracy
         score = min(1.0, citations * 0.02)
         return round(score, 2)
     
-    def _score_coverage(self, text: str) -> float:
+    def _score_coverage(self, doc: AnalyzedDocument) -> float:
         """Measure comprehensiveness of analysis."""
-        word_count = len(text.split())
+        word_count = doc.word_count
         
         # Longer reports = more comprehensive
         score = min(1.0, word_count / 5000)
         return round(score, 2)
     
-    def _score_diversity(self, text: str) -> float:
+    def _score_diversity(self, doc: AnalyzedDocument) -> float:
         """Measure variety of perspectives."""
         # Count different viewpoints mentioned
-        viewpoints = len(re.findall(r'(however|alternatively|on the other hand|conversely)', text, re.IGNORECASE))
+        viewpoints = doc.markers["viewpoint"]
         
         score = min(1.0, viewpoints * 0.15)
         return round(score, 2)
     
-    def _score_depth(self, text: str) -> float:
+    def _score_depth(self, doc: AnalyzedDocument) -> float:
         """Measure analytical depth."""
         # Count analytical phrases
-        analysis = len(re.findall(r'(because|therefore|consequently|thus|implies)', text, re.IGNORECASE))
+        analysis = doc.markers["analysis"]
         
         score = min(1.0, analysis * 0.05)
         return round(score, 2)
     
-    def _score_integration(self, text: str) -> float:
+    def _score_integration(self, doc: AnalyzedDocument) -> float:
         """Measure synthesis quality."""
         # Check for cross-references
-        references = len(re.findall(r'(as mentioned|as discussed|referring to)', text, re.IGNORECASE))
+        references = doc.markers["reference"]
         
         score = min(1.0, references * 0.1)
         return round(score, 2)
\ No newline at end of file
@@ -0,0 +1,5 @@
+"""Shared utilities for Master Agent V4.0-B"""
+
+from .config import load_config, get_setting
+
+__all__ = ['load_config', 'get_setting']
@@ -0,0 +1,38 @@
+"""
+Configuration loader for Master Agent V4.0-B
+Reads config/config.yaml once and serves nested settings from memory.
+"""
+
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Dict, Optional
+import os
+
+import yaml
+
+
+DEFAULT_CONFIG_PATH = Path(__file__).resolve().parents[2] / "config" / "config.yaml"
+
+
+@lru_cache(maxsize=None)
+def load_config(path: Optional[str] = None) -> Dict:
+    """Load config.yaml (or MASTER_AGENT_CONFIG) into a dict; {} if missing."""
+    config_path = Path(path or os.getenv("MASTER_AGENT_CONFIG", DEFAULT_CONFIG_PATH))
+    if not config_path.exists():
+        return {}
+
+    with open(config_path, "r", encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
+def get_setting(*keys: str, default: Any = None) -> Any:
+    """
+    Fetch a nested setting, e.g. get_setting("lifecycle", "max_parallel_workers").
+    Returns `default` when any key along the path is missing.
+    """
+    node: Any = load_config()
+    for key in keys:
+        if not isinstance(node, dict) or key not in node:
+            return default
+        node = node[key]
+    return node
@@ -0,0 +1,201 @@
+"""
+Prometheus metrics for Master Agent V4.0-B
+Phase / Worker / Claude-call latency, token usage, active Workers,
+PROJECT_MEMORY access latency and IAM-SDAI score distributions, served on
+monitoring.metrics_port when monitoring.enable_metrics is set.
+"""
+
+from contextlib import contextmanager
+from typing import Dict, Optional
+import threading
+import time
+
+from prometheus_client import CollectorRegistry, Counter, Gauge, Histogram, start_http_server
+
+from .config import get_setting
+
+
+# Own registry: importing this module twice (tests, reloads) never collides
+# with the process-wide default registry
+REGISTRY = CollectorRegistry()
+
+# Claude calls take seconds to minutes; phases and projects up to many minutes
+CALL_BUCKETS = (0.5, 1, 2, 5, 10, 20, 30, 45, 60, 90, 120, 180, 300)
+PHASE_BUCKETS = (1, 5, 10, 20, 30, 47, 60, 90, 120, 180, 300, 600, 1200)
+MEMORY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1)
+WAIT_BUCKETS = (0.01, 0.05, 0.1, 0.25, 0.5, 1, 2, 5, 10, 20, 30, 60)
+SCORE_BUCKETS = (0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.7, 0.75, 0.8, 0.85, 0.9, 0.95, 1.0)
+
+CALL_SECONDS = Histogram(
+    "master_agent_claude_call_seconds", "Latency of one Claude API call",
+    ["caller", "mode"], buckets=CALL_BUCKETS, registry=REGISTRY,
+)
+CALLS = Counter(
+    "master_agent_claude_calls_total", "Claude API calls by outcome",
+    ["caller", "outcome"], registry=REGISTRY,
+)
+TOKENS = Counter(
+    "master_agent_tokens_total", "Tokens billed per Claude call, by kind",
+    ["caller", "kind"], registry=REGISTRY,
+)
+PROMPT_CACHE_HITS = Counter(
+    "master_agent_prompt_cache_hits_total", "Claude calls that read from the prompt cache",
+    ["caller"], registry=REGISTRY,
+)
+RATE_LIMIT_WAIT_SECONDS = Histogram(
+    "master_agent_rate_limit_wait_seconds", "Time a Claude call waited for the shared rate limiter",
+    ["caller"], buckets=WAIT_BUCKETS, registry=REGISTRY,
+)
+RETRIES = Counter(
+    "master_agent_claude_retries_total", "Claude calls retried after a transient error",
+    ["caller", "error"], registry=REGISTRY,
+)
+HEDGES = Counter(
+    "master_agent_claude_hedges_total", "Duplicate Claude requests fired by hedging, by winner",
+    ["caller", "winner"], registry=REGISTRY,
+)
+DEADLINES_EXCEEDED = Counter(
+    "master_agent_deadlines_exceeded_total", "Worker tasks cancelled for running past their deadline",
+    ["worker_type"], registry=REGISTRY,
+)
+ADAPTIVE_LIMIT = Gauge(
+    "master_agent_adaptive_concurrency_limit", "Current AIMD limit on Claude calls in flight",
+    registry=REGISTRY,
+)
+RESPONSE_CACHE_HITS = Counter(
+    "master_agent_response_cache_hits_total", "Calls answered by the local response cache",
+    ["caller"], registry=REGISTRY,
+)
+WORKER_SECONDS = Histogram(
+    "master_agent_worker_seconds", "Latency of one Worker task",
+    ["worker_type", "status"], buckets=CALL_BUCKETS, registry=REGISTRY,
+)
+ACTIVE_WORKERS = Gauge(
+    "master_agent_active_workers", "Workers currently executing a task",
+    ["worker_type"], registry=REGISTRY,
+)
+PHASE_SECONDS = Histogram(
+    "master_agent_phase_seconds", "Latency of one project phase",
+    ["phase"], buckets=PHASE_BUCKETS, registry=REGISTRY,
+)
+PROJECT_SECONDS = Histogram(
+    "master_agent_project_seconds", "End-to-end latency of one project",
+    buckets=PHASE_BUCKETS, registry=REGISTRY,
+)
+SLOW_PROJECTS = Counter(
+    "master_agent_slow_projects_total",
+    "Projects slower than monitoring.alert_thresholds.slow_response_seconds",
+    registry=REGISTRY,
+)
+MEMORY_SECONDS = Histogram(
+    "master_agent_memory_seconds", "PROJECT_MEMORY read / write latency",
+    ["operation"], buckets=MEMORY_BUCKETS, registry=REGISTRY,
+)
+IAM_SDAI_SCORES = Histogram(
+    "master_agent_iam_sdai_score", "IAM-SDAI scores of completed projects, per dimension",
+    ["dimension"], buckets=SCORE_BUCKETS, registry=REGISTRY,
+)
+LOW_QUALITY_PROJECTS = Counter(
+    "master_agent_low_quality_projects_total",
+    "Projects whose overall IAM-SDAI score is below monitoring.alert_thresholds.low_quality_score",
+    registry=REGISTRY,
+)
+
+TOKEN_KINDS = {
+    "input_tokens": "input",
+    "output_tokens": "output",
+    "cache_creation_input_tokens": "cache_creation",
+    "cache_read_input_tokens": "cache_read",
+}
+
+_server_port: Optional[int] = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port: Optional[int] = None) -> Optional[int]:
+    """
+    Serve REGISTRY over HTTP on `port` (default monitoring.metrics_port).
+    No-op if monitoring.enable_metrics is false or the server already runs.
+    Returns the port being served, or None when disabled.
+    """
+    global _server_port
+    if not get_setting("monitoring", "enable_metrics", default=False):
+        return None
+
+    with _server_lock:
+        if _server_port is None:
+            port = port if port is not None else get_setting("monitoring", "metrics_port", default=8000)
+            start_http_server(port, registry=REGISTRY)
+            _server_port = port
+            print(f"📊 Metrics served on :{port}/metrics")
+        return _server_port
+
+
+def record_call(caller: str, mode: str, seconds: float, usage: Dict):
+    """One completed Claude call: latency plus its usage_record()."""
+    if usage.get("response_cache_hit"):
+        RESPONSE_CACHE_HITS.labels(caller).inc()
+        CALLS.labels(caller, "response_cache").inc()
+        return
+
+    CALL_SECONDS.labels(caller, mode).observe(seconds)
+    CALLS.labels(caller, "ok").inc()
+    for field, kind in TOKEN_KINDS.items():
+        if usage.get(field):
+            TOKENS.labels(caller, kind).inc(usage[field])
+    if usage.get("cache_read_input_tokens"):
+        PROMPT_CACHE_HITS.labels(caller).inc()
+
+
+def record_call_error(caller: str, error: BaseException):
+    CALLS.labels(caller, type(error).__name__).inc()
+
+
+@contextmanager
+def track_worker(worker_type: str):
+    """
+    Time one Worker task and count it as active meanwhile. The block may set
+    outcome["status"] (default "ok") to label the latency sample.
+    """
+    outcome = {"status": "ok"}
+    gauge = ACTIVE_WORKERS.labels(worker_type)
+    gauge.inc()
+    started = time.perf_counter()
+    try:
+        yield outcome
+    except BaseException:
+        outcome["status"] = "error"
+        raise
+    finally:
+        gauge.dec()
+        WORKER_SECONDS.labels(worker_type, outcome["status"]).observe(time.perf_counter() - started)
+
+
+@contextmanager
+def timed(histogram: Histogram, *labels: str):
+    """Observe the block's wall time on histogram.labels(*labels)."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        histogram.labels(*labels).observe(time.perf_counter() - started)
+
+
+def record_project(seconds: float):
+    """End-to-end project latency, flagged against slow_response_seconds."""
+    PROJECT_SECONDS.observe(seconds)
+    threshold = get_setting("monitoring", "alert_thresholds", "slow_response_seconds", default=None)
+    if threshold is not None and seconds > threshold:
+        SLOW_PROJECTS.inc()
+
+
+def record_scores(scores: Dict):
+    """Per-dimension IAM-SDAI scores of one project (plus the overall score)."""
+    for dimension, value in scores.items():
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            IAM_SDAI_SCORES.labels(dimension).observe(value)
+
+    threshold = get_setting("monitoring", "alert_thresholds", "low_quality_score", default=None)
+    overall = scores.get("overall")
+    if threshold is not None and isinstance(overall, (int, float)) and overall < threshold:
+        LOW_QUALITY_PROJECTS.inc()
@@ -0,0 +1,208 @@
+"""
+Opt-in per-phase profiling for Master Agent V4.0-B
+Wraps a phase in cProfile (every thread it starts, so Worker-side L1 is
+included; on Python 3.12+ only the calling thread) and tracemalloc, then
+writes next to the project's memory file:
+- {stem}.{phase}.pstats     - load with pstats / snakeviz
+- {stem}.{phase}.collapsed  - folded stacks for flamegraph.pl / speedscope
+- {stem}.profile.txt        - per-phase summary: top functions, top allocators
+"""
+
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+
+from .config import get_setting
+
+
+# One profiled window per process: cProfile and threading.setprofile hooks
+# are global, so overlapping windows (e.g. concurrent async projects) skip
+_active = threading.Lock()
+
+# Python 3.12+ runs cProfile on sys.monitoring, which allows one active
+# profiler per process: a second Profile().enable() in a Worker thread raises
+PER_THREAD_PROFILES = sys.version_info < (3, 12)
+
+# Stack paths whose share of a function's time falls below this are pruned
+MIN_STACK_SECONDS = 1e-6
+MAX_STACK_DEPTH = 64
+
+FuncKey = Tuple[str, int, str]
+
+
+class PhaseProfiler:
+    """
+    Profiles named phases of one project. `directory` and `stem` locate the
+    output files (the project's memory directory and PROJECT_MEMORY_{id}).
+    """
+
+    def __init__(self, directory: Path, stem: str, top: Optional[int] = None,
+                 frames: Optional[int] = None):
+        self.directory = Path(directory)
+        self.stem = stem
+        self.top = top if top is not None else get_setting("performance", "profiling", "top", default=15)
+        self.frames = frames if frames is not None else get_setting(
+            "performance", "profiling", "tracemalloc_frames", default=1
+        )
+
+    @classmethod
+    def enabled(cls) -> bool:
+        return bool(get_setting("performance", "profiling", "enabled", default=False))
+
+    @classmethod
+    def for_memory(cls, project_memory) -> "PhaseProfiler":
+        """Profiler writing next to a ProjectMemory's PROJECT_MEMORY_{id}.md."""
+        return cls(project_memory.file_path.parent, project_memory.file_path.stem)
+
+    @contextmanager
+    def phase(self, name: str):
+        """Profile the block as phase `name` and write its reports on exit."""
+        if not _active.acquire(blocking=False):
+            print(f"⚠️ Profiling already active; phase {name} not profiled")
+            yield
+            return
+
+        profiles: List[cProfile.Profile] = []
+        started_tracing = not tracemalloc.is_tracing()
+        if started_tracing:
+            tracemalloc.start(self.frames)
+        tracemalloc.reset_peak()
+        before = tracemalloc.take_snapshot()
+
+        def bootstrap(frame, event, arg):
+            # First profile event in a thread started inside the window
+            profile = cProfile.Profile()
+            profiles.append(profile)
+            profile.enable()
+
+        main = cProfile.Profile()
+        profiles.append(main)
+        if PER_THREAD_PROFILES:
+            threading.setprofile(bootstrap)
+        started = time.perf_counter()
+        main.enable()
+        try:
+            yield
+        finally:
+            main.disable()
+            if PER_THREAD_PROFILES:
+                threading.setprofile(None)
+            wall = time.perf_counter() - started
+            after = tracemalloc.take_snapshot()
+            peak = tracemalloc.get_traced_memory()[1]
+            if started_tracing:
+                tracemalloc.stop()
+            try:
+                self._write(name, wall, profiles, before, after, peak)
+            finally:
+                _active.release()
+
+    def _write(self, name: str, wall: float, profiles: List[cProfile.Profile],
+               before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, peak: int):
+        stats = pstats.Stats(profiles[0], stream=io.StringIO())
+        for profile in profiles[1:]:
+            try:
+                stats.add(profile)
+            except TypeError:  # thread started but never reached profiled code
+                pass
+        # Merging may disable a worker thread's profiler from here; make sure
+        # this thread is left without a profile hook either way
+        sys.setprofile(None)
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        base = self.directory / f"{self.stem}.{name}"
+        stats.dump_stats(f"{base}.pstats")
+        with open(f"{base}.collapsed", "w", encoding="utf-8") as f:
+            for stack, seconds in sorted(collapsed_stacks(stats.stats).items()):
+                f.write(f"{stack} {round(seconds * 1e6)}\n")
+
+        allocations = after.filter_traces(_NOISE).compare_to(before.filter_traces(_NOISE), "lineno")
+        with open(self.directory / f"{self.stem}.profile.txt", "a", encoding="utf-8") as f:
+            f.write(self._summary(name, wall, stats, allocations, peak))
+        print(f"📊 Profiled {name}: {wall:.2f}s, peak {_size(peak)} ({base}.pstats)")
+
+    def _summary(self, name: str, wall: float, stats: pstats.Stats,
+                 allocations: List[tracemalloc.StatisticDiff], peak: int) -> str:
+        lines = [
+            f"== {name} ==",
+            f"wall: {wall:.3f}s  profiled CPU: {stats.total_tt:.3f}s  peak traced memory: {_size(peak)}",
+        ]
+
+        lines.append(f"top {self.top} functions by own time:")
+        by_own = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)[:self.top]
+        for func, (cc, nc, tt, ct, callers) in by_own:
+            lines.append(f"  {tt:9.4f}s own  {ct:9.4f}s cum  {nc:>8} calls  {_label(func)}")
+
+        lines.append(f"top {self.top} allocators (net, live at phase end):")
+        for diff in allocations[:self.top]:
+            frame = diff.traceback[0]
+            lines.append(
+                f"  {_size(diff.size_diff, signed=True):>11}  {diff.count_diff:>+8} blocks  {frame.filename}:{frame.lineno}"
+            )
+        return "\n".join(lines) + "\n\n"
+
+
+def collapsed_stacks(stats: Dict[FuncKey, tuple]) -> Dict[str, float]:
+    """
+    Folded stacks ("root;caller;callee" -> own seconds) rebuilt from a
+    pstats caller graph. cProfile keeps only caller -> callee edges, so a
+    function's own time is split across its call paths in proportion to
+    the cumulative time each incoming edge accounts for.
+    """
+    callees: Dict[FuncKey, Dict[FuncKey, float]] = defaultdict(dict)
+    for func, (cc, nc, tt, ct, callers) in stats.items():
+        for caller, edge in callers.items():
+            callees[caller][func] = edge[3]
+
+    folded: Dict[str, float] = defaultdict(float)
+
+    def walk(func: FuncKey, path: Tuple[str, ...], visiting: frozenset, share: float):
+        tt, ct = stats[func][2], stats[func][3]
+        path = path + (_label(func),)
+        if tt * share >= MIN_STACK_SECONDS:
+            folded[";".join(path)] += tt * share
+        if len(path) >= MAX_STACK_DEPTH:
+            return
+        visiting = visiting | {func}
+        for callee, edge_ct in callees.get(func, {}).items():
+            callee_ct = stats[callee][3]
+            if callee in visiting or callee_ct <= 0:
+                continue
+            callee_share = min(1.0, edge_ct * share / callee_ct)
+            if callee_ct * callee_share >= MIN_STACK_SECONDS:
+                walk(callee, path, visiting, callee_share)
+
+    for func, (cc, nc, tt, ct, callers) in stats.items():
+        if not callers:
+            walk(func, (), frozenset(), 1.0)
+    return dict(folded)
+
+
+def _label(func: FuncKey) -> str:
+    filename, lineno, name = func
+    if filename == "~":  # built-in
+        return name.replace(";", ",")
+    return f"{name} ({Path(filename).name}:{lineno})".replace(";", ",")
+
+
+def _size(size: int, signed: bool = False) -> str:
+    sign = "+" if signed else ""
+    if abs(size) < 2**20:
+        return f"{size / 2**10:{sign}.1f} KiB"
+    return f"{size / 2**20:{sign}.2f} MiB"
+
+
+_NOISE = (
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, pstats.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+)
@@ -0,0 +1,17 @@
+"""
+Offline token estimates for Master Agent V4.0-B
+Used wherever text must be sized in Claude tokens without a network round
+trip: context packing budgets and rate-limiter admission.
+"""
+
+import re
+
+
+# Roughly one BPE token each: short Latin words (long ones split every 7
+# letters), up to 3 digits, and any other non-space character (punctuation, CJK)
+TOKEN_PIECE = re.compile(r"[A-Za-z]{1,7}|\d{1,3}|[^\sA-Za-z\d]")
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimated Claude tokens in `text` (no network round trip)."""
+    return sum(1 for _ in TOKEN_PIECE.finditer(text))
@@ -0,0 +1,371 @@
+"""
+Offline performance benchmark for Master Agent V4.0-B
+
+    python tests/performance/benchmark.py --runs 3 --output data/benchmarks/latest.json
+
+Full three-phase projects run against FakeAnthropic (sampled latency,
+token counts and failure rates, no network), followed by micro-benchmarks
+for ProjectMemory I/O and L1/L2/L3 validator throughput. Results are JSON;
+--baseline compares against an earlier file and exits non-zero on regressions.
+--profile-dir adds per-phase cProfile / tracemalloc reports of the full runs.
+--scheduler graph runs the Workers as one dependency graph instead of phase by phase.
+"""
+
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import click
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from src.core import client_pool  # noqa: E402
+from src.core.adaptive_concurrency import RetryPolicy, set_retry_policy  # noqa: E402
+from src.core.hedging import Hedging, set_hedging  # noqa: E402
+from src.core.prompt_registry import MASTER_PROMPT, PromptRegistry, set_prompt_registry  # noqa: E402
+from src.lifecycle.agent_lifecycle import AgentLifecycleManager  # noqa: E402
+from tests.performance.fake_anthropic import (  # noqa: E402
+    FailureModel, FakeAnthropic, LatencyModel, synthetic_text
+)
+
+
+BENCHMARK_KEY = "benchmark-offline-key"
+SCHEMA_VERSION = 1
+
+# Metrics where larger is better; every other compared metric is "lower is better"
+HIGHER_IS_BETTER = ("ops_per_sec",)
+
+# Reports PhaseProfiler writes next to each PROJECT_MEMORY file
+PROFILE_PATTERNS = ("*.pstats", "*.collapsed", "*.profile.txt")
+
+# Completed calls per caller before --hedge-percentile starts hedging
+HEDGE_MIN_SAMPLES = 5
+
+
+def summarize(samples: List[float]) -> Dict:
+    """n / mean / p50 / p95 / max of a list of seconds."""
+    if not samples:
+        return {"n": 0}
+    ordered = sorted(samples)
+    return {
+        "n": len(ordered),
+        "mean": statistics.fmean(ordered),
+        "p50": ordered[len(ordered) // 2],
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))],
+        "max": ordered[-1],
+    }
+
+
+def timed(fn: Callable[[], object], repeat: int) -> Dict:
+    """Run `fn` `repeat` times; per-op latency summary plus throughput."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    total = sum(samples)
+    return {"latency": summarize(samples), "ops_per_sec": repeat / total if total else None}
+
+
+@contextmanager
+def offline_environment(client: FakeAnthropic):
+    """
+    Temp working directory (PROJECT_MEMORY files), stub prompts for every
+    Worker, `client` installed as the shared Anthropic client and retry
+    backoff scaled by its time_scale like every simulated wait.
+    """
+    previous_cwd = os.getcwd()
+    previous_key = os.environ.get("ANTHROPIC_API_KEY")
+    with tempfile.TemporaryDirectory(prefix="master-agent-bench-") as workdir:
+        prompt_dir = Path(workdir) / "prompts"
+        (prompt_dir / "worker_prompts").mkdir(parents=True)
+        (prompt_dir / f"{MASTER_PROMPT}.md").write_text("# Master prompt (benchmark)\n" * 40, encoding="utf-8")
+        for worker_type in AgentLifecycleManager.all_worker_types():
+            (prompt_dir / "worker_prompts" / f"{worker_type}.md").write_text(
+                f"# {worker_type} Worker (benchmark)\n" * 40, encoding="utf-8"
+            )
+
+        os.chdir(workdir)
+        os.environ["ANTHROPIC_API_KEY"] = BENCHMARK_KEY
+        set_prompt_registry(PromptRegistry(str(prompt_dir)))
+        client_pool.set_shared_client(BENCHMARK_KEY, client)
+        policy = RetryPolicy.from_config()
+        scale = client.messages.time_scale
+        set_retry_policy(RetryPolicy(
+            max_retries=policy.max_retries, base_delay=policy.base_delay * scale,
+            max_delay=policy.max_delay * scale, deadline=policy.deadline and policy.deadline * scale
+        ))
+        try:
+            yield Path(workdir)
+        finally:
+            set_retry_policy(None)
+            client_pool.set_shared_client(BENCHMARK_KEY, None)
+            set_prompt_registry(None)
+            os.chdir(previous_cwd)
+            if previous_key is None:
+                os.environ.pop("ANTHROPIC_API_KEY", None)
+            else:
+                os.environ["ANTHROPIC_API_KEY"] = previous_key
+
+
+def run_project(project_id: str, query: str, profile: bool = False, resume: bool = False,
+                scheduler: str = "phases") -> Dict:
+    """One main.py-style project: plan, three Worker phases (or the Worker graph), L3."""
+    from src.core.master_agent import MasterAgent
+    from src.memory.storage import parse_scores
+
+    master = MasterAgent(api_key=BENCHMARK_KEY, profile=profile, resume=resume)
+    master.start_project(query, project_id)
+
+    plans = {
+        phase_num: {
+            worker_type: f"Phase {phase_num} task for {worker_type}: {query}"
+            for worker_type in AgentLifecycleManager.PHASE_WORKERS[phase_num]
+        }
+        for phase_num in sorted(AgentLifecycleManager.PHASE_WORKERS)
+    }
+    if scheduler == "graph":
+        validated = master.execute_graph_with_lifecycle(
+            {worker_type: task for plan in plans.values() for worker_type, task in plan.items()}
+        )
+    else:
+        validated = {
+            phase_num: master.execute_phase_with_lifecycle(phase_num, plan) for phase_num, plan in plans.items()
+        }
+    contradictions = sum(len(results["contradictions"]) for results in validated.values())
+    worker_failures = sum(1 for results in validated.values() for result in results["results"] if not result)
+
+    master.complete_project()
+    scores = parse_scores(master.project_memory.read_section("iam_sdai_scores"))
+    master.project_memory.flush()
+    return {"contradictions": contradictions, "worker_failures": worker_failures, "scores": scores}
+
+
+def bench_full_runs(runs: int, client: FakeAnthropic, profile: bool = False, scheduler: str = "phases") -> Dict:
+    """Wall time, simulated API time and token usage of `runs` full projects."""
+    messages = client.messages
+    wall, simulated, overall = [], [], []
+    failed_runs = contradictions = worker_failures = 0
+
+    for run in range(runs):
+        api_before = messages.stats["simulated_seconds"]
+        start = time.perf_counter()
+        try:
+            outcome = run_project(f"bench_{run:04d}", "Benchmark market entry analysis", profile,
+                                  scheduler=scheduler)
+        except Exception as e:
+            failed_runs += 1
+            print(f"❌ Run {run} failed: {type(e).__name__}: {e}", file=sys.stderr)
+            continue
+        wall.append(time.perf_counter() - start)
+        simulated.append(messages.stats["simulated_seconds"] - api_before)
+        contradictions += outcome["contradictions"]
+        worker_failures += outcome["worker_failures"]
+        overall.append(outcome["scores"].get("overall", 0.0))
+
+    stats = messages.stats
+    completed = max(1, runs - failed_runs)
+    input_side = stats["input_tokens"] + stats["cache_creation_input_tokens"] + stats["cache_read_input_tokens"]
+    return {
+        "runs": runs,
+        "failed_runs": failed_runs,
+        "wall_seconds": summarize(wall),
+        # Wall time at unscaled API latency; an upper bound, since local CPU
+        # time gets scaled up along with the simulated waits
+        "projected_seconds": summarize([w / messages.time_scale for w in wall]),
+        "api_latency_seconds_per_run": summarize(simulated),
+        "api_calls": stats["calls"],
+        "api_failures": stats["failures"],
+        "worker_failures": worker_failures,
+        "contradictions_per_run": contradictions / completed,
+        "tokens_per_run": {
+            field: stats[field] / completed
+            for field in ("input_tokens", "output_tokens", "cache_creation_input_tokens", "cache_read_input_tokens")
+        },
+        "cache_read_share": stats["cache_read_input_tokens"] / input_side if input_side else 0.0,
+        "iam_sdai_overall_mean": statistics.fmean(overall) if overall else None,
+    }
+
+
+def bench_memory(workdir: Path, repeat: int) -> Dict:
+    """ProjectMemory write / read / summary latency."""
+    from src.memory.project_memory import ProjectMemory
+
+    memory = ProjectMemory("bench_memory", base_dir=str(workdir / "micro"))
+    payload = synthetic_text(random.Random(1), 400)
+    counter = iter(range(10 ** 9))
+
+    results = {
+        "memory.write_section": timed(lambda: memory.write_section(f"section_{next(counter) % 20}", payload), repeat),
+        "memory.read_section": timed(lambda: memory.read_section("section_7"), repeat),
+        "memory.get_summary": timed(memory.get_summary, repeat),
+    }
+    memory.flush()
+    return results
+
+
+def bench_validators(repeat: int) -> Dict:
+    """L1 / L2 / L3 throughput on synthetic Worker outputs (analysis memo cleared per op)."""
+    from src.quality.document import analyze
+    from src.quality.l1_self_check import SelfChecker
+    from src.quality.l2_cross_validation import CrossValidator
+    from src.quality.l3_iam_sdai import IAMSDAI
+
+    rng = random.Random(2)
+    outputs = [synthetic_text(rng, 1500) for _ in range(8)]
+    results = [{"worker_type": f"worker_{i}", "result": text} for i, text in enumerate(outputs)]
+    report = " ".join(outputs)
+    checker, scorer = SelfChecker(), IAMSDAI()
+
+    def cold(fn):
+        def run():
+            analyze.cache_clear()
+            return fn()
+        return run
+
+    return {
+        "quality.l1_check": timed(cold(lambda: checker.check(outputs[0], "bench")), repeat),
+        "quality.l2_validate_8_workers": timed(cold(lambda: CrossValidator().validate(results)), max(1, repeat // 10)),
+        "quality.l3_validate": timed(cold(lambda: scorer.validate(report)), max(1, repeat // 10)),
+        "quality.l3_batch_1000": timed(lambda: scorer.validate_batch([report[:5000]] * 1000), 1),
+    }
+
+
+def copy_profiles(workdir: Path, target: Path):
+    """Copy the per-phase profiling reports out of the temporary workdir."""
+    target.mkdir(parents=True, exist_ok=True)
+    for pattern in PROFILE_PATTERNS:
+        for path in (workdir / "data" / "project_memories").glob(pattern):
+            shutil.copy2(path, target / path.name)
+    print(f"📊 Profiles copied to {target}", file=sys.stderr)
+
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float) -> List[str]:
+    """Metrics that got worse than `baseline` by more than `tolerance` (relative)."""
+    regressions = []
+    for name, result in current["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if not before:
+            continue
+        for metric, now, then in _comparable(result, before):
+            if not then:
+                continue
+            change = (now - then) / then
+            worse = change < -tolerance if metric.endswith(HIGHER_IS_BETTER) else change > tolerance
+            if worse:
+                regressions.append(f"{name}.{metric}: {then:.4g} -> {now:.4g} ({change:+.0%})")
+    return regressions
+
+
+def _comparable(result: Dict, before: Dict):
+    if "ops_per_sec" in result:
+        yield "ops_per_sec", result["ops_per_sec"], before.get("ops_per_sec")
+        yield "latency.p95", result["latency"]["p95"], before.get("latency", {}).get("p95")
+    if "wall_seconds" in result and result["wall_seconds"].get("n"):
+        yield "wall_seconds.p50", result["wall_seconds"]["p50"], before.get("wall_seconds", {}).get("p50")
+        for field, value in result["tokens_per_run"].items():
+            if field != "cache_read_input_tokens":
+                yield f"tokens_per_run.{field}", value, before.get("tokens_per_run", {}).get(field)
+
+
+@click.command()
+@click.option("--runs", default=3, show_default=True, help="Full three-phase projects to run.")
+@click.option("--latency", "distribution", type=click.Choice(["fixed", "uniform", "lognormal"]),
+              default="lognormal", show_default=True, help="API latency distribution.")
+@click.option("--latency-median", default=4.0, show_default=True, help="Median (or fixed) call latency, seconds.")
+@click.option("--latency-sigma", default=0.5, show_default=True, help="Lognormal spread.")
+@click.option("--output-tokens", default=(400, 1200), type=(int, int), show_default=True,
+              help="Min / max output tokens per call.")
+@click.option("--rate-limit-rate", default=0.0, show_default=True, help="Share of calls failing with 429.")
+@click.option("--overload-rate", default=0.0, show_default=True, help="Share of calls failing with 529.")
+@click.option("--time-scale", default=0.01, show_default=True,
+              help="Multiplier on simulated sleeps (0.01: a 4 s call sleeps 40 ms).")
+@click.option("--repeat", default=200, show_default=True, help="Iterations per micro-benchmark.")
+@click.option("--micro/--no-micro", default=True, help="Run micro-benchmarks.")
+@click.option("--seed", default=0, show_default=True)
+@click.option("--output", type=click.Path(dir_okay=False), help="Write the JSON result here.")
+@click.option("--baseline", type=click.Path(exists=True, dir_okay=False), help="Earlier result to compare with.")
+@click.option("--tolerance", default=0.2, show_default=True, help="Allowed relative regression vs baseline.")
+@click.option("--profile-dir", type=click.Path(file_okay=False),
+              help="Profile every phase of the full runs and copy the reports here.")
+@click.option("--scheduler", type=click.Choice(["phases", "graph"]), default="phases", show_default=True,
+              help="Run Workers phase by phase or as one dependency graph.")
+@click.option("--hedge-percentile", type=float,
+              help="Hedge calls slower than this latency percentile of their caller (default: api.hedging).")
+def main(runs, distribution, latency_median, latency_sigma, output_tokens, rate_limit_rate, overload_rate,
+         time_scale, repeat, micro, seed, output, baseline, tolerance, profile_dir, scheduler, hedge_percentile):
+    """Run the offline benchmark and print (or write) JSON results."""
+    latency = LatencyModel(distribution, value=latency_median, low=latency_median / 2,
+                           high=latency_median * 1.5, median=latency_median, sigma=latency_sigma)
+    failures = FailureModel(rate_limit=rate_limit_rate, overloaded=overload_rate, retry_after=time_scale)
+    client = FakeAnthropic(latency=latency, failures=failures, output_tokens=output_tokens,
+                           time_scale=time_scale, seed=seed)
+
+    report = {
+        "schema": SCHEMA_VERSION,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "settings": {
+            "runs": runs, "latency": latency.describe(), "failures": failures.describe(),
+            "output_tokens": list(output_tokens), "time_scale": time_scale, "repeat": repeat, "seed": seed,
+            "scheduler": scheduler, "hedge_percentile": hedge_percentile,
+        },
+        "results": {},
+    }
+
+    if hedge_percentile is not None:
+        set_hedging(Hedging(hedge_percentile, min_samples=HEDGE_MIN_SAMPLES) if hedge_percentile else None)
+
+    with offline_environment(client) as workdir:
+        if runs:
+            report["results"]["full_run"] = bench_full_runs(
+                runs, client, profile=bool(profile_dir), scheduler=scheduler
+            )
+        if profile_dir:
+            copy_profiles(workdir, Path(profile_dir))
+        if micro:
+            report["results"].update(bench_memory(workdir, repeat))
+            report["results"].update(bench_validators(repeat))
+
+    text = json.dumps(report, indent=2)
+    if output:
+        Path(output).parent.mkdir(parents=True, exist_ok=True)
+        Path(output).write_text(text + "\n", encoding="utf-8")
+        print(f"📊 Benchmark written to {output}", file=sys.stderr)
+    else:
+        print(text)
+
+    if baseline:
+        regressions = compare(report, json.loads(Path(baseline).read_text(encoding="utf-8")), tolerance)
+        for regression in regressions:
+            print(f"⚠️ Regression: {regression}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
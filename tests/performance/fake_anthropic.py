@@ -0,0 +1,278 @@
+"""
+Offline stand-in for the Anthropic client used by the benchmarks.
+messages.create / messages.stream sleep for a sampled latency, return
+synthetic research text with usage figures, and fail at configured rates
+with the same exception types the real SDK raises (including
+APITimeoutError when a create's latency exceeds its `timeout`).
+"""
+
+from contextlib import asynccontextmanager, contextmanager
+from types import SimpleNamespace
+from typing import Dict, Optional
+import asyncio
+import hashlib
+import math
+import random
+import threading
+import time
+
+import anthropic
+
+try:  # anthropic >= 1.0 ships its transport as httpx2
+    import httpx2 as httpx
+except ImportError:
+    import httpx
+
+
+class LatencyModel:
+    """
+    Call latency in seconds:
+    - "fixed": `value`
+    - "uniform": between `low` and `high`
+    - "lognormal": `median` with spread `sigma` (long right tail, like real APIs)
+    Streams deliver the first chunk after `ttft_fraction` of the latency.
+    """
+
+    def __init__(self, distribution: str = "lognormal", value: float = 1.0, low: float = 0.5,
+                 high: float = 2.0, median: float = 1.0, sigma: float = 0.5, ttft_fraction: float = 0.2):
+        if distribution not in ("fixed", "uniform", "lognormal"):
+            raise ValueError(f"Unknown latency distribution: {distribution}")
+        self.distribution = distribution
+        self.value = value
+        self.low = low
+        self.high = high
+        self.median = median
+        self.sigma = sigma
+        self.ttft_fraction = ttft_fraction
+
+    def sample(self, rng: random.Random) -> float:
+        if self.distribution == "fixed":
+            return self.value
+        if self.distribution == "uniform":
+            return rng.uniform(self.low, self.high)
+        return rng.lognormvariate(math.log(self.median), self.sigma)
+
+    def describe(self) -> Dict:
+        return dict(vars(self))
+
+
+class FailureModel:
+    """Per-call probabilities of 429 (rate limit), 529 (overloaded) and connection errors."""
+
+    def __init__(self, rate_limit: float = 0.0, overloaded: float = 0.0, connection: float = 0.0,
+                 retry_after: float = 1.0):
+        self.rate_limit = rate_limit
+        self.overloaded = overloaded
+        self.connection = connection
+        self.retry_after = retry_after
+
+    def maybe_raise(self, rng: random.Random):
+        roll = rng.random()
+        request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+        if roll < self.rate_limit:
+            response = httpx.Response(429, request=request, headers={"retry-after": str(self.retry_after)})
+            raise anthropic.RateLimitError("Simulated rate limit", response=response, body=None)
+        roll -= self.rate_limit
+        if roll < self.overloaded:
+            response = httpx.Response(529, request=request)
+            raise anthropic.OverloadedError("Simulated overload", response=response, body=None)
+        roll -= self.overloaded
+        if roll < self.connection:
+            raise anthropic.APIConnectionError(message="Simulated connection error", request=request)
+
+    def describe(self) -> Dict:
+        return dict(vars(self))
+
+
+SENTENCES = [
+    "The market size is ${n}B in 2024 [cite:{c}]",
+    "Annual growth is {a}-{b}% according to Gartner Research [cite:{c}]",
+    "Adoption will grow because enterprise demand is strong",
+    "However, pricing power is weak in smaller segments",
+    "For example, churn is {a}% for mid-market customers [cite:{c}]",
+    "Therefore we recommend a phased entry, as mentioned earlier",
+    "Alternatively, partners could accelerate distribution",
+    "Regulation is not a barrier for compliant vendors",
+]
+
+
+def synthetic_text(rng: random.Random, words: int) -> str:
+    """Research-style prose with citations, numbers and IAM-SDAI markers."""
+    parts, count, citation = [], 0, 1
+    while count < words:
+        template = rng.choice(SENTENCES)
+        a = rng.randint(5, 15)
+        sentence = template.format(n=rng.randint(8, 12), a=a, b=a + rng.randint(1, 10), c=citation)
+        citation += "{c}" in template
+        parts.append(sentence)
+        count += len(sentence.split())
+    return ". ".join(parts) + "."
+
+
+class FakeMessages:
+    """
+    Synchronous messages resource. Output length is drawn uniformly from
+    `output_tokens` (min, max); prompt caching is simulated: the first call
+    with a given cached prefix pays cache creation, later calls read it.
+    `time_scale` multiplies every sleep (e.g. 0.01 replays a 47 s run in 0.47 s).
+    """
+
+    def __init__(self, latency: Optional[LatencyModel] = None, failures: Optional[FailureModel] = None,
+                 output_tokens=(400, 1200), time_scale: float = 1.0, seed: int = 0):
+        self.latency = latency or LatencyModel()
+        self.failures = failures or FailureModel()
+        self.output_tokens = output_tokens
+        self.time_scale = time_scale
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._cached_prefixes = set()
+        self.stats = {
+            "calls": 0, "failures": 0, "simulated_seconds": 0.0,
+            "input_tokens": 0, "output_tokens": 0,
+            "cache_creation_input_tokens": 0, "cache_read_input_tokens": 0,
+        }
+
+    def create(self, timeout: Optional[float] = None, **request):
+        latency, response = self._plan(request)
+        time.sleep(self._bounded(latency, timeout))
+        self._check_timeout(latency, timeout)
+        return response
+
+    @contextmanager
+    def stream(self, timeout: Optional[float] = None, **request):
+        latency, response = self._plan(request)
+        yield FakeStream(response, latency * self.time_scale, self.latency.ttft_fraction)
+
+    def _bounded(self, latency: float, timeout: Optional[float]) -> float:
+        """Seconds a call sleeps: its scaled latency, cut off at `timeout`."""
+        delay = latency * self.time_scale
+        return delay if timeout is None else min(delay, timeout)
+
+    def _check_timeout(self, latency: float, timeout: Optional[float]):
+        if timeout is not None and latency * self.time_scale > timeout:
+            request = httpx.Request("POST", "https://api.anthropic.com/v1/messages")
+            raise anthropic.APITimeoutError(request=request)
+
+    def _plan(self, request: Dict):
+        """Sample one call: latency, outcome and response (thread-safe)."""
+        with self._lock:
+            self.stats["calls"] += 1
+            latency = self.latency.sample(self._rng)
+            self.stats["simulated_seconds"] += latency
+            try:
+                self.failures.maybe_raise(self._rng)
+            except anthropic.AnthropicError:
+                self.stats["failures"] += 1
+                raise
+            output_tokens = self._rng.randint(*self.output_tokens)
+            text = synthetic_text(self._rng, int(output_tokens * 0.75))
+            usage = self._usage(request, output_tokens)
+        return latency, SimpleNamespace(content=[SimpleNamespace(text=text)], usage=usage)
+
+    def _usage(self, request: Dict, output_tokens: int) -> SimpleNamespace:
+        cached, uncached = 0, 0
+        for block in _blocks(request):
+            tokens = max(1, len(block.get("text", "")) // 4)
+            if "cache_control" in block:
+                cached += tokens
+            else:
+                uncached += tokens
+
+        prefix = hashlib.sha256(repr(request.get("system")).encode("utf-8")).hexdigest()
+        usage = {"input_tokens": uncached, "output_tokens": output_tokens,
+                 "cache_creation_input_tokens": 0, "cache_read_input_tokens": 0}
+        if cached:
+            field = "cache_read_input_tokens" if prefix in self._cached_prefixes else "cache_creation_input_tokens"
+            usage[field] = cached
+            self._cached_prefixes.add(prefix)
+        for field, value in usage.items():
+            self.stats[field] += value
+        return SimpleNamespace(**usage)
+
+
+class FakeStream:
+    """messages.stream context: text_stream paced over the call's latency."""
+
+    CHUNK_WORDS = 20
+
+    def __init__(self, response, seconds: float, ttft_fraction: float = 0.2):
+        self._response = response
+        self._seconds = seconds
+        self._ttft_fraction = ttft_fraction
+
+    @property
+    def text_stream(self):
+        chunks = self._chunks()
+        time.sleep(self._seconds * self._ttft_fraction)
+        interval = self._seconds * (1 - self._ttft_fraction) / len(chunks)
+        for i, chunk in enumerate(chunks):
+            if i:
+                time.sleep(interval)
+            yield chunk
+
+    def get_final_message(self):
+        return self._response
+
+    def _chunks(self):
+        """The response text in CHUNK_WORDS-word pieces that join back exactly."""
+        words = self._response.content[0].text.split(" ")
+        return [
+            " ".join(words[i:i + self.CHUNK_WORDS]) + ("" if i + self.CHUNK_WORDS >= len(words) else " ")
+            for i in range(0, len(words), self.CHUNK_WORDS)
+        ]
+
+
+class AsyncFakeMessages(FakeMessages):
+    """Awaitable messages resource for AsyncAnthropic call paths."""
+
+    async def create(self, timeout: Optional[float] = None, **request):
+        latency, response = self._plan(request)
+        await asyncio.sleep(self._bounded(latency, timeout))
+        self._check_timeout(latency, timeout)
+        return response
+
+    @asynccontextmanager
+    async def stream(self, timeout: Optional[float] = None, **request):
+        latency, response = self._plan(request)
+        yield AsyncFakeStream(response, latency * self.time_scale, self.latency.ttft_fraction)
+
+
+class AsyncFakeStream(FakeStream):
+
+    @property
+    async def text_stream(self):
+        chunks = self._chunks()
+        await asyncio.sleep(self._seconds * self._ttft_fraction)
+        interval = self._seconds * (1 - self._ttft_fraction) / len(chunks)
+        for i, chunk in enumerate(chunks):
+            if i:
+                await asyncio.sleep(interval)
+            yield chunk
+
+    async def get_final_message(self):
+        return self._response
+
+
+class FakeAnthropic:
+    """Drop-in for anthropic.Anthropic / AsyncAnthropic: only `.messages` is used."""
+
+    def __init__(self, asynchronous: bool = False, **settings):
+        self.messages = (AsyncFakeMessages if asynchronous else FakeMessages)(**settings)
+
+    def close(self):
+        pass
+
+
+def _blocks(request: Dict):
+    """Every text block of a request (system and user), string or block layout."""
+    system = request.get("system")
+    if isinstance(system, str):
+        yield {"text": system}
+    elif system:
+        yield from system
+    for message in request.get("messages", []):
+        content = message.get("content")
+        if isinstance(content, str):
+            yield {"text": content}
+        else:
+            yield from content
@@ -0,0 +1,95 @@
+"""
+Benchmark harness smoke tests (tiny, scaled-down runs; no network)
+"""
+
+import json
+import random
+
+import anthropic
+import pytest
+from click.testing import CliRunner
+from tests.performance.benchmark import compare, main
+from src.utils.profiling import PER_THREAD_PROFILES
+from tests.performance.fake_anthropic import FailureModel, FakeMessages, LatencyModel
+
+
+def test_benchmark_emits_comparable_json(tmp_path):
+    """Full runs plus micro-benchmarks produce JSON a later run can be compared to."""
+    output = tmp_path / "bench.json"
+    result = CliRunner().invoke(main, [
+        "--runs", "2", "--repeat", "2", "--latency", "fixed", "--latency-median", "1",
+        "--time-scale", "0.001", "--output", str(output),
+    ])
+    assert result.exit_code == 0, result.output
+
+    report = json.loads(output.read_text(encoding="utf-8"))
+    full_run = report["results"]["full_run"]
+    assert full_run["failed_runs"] == 0
+    assert full_run["api_calls"] == 2 * (1 + 8)  # Master plan + every Worker of phases 1-3
+    assert full_run["tokens_per_run"]["cache_read_input_tokens"] > 0  # second run reads the prompt cache
+    assert {"memory.write_section", "quality.l1_check", "quality.l3_batch_1000"} <= set(report["results"])
+    assert compare(report, report, tolerance=0.2) == []
+
+    slower = json.loads(json.dumps(report))
+    slower["results"]["quality.l1_check"]["ops_per_sec"] *= 2
+    assert compare(report, slower, tolerance=0.2)[0].startswith("quality.l1_check.ops_per_sec")
+
+
+def test_fake_client_fails_like_the_sdk():
+    """Injected failures are the SDK's own exception types and status codes."""
+    messages = FakeMessages(latency=LatencyModel("fixed", value=0), failures=FailureModel(rate_limit=1.0))
+    with pytest.raises(anthropic.RateLimitError) as error:
+        messages.create(model="m", max_tokens=1, messages=[{"role": "user", "content": "hi"}])
+    assert error.value.status_code == 429
+    assert error.value.response.headers["retry-after"] == "1.0"
+
+    lognormal = LatencyModel("lognormal", median=2.0, sigma=0.5)
+    samples = sorted(lognormal.sample(random.Random(0)) for _ in range(2001))
+    assert 1.8 < samples[1000] < 2.2
+
+
+def test_profile_dir_collects_per_phase_reports(tmp_path):
+    """Each phase yields pstats, folded stacks and a summary section."""
+    import pstats
+
+    result = CliRunner().invoke(main, [
+        "--runs", "1", "--no-micro", "--latency", "fixed", "--latency-median", "1",
+        "--time-scale", "0.001", "--profile-dir", str(tmp_path),
+    ])
+    assert result.exit_code == 0, result.output
+
+    phases = ["start_project", "phase1", "phase2", "phase3", "complete_project"]
+    for phase in phases:
+        stats = pstats.Stats(str(tmp_path / f"PROJECT_MEMORY_bench_0000.{phase}.pstats"))
+        assert stats.total_calls > 0
+        folded = (tmp_path / f"PROJECT_MEMORY_bench_0000.{phase}.collapsed").read_text(encoding="utf-8")
+        assert all(line.rsplit(" ", 1)[1].isdigit() for line in folded.splitlines())
+
+    summary = (tmp_path / "PROJECT_MEMORY_bench_0000.profile.txt").read_text(encoding="utf-8")
+    assert [line[3:-3] for line in summary.splitlines() if line.startswith("== ")] == phases
+    assert "top 15 allocators" in summary
+    if PER_THREAD_PROFILES:  # L1 runs in the Worker threads
+        assert "tokenize (document.py" in (tmp_path / "PROJECT_MEMORY_bench_0000.phase1.collapsed").read_text()
+
+
+def test_profiler_falls_back_to_the_calling_thread(tmp_path, monkeypatch):
+    """Where only one profiler may be active (3.12+), Worker threads are simply not profiled."""
+    import threading
+    from src.utils import profiling
+
+    def busy():
+        sum(i * i for i in range(10000))
+
+    monkeypatch.setattr(profiling, "PER_THREAD_PROFILES", False)
+    with profiling.PhaseProfiler(tmp_path, "fallback").phase("phase1"):
+        busy()
+        thread = threading.Thread(target=busy)
+        thread.start()
+        thread.join()
+
+    assert "busy (test_benchmark.py" in (tmp_path / "fallback.phase1.collapsed").read_text()
+    assert threading.getprofile() is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
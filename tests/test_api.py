@@ -0,0 +1,419 @@
+"""
+Claude call path tests for Master Agent V4.0-B (no network: stub clients)
+"""
+
+from contextlib import contextmanager
+from types import SimpleNamespace
+import random
+import time
+
+import pytest
+from src.core.response_cache import ResponseCache, set_response_cache
+from src.core.worker_agent import WorkerAgent
+
+
+class StubMessages:
+    """messages.create returning a canned completion and recording requests."""
+
+    def __init__(self, text: str = "Result [cite:1] [cite:2]"):
+        self.text = text
+        self.calls = []
+
+    def create(self, **kwargs):
+        self.calls.append(kwargs)
+        usage = SimpleNamespace(input_tokens=40, output_tokens=12,
+                                cache_creation_input_tokens=0, cache_read_input_tokens=1500)
+        return SimpleNamespace(content=[SimpleNamespace(text=self.text)], usage=usage)
+
+    @contextmanager
+    def stream(self, **kwargs):
+        self.calls.append(kwargs)
+        words = self.text.split(" ")
+        yield SimpleNamespace(text_stream=iter([w + " " for w in words[:-1]] + words[-1:]))
+
+
+@pytest.fixture
+def stub_worker():
+    worker = WorkerAgent(api_key="test-key", worker_type="market_research")
+    worker.client = SimpleNamespace(messages=StubMessages())
+    return worker
+
+
+@pytest.fixture
+def response_cache(tmp_path):
+    cache = ResponseCache(cache_dir=str(tmp_path / "cache"))
+    set_response_cache(cache)
+    yield cache
+    set_response_cache(None)
+
+
+def test_identical_requests_are_billed_once(stub_worker, response_cache):
+    """Second identical call is a memory hit; use_cache=False bypasses it."""
+    first = stub_worker._call_claude("system", "task")
+    second = stub_worker._call_claude("system", "task")
+    stub_worker._call_claude("system", "task", use_cache=False)
+
+    assert first == second
+    assert len(stub_worker.client.messages.calls) == 2
+    assert response_cache.stats["memory_hits"] == 1
+
+
+def test_disk_tier_survives_restart_and_evicts(tmp_path, stub_worker, response_cache):
+    """A fresh cache on the same directory hits disk; TTL and size evict."""
+    stub_worker._call_claude("system", "task")
+
+    restarted = ResponseCache(cache_dir=str(tmp_path / "cache"))
+    request = stub_worker.client.messages.calls[0]
+    assert restarted.get(request) == "Result [cite:1] [cite:2]"
+    assert restarted.stats["disk_hits"] == 1
+
+    expired = ResponseCache(cache_dir=str(tmp_path / "cache"), memory_entries=0, ttl_seconds=-1)
+    assert expired.get(request) is None
+
+    small = ResponseCache(cache_dir=str(tmp_path / "small"), max_disk_bytes=200)
+    for i in range(5):
+        small.put({"n": i}, "x" * 100)
+    assert small.stats["evictions"] >= 3
+    assert small.get({"n": 4}) is not None
+
+
+def test_stream_task_yields_chunks_and_checked_result(stub_worker):
+    """Chunks arrive incrementally and the L1 result is ready at stream end."""
+    stream = stub_worker.stream_task(task="size the market", project_memory="ctx")
+
+    chunks = list(stream)
+    result = stream.result()
+
+    assert len(chunks) == 3
+    assert "".join(chunks) == "Result [cite:1] [cite:2]"
+    assert result["citations"] == ["[cite:1]", "[cite:2]"]
+    assert result["result"] == stub_worker._package_result("Result [cite:1] [cite:2]")["result"]
+
+
+def test_worker_request_uses_prompt_cache_layout(stub_worker):
+    """System prompt, then project context, then task; breakpoints on the stable blocks."""
+    result = stub_worker.execute_task(task="size the market", project_memory="hydrogen summary")
+
+    request = stub_worker.client.messages.calls[0]
+    assert request["system"] == [{
+        "type": "text",
+        "text": stub_worker._load_prompt(),
+        "cache_control": {"type": "ephemeral"}
+    }]
+    context_block, task_block = request["messages"][0]["content"]
+    assert context_block == {
+        "type": "text",
+        "text": "Project Context: hydrogen summary",
+        "cache_control": {"type": "ephemeral"}
+    }
+    assert task_block == {"type": "text", "text": "Task: size the market"}
+
+    assert result["usage"][0]["cache_read_input_tokens"] == 1500
+    assert result["usage"][0]["cache_creation_input_tokens"] == 0
+
+
+def test_prompt_registry_serves_from_memory_and_reloads_on_mtime(tmp_path):
+    """Prompts load once, reload on mtime change and expose a content hash."""
+    import os
+    from src.core.prompt_registry import PromptRegistry
+
+    (tmp_path / "worker_prompts").mkdir()
+    (tmp_path / "master_prompt_v4.0b.md").write_text("master v1")
+    worker_file = tmp_path / "worker_prompts" / "market_research.md"
+    worker_file.write_text("market v1")
+
+    registry = PromptRegistry(str(tmp_path), check_interval=0)
+    assert sorted(registry.preload()) == ["master_prompt_v4.0b", "worker_prompts/market_research"]
+    first_hash = registry.content_hash("worker_prompts/market_research")
+
+    worker_file.write_text("market v2")
+    os.utime(worker_file, ns=(1, 1))
+    assert registry.worker_prompt("market_research") == "market v2"
+    assert registry.content_hash("worker_prompts/market_research") != first_hash
+
+    registry.validate(["market_research"])
+    with pytest.raises(FileNotFoundError, match="tech_analysis.md"):
+        registry.validate(["market_research", "tech_analysis"])
+
+
+def test_calls_export_latency_tokens_and_cache_hits(stub_worker, response_cache):
+    """Every call lands in the metrics registry, labelled by its caller."""
+    from src.utils.metrics import REGISTRY
+
+    def sample(name, **labels):
+        return REGISTRY.get_sample_value(name, {"caller": "market_research", **labels}) or 0
+
+    before = {
+        "calls": sample("master_agent_claude_call_seconds_count", mode="create"),
+        "output": sample("master_agent_tokens_total", kind="output"),
+        "prompt_hits": sample("master_agent_prompt_cache_hits_total"),
+        "response_hits": sample("master_agent_response_cache_hits_total"),
+    }
+    stub_worker._call_claude("metrics system", "metrics task")
+    stub_worker._call_claude("metrics system", "metrics task")
+
+    assert sample("master_agent_claude_call_seconds_count", mode="create") == before["calls"] + 1
+    assert sample("master_agent_tokens_total", kind="output") == before["output"] + 12
+    assert sample("master_agent_prompt_cache_hits_total") == before["prompt_hits"] + 1
+    assert sample("master_agent_response_cache_hits_total") == before["response_hits"] + 1
+
+
+def test_rate_limiter_charges_billed_tokens_and_caps_calls(stub_worker):
+    """Output tokens are charged after the call; the next call waits for the refill."""
+    from src.core.rate_limiter import RateLimiter, set_rate_limiter
+    from src.utils.metrics import REGISTRY
+
+    limiter = RateLimiter(max_concurrent=1, tokens_per_minute=6000)  # 100 tokens/s
+    with limiter.limit(5500) as permit:
+        assert limiter._try_acquire(1) > 0  # the only slot is taken
+        permit.settle({"input_tokens": 5500, "output_tokens": 400})
+
+    with limiter.limit(150) as permit:
+        pass
+    assert 0.3 < permit.waited < 0.9  # ~100 tokens left, 50 more take 0.5 s
+
+    def waits():
+        return REGISTRY.get_sample_value("master_agent_rate_limit_wait_seconds_count",
+                                         {"caller": "market_research"}) or 0
+
+    before = waits()
+    set_rate_limiter(RateLimiter(requests_per_minute=600))
+    try:
+        started = time.perf_counter()
+        stub_worker._call_claude("limited system", "limited task", use_cache=False)
+        stub_worker._call_claude("limited system", "limited task", use_cache=False)
+    finally:
+        set_rate_limiter(None)
+    assert waits() == before + 2
+    assert time.perf_counter() - started < 0.5  # a full minute's bucket allows bursts
+
+
+def test_overload_is_retried_and_halves_the_adaptive_limit(stub_worker):
+    """429 / 529 are retried after retry-after; AIMD cuts once, then grows on success."""
+    from src.core.adaptive_concurrency import (
+        AdaptiveConcurrency, RetryPolicy, set_adaptive_concurrency, set_retry_policy
+    )
+    from tests.performance.fake_anthropic import FailureModel
+
+    class FlakyMessages(StubMessages):
+        def __init__(self, failures):
+            super().__init__()
+            self.failures = failures
+
+        def create(self, **kwargs):
+            if self.failures:
+                self.failures.pop(0).maybe_raise(random.Random(0))
+            return super().create(**kwargs)
+
+    stub_worker.client = SimpleNamespace(messages=FlakyMessages([
+        FailureModel(rate_limit=1.0, retry_after=0.05), FailureModel(overloaded=1.0)
+    ]))
+    concurrency = AdaptiveConcurrency(initial=8)
+    set_adaptive_concurrency(concurrency)
+    set_retry_policy(RetryPolicy(base_delay=0.01, max_delay=0.02, deadline=5))
+    try:
+        started = time.perf_counter()
+        result = stub_worker._call_claude("flaky system", "flaky task", use_cache=False)
+        elapsed = time.perf_counter() - started
+    finally:
+        set_adaptive_concurrency(None)
+        set_retry_policy(None)
+
+    assert result == "Result [cite:1] [cite:2]"
+    assert len(stub_worker.client.messages.calls) == 1
+    assert elapsed >= 0.05  # honored retry-after
+    assert concurrency.limit == 2.5  # 8 -> 4 -> 2, then +1/2 for the success
+    assert concurrency.in_flight == 0
+
+    policy = RetryPolicy(max_retries=3, base_delay=0.2, deadline=0.5)
+    rate_limited = _api_error(FailureModel(rate_limit=1.0, retry_after=0.1))
+    assert 0.1 <= policy.delay(rate_limited, attempt=0, started=time.monotonic()) <= 0.2
+    assert policy.delay(rate_limited, attempt=3, started=time.monotonic()) is None
+    assert policy.delay(rate_limited, attempt=0, started=time.monotonic() - 1) is None  # past the deadline
+    assert policy.delay(ValueError("bug"), attempt=0, started=time.monotonic()) is None
+
+
+def test_slow_call_is_hedged_and_bounded_by_the_deadline(stub_worker):
+    """Past the caller's latency percentile a duplicate races the original; deadlines cap both."""
+    import anthropic
+    from src.core.deadline import Deadline, deadline_scope
+    from src.core.hedging import Hedging, set_hedging
+    from src.utils.metrics import REGISTRY
+
+    class SlowFirstMessages(StubMessages):
+        attempts = 0
+
+        def create(self, **kwargs):
+            self.attempts += 1
+            if self.attempts == 1:
+                time.sleep(0.6)
+            return super().create(**kwargs)
+
+    def hedges(winner):
+        return REGISTRY.get_sample_value(
+            "master_agent_claude_hedges_total", {"caller": "market_research", "winner": winner}
+        ) or 0
+
+    stub_worker.client = SimpleNamespace(messages=SlowFirstMessages())
+    hedging = Hedging(percentile=90, min_samples=3)
+    for seconds in (0.02, 0.03, 0.05):
+        hedging.record("market_research", seconds)
+    assert hedging.delay("market_research") == 0.05
+    assert hedging.delay("competition") is None
+
+    set_hedging(hedging)
+    before, logged = hedges("hedge"), len(stub_worker.usage_log)
+    try:
+        started = time.perf_counter()
+        result = stub_worker._call_claude("hedged system", "hedged task", use_cache=False)
+        elapsed = time.perf_counter() - started
+    finally:
+        set_hedging(None)
+    assert result == "Result [cite:1] [cite:2]"
+    assert elapsed < 0.5
+    assert hedges("hedge") == before + 1
+
+    # The beaten primary is sampled at the latency it had reached, not dropped
+    samples = list(hedging._latencies["market_research"])
+    assert len(samples) == 5 and max(samples) >= 0.05
+    # ...and the loser, still billed, is accounted for once it settles
+    assert len(stub_worker.usage_log) == logged + 1
+    for _ in range(40):
+        if len(stub_worker.usage_log) == logged + 2:
+            break
+        time.sleep(0.05)
+    assert len(stub_worker.usage_log) == logged + 2
+    assert stub_worker.usage_log[-1]["output_tokens"] == 12
+
+    stub_worker.client = SimpleNamespace(messages=StubMessages())
+    with deadline_scope(Deadline.after(5)):
+        stub_worker._call_claude("deadline system", "deadline task", use_cache=False)
+    assert 0 < stub_worker.client.messages.calls[-1]["timeout"] <= 5
+    with deadline_scope(Deadline(time.monotonic())), pytest.raises(TimeoutError):
+        stub_worker._call_claude("expired system", "expired task", use_cache=False)
+    assert len(stub_worker.client.messages.calls) == 1
+    assert issubclass(anthropic.APITimeoutError, anthropic.APIConnectionError)  # retried within the deadline
+
+
+def test_call_queued_behind_the_rate_limiter_is_not_hedged(stub_worker):
+    """The hedge delay runs from admission: waiting for a permit never fires a duplicate."""
+    import threading
+    from src.core.hedging import Hedging, set_hedging
+    from src.core.rate_limiter import RateLimiter, set_rate_limiter
+    from src.utils.metrics import REGISTRY
+
+    def hedges():
+        return sum(
+            REGISTRY.get_sample_value(
+                "master_agent_claude_hedges_total", {"caller": "market_research", "winner": winner}
+            ) or 0
+            for winner in ("primary", "hedge", "none")
+        )
+
+    limiter = RateLimiter(max_concurrent=1)
+    hedging = Hedging(percentile=50, min_samples=1)
+    hedging.record("market_research", 0.02)
+    admitted, release = threading.Event(), threading.Event()
+
+    def hold_permit():
+        with limiter.limit(0):
+            admitted.set()
+            release.wait(5)
+
+    holder = threading.Thread(target=hold_permit)
+    holder.start()
+    admitted.wait(5)
+    threading.Timer(0.3, release.set).start()
+    set_rate_limiter(limiter)
+    set_hedging(hedging)
+    before = hedges()
+    try:
+        started = time.perf_counter()
+        stub_worker._call_claude("queued system", "queued task", use_cache=False)
+        elapsed = time.perf_counter() - started
+    finally:
+        set_hedging(None)
+        set_rate_limiter(None)
+        holder.join()
+
+    assert elapsed >= 0.25  # waited for the permit
+    assert hedges() == before
+    time.sleep(0.1)  # a queued duplicate would go out once the primary frees the permit
+    assert len(stub_worker.client.messages.calls) == 1
+
+
+def test_streams_are_retried_only_before_their_first_chunk():
+    """An overload before any text is retried; one mid-stream reaches the caller."""
+    import asyncio
+    from contextlib import asynccontextmanager
+    from src.core.adaptive_concurrency import RetryPolicy, set_retry_policy
+    from src.core.claude_api import astream_message, stream_message
+    from tests.performance.fake_anthropic import FailureModel
+
+    overload = _api_error(FailureModel(overloaded=1.0))
+
+    def chunks(fail_after):
+        for i, text in enumerate(["a", "b", "c"]):
+            if i == fail_after:
+                raise overload
+            yield text
+
+    async def achunks(fail_after):
+        for text in chunks(fail_after):
+            yield text
+
+    class FlakyStreams:
+        def __init__(self, fail_after):
+            self.fail_after = list(fail_after)
+            self.opened = 0
+
+        def _next(self):
+            self.opened += 1
+            return self.fail_after.pop(0) if self.fail_after else None
+
+        @contextmanager
+        def stream(self, **kwargs):
+            yield SimpleNamespace(text_stream=chunks(self._next()))
+
+        @asynccontextmanager
+        async def astream(self, **kwargs):
+            yield SimpleNamespace(text_stream=achunks(self._next()))
+
+    async def acollect(client):
+        return [text async for text in astream_message(client, {"model": "m"}, use_cache=False)]
+
+    set_retry_policy(RetryPolicy(base_delay=0.01, max_delay=0.02, deadline=5))
+    try:
+        messages = FlakyStreams([0])
+        assert list(stream_message(SimpleNamespace(messages=messages), {"model": "m"}, use_cache=False)) == ["a", "b", "c"]
+        assert messages.opened == 2
+
+        messages = FlakyStreams([0])
+        client = SimpleNamespace(messages=SimpleNamespace(stream=messages.astream))
+        assert asyncio.run(acollect(client)) == ["a", "b", "c"]
+        assert messages.opened == 2
+
+        messages, received = FlakyStreams([1]), []
+        with pytest.raises(type(overload)):
+            for text in stream_message(SimpleNamespace(messages=messages), {"model": "m"}, use_cache=False):
+                received.append(text)
+        assert received == ["a"] and messages.opened == 1
+
+        messages = FlakyStreams([1])
+        client = SimpleNamespace(messages=SimpleNamespace(stream=messages.astream))
+        with pytest.raises(type(overload)):
+            asyncio.run(acollect(client))
+        assert messages.opened == 1
+    finally:
+        set_retry_policy(None)
+
+
+def _api_error(failures) -> Exception:
+    try:
+        failures.maybe_raise(random.Random(0))
+    except Exception as e:
+        return e
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,117 @@
+"""
+Async pipeline tests for Master Agent V4.0-B
+"""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+from src.core.async_worker_agent import AsyncWorkerAgent
+from src.lifecycle.async_agent_lifecycle import AsyncAgentLifecycleManager
+from src.memory.async_project_memory import AsyncProjectMemory
+
+
+class StubAsyncMessages:
+    """Awaitable messages.create returning a canned completion."""
+
+    def __init__(self, text: str, delay: float = 0.0):
+        self.text = text
+        self.delay = delay
+        self.calls = []
+
+    async def create(self, **kwargs):
+        self.calls.append(kwargs)
+        await asyncio.sleep(self.delay)
+        return SimpleNamespace(content=[SimpleNamespace(text=self.text)])
+
+
+class FakeAsyncWorker:
+    def __init__(self, worker_type: str, delay: float = 0.2):
+        self.worker_type = worker_type
+        self.delay = delay
+
+    async def execute_task(self, task, project_memory: str):
+        await asyncio.sleep(self.delay)
+        return {"worker_type": self.worker_type, "result": f"done: {task}", "citations": []}
+
+
+@pytest.mark.asyncio
+async def test_async_project_memory_write_read(tmp_path):
+    """Concurrent writes on one loop are serialized and all land."""
+    memory = AsyncProjectMemory("async_test", base_dir=str(tmp_path))
+
+    await asyncio.gather(*(
+        memory.write_section(f"section_{i}", f"content {i}") for i in range(10)
+    ))
+
+    for i in range(10):
+        assert await memory.read_section(f"section_{i}") == f"content {i}"
+
+
+@pytest.mark.asyncio
+async def test_async_lifecycle_runs_phase_concurrently(tmp_path):
+    """Phase Workers overlap on the loop and keep declaration order."""
+    memory = AsyncProjectMemory("async_phase", base_dir=str(tmp_path))
+    manager = AsyncAgentLifecycleManager(memory, max_parallel_workers=4)
+    manager._summon_workers = lambda types: {t: FakeAsyncWorker(t) for t in types}
+    worker_types = manager._get_phase_workers(1)
+
+    start = time.perf_counter()
+    results = await manager.execute_phase(1, {t: "task" for t in worker_types})
+    elapsed = time.perf_counter() - start
+
+    assert [r["worker_type"] for r in results] == worker_types
+    assert elapsed < 0.6
+
+
+@pytest.mark.asyncio
+async def test_async_lifecycle_runs_worker_graph(tmp_path):
+    """Graph Workers start once their dependencies finish, not at phase ends."""
+    memory = AsyncProjectMemory("async_graph", base_dir=str(tmp_path))
+    manager = AsyncAgentLifecycleManager(memory, max_parallel_workers=4)
+    delays = {"patent_analysis": 0.4}
+    manager._summon_workers = lambda types: {t: FakeAsyncWorker(t, delays.get(t, 0.05)) for t in types}
+
+    results = await manager.execute_graph({t: "task" for t in manager.all_worker_types()})
+
+    assert set(results) == set(manager.all_worker_types())
+    assert manager.schedule["new_business"][1] < manager.schedule["patent_analysis"][1]
+    assert manager.critical_path()[-1]["worker_type"] == "report_writer"
+
+
+@pytest.mark.asyncio
+async def test_async_lifecycle_cancels_workers_past_their_deadline(tmp_path):
+    """An over-budget Worker task is cancelled; its siblings finish normally."""
+    memory = AsyncProjectMemory("async_deadline", base_dir=str(tmp_path))
+    manager = AsyncAgentLifecycleManager(memory, max_parallel_workers=4, worker_timeout=0.2)
+    delays = {"competition": 5.0}
+    manager._summon_workers = lambda types: {t: FakeAsyncWorker(t, delays.get(t, 0.05)) for t in types}
+    worker_types = manager._get_phase_workers(1)
+
+    start = time.perf_counter()
+    results = await manager.execute_phase(1, {t: "task" for t in worker_types})
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 0.5
+    errors = {r["worker_type"]: r.get("error") for r in results}
+    assert errors.pop("competition").startswith("DeadlineExceeded")
+    assert not any(errors.values())
+    assert not [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+
+
+@pytest.mark.asyncio
+async def test_async_worker_agent_executes_task():
+    """AsyncWorkerAgent awaits the client and runs L1 on the output."""
+    worker = AsyncWorkerAgent(api_key="test-key", worker_type="market_research")
+    worker.client = SimpleNamespace(messages=StubAsyncMessages("Market is $10B [cite:1] [cite:2]."))
+
+    result = await worker.execute_task(task="size the market", project_memory="ctx")
+
+    assert result["worker_type"] == "market_research"
+    assert result["citations"] == ["[cite:1]", "[cite:2]"]
+    assert worker.client.messages.calls[0]["max_tokens"] == 8192
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,68 @@
+"""
+Batch runner tests for Master Agent V4.0-B (offline: FakeAnthropic)
+"""
+
+import json
+
+import pytest
+from click.testing import CliRunner
+from src.batch import main
+from src.core import client_pool
+from src.core.rate_limiter import set_rate_limiter
+from tests.performance.benchmark import BENCHMARK_KEY, offline_environment
+from tests.performance.fake_anthropic import AsyncFakeMessages, FakeAnthropic, LatencyModel
+
+
+class CountingMessages(AsyncFakeMessages):
+    """AsyncFakeMessages recording the most calls ever in flight at once."""
+
+    def __init__(self, **settings):
+        super().__init__(**settings)
+        self.in_flight = 0
+        self.peak = 0
+
+    async def create(self, **request):
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            return await super().create(**request)
+        finally:
+            self.in_flight -= 1
+
+
+def test_batch_runs_projects_concurrently_under_a_shared_call_limit(tmp_path):
+    """Every project gets an output record; calls across projects never exceed the cap."""
+    queries = tmp_path / "queries"
+    queries.mkdir()
+    (queries / "batch.jsonl").write_text(
+        json.dumps({"project_id": "batch_a", "query": "Solid-state battery market"}) + "\n\n"
+        + json.dumps({"query": "Hydrogen fuel cell market"}) + "\n",
+        encoding="utf-8",
+    )
+    (queries / "batch_c.txt").write_text("Perovskite solar outlook\n", encoding="utf-8")
+    output = tmp_path / "results.jsonl"
+
+    client = FakeAnthropic(asynchronous=True)
+    client.messages = CountingMessages(latency=LatencyModel("fixed", value=1), time_scale=0.01)
+    with offline_environment(FakeAnthropic()):
+        client_pool.set_shared_client(BENCHMARK_KEY, client, async_client=True)
+        try:
+            result = CliRunner().invoke(main, [
+                str(queries), "--output", str(output), "--projects", "3", "--max-concurrent-calls", "2",
+            ])
+        finally:
+            client_pool.set_shared_client(BENCHMARK_KEY, None, async_client=True)
+            set_rate_limiter(None)
+    assert result.exit_code == 0, result.output
+
+    records = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert sorted(r["project_id"] for r in records) == ["batch_0003", "batch_a", "batch_c"]
+    assert all(r["status"] == "ok" for r in records)
+    assert all(r["api_calls"] == 1 + 8 and r["tokens"]["output_tokens"] > 0 for r in records)
+    assert all(r["critical_path"].endswith("total)") for r in records)
+    assert client.messages.peak == 2
+    assert client.messages.stats["calls"] == 3 * (1 + 8)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,323 @@
+"""
+Lifecycle tests for Master Agent V4.0-B
+"""
+
+import json
+import time
+
+import pytest
+from src.lifecycle.agent_lifecycle import AgentLifecycleManager
+from src.memory.project_memory import ProjectMemory
+
+
+class FakeWorker:
+    """Stand-in Worker that sleeps instead of calling Claude."""
+
+    def __init__(self, worker_type: str, delay: float = 0.05, fail: bool = False):
+        self.worker_type = worker_type
+        self.delay = delay
+        self.fail = fail
+
+    def execute_task(self, task, project_memory: str):
+        time.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("boom")
+        return {"worker_type": self.worker_type, "result": f"done: {task}", "citations": []}
+
+
+def _manager(tmp_path, workers, max_parallel_workers):
+    memory = ProjectMemory("lifecycle_test", base_dir=str(tmp_path))
+    manager = AgentLifecycleManager(memory, max_parallel_workers=max_parallel_workers)
+    manager._summon_workers = lambda worker_types: {t: workers[t] for t in worker_types}
+    return manager
+
+
+def test_execute_phase_runs_workers_concurrently(tmp_path):
+    """Phase 1 Workers overlap instead of running back to back."""
+    worker_types = ["market_research", "tech_analysis", "competition", "patent_analysis"]
+    workers = {t: FakeWorker(t, delay=0.2) for t in worker_types}
+    manager = _manager(tmp_path, workers, max_parallel_workers=4)
+
+    start = time.perf_counter()
+    results = manager.execute_phase(1, {t: f"task {t}" for t in worker_types})
+    elapsed = time.perf_counter() - start
+
+    assert [r["worker_type"] for r in results] == worker_types
+    assert elapsed < 0.6
+
+
+def test_execute_phase_reports_results_as_workers_finish(tmp_path):
+    """on_result sees fast Workers first; the returned list keeps phase order."""
+    worker_types = ["market_research", "tech_analysis", "competition"]
+    delays = {"market_research": 0.3, "tech_analysis": 0.05, "competition": 0.15}
+    workers = {t: FakeWorker(t, delay=delays.get(t, 0)) for t in AgentLifecycleManager.PHASE_WORKERS[1]}
+    manager = _manager(tmp_path, workers, max_parallel_workers=3)
+
+    seen = []
+    results = manager.execute_phase(1, {t: "task" for t in worker_types},
+                                    on_result=lambda r: seen.append(r["worker_type"]))
+
+    assert seen == ["tech_analysis", "competition", "market_research"]
+    assert [r["worker_type"] for r in results] == worker_types
+
+
+def test_execute_phase_isolates_worker_failures(tmp_path):
+    """A failing Worker yields an error entry without aborting the others."""
+    worker_types = ["risk_analysis", "future_prediction", "new_business"]
+    workers = {t: FakeWorker(t, fail=(t == "future_prediction")) for t in worker_types}
+    manager = _manager(tmp_path, workers, max_parallel_workers=2)
+
+    results = manager.execute_phase(2, {t: "task" for t in worker_types})
+
+    assert [r["worker_type"] for r in results] == worker_types
+    assert "error" in results[1]
+    assert results[0]["result"] == "done: task"
+    assert results[2]["result"] == "done: task"
+
+
+def test_missing_prompt_or_checkpoint_store_fails_only_that_worker(tmp_path):
+    """With checkpoints, an unreadable prompt or a failing store never aborts the phase."""
+    from src.memory.checkpoints import Checkpoints
+
+    class PromptedWorker(FakeWorker):
+        def input_fingerprint(self, task, project_memory: str) -> str:
+            if self.fail:
+                raise FileNotFoundError(f"worker_prompts/{self.worker_type}.md")
+            return f"{self.worker_type}:{task}"
+
+    class BrokenStore(Checkpoints):
+        def save(self, name: str, input_hash: str, value):
+            raise OSError("disk full")
+
+    worker_types = ["risk_analysis", "future_prediction", "new_business"]
+    workers = {t: PromptedWorker(t, fail=(t == "new_business")) for t in worker_types}
+    manager = _manager(tmp_path, workers, max_parallel_workers=3)
+    manager.checkpoints = BrokenStore(manager.project_memory)
+    retired = []
+    manager._retire_workers = lambda workers: retired.extend(workers)
+
+    results = manager.execute_phase(2, {t: "task" for t in worker_types})
+
+    assert [r["worker_type"] for r in results] == worker_types
+    assert "error" in results[2]
+    assert results[0]["result"] == results[1]["result"] == "done: task"
+    assert sorted(retired) == sorted(worker_types)
+
+
+def test_checkpoints_rerun_changed_inputs_and_replace_stale_phases(tmp_path):
+    """A fingerprint mismatch is a miss: only that Worker re-runs, and the phase checkpoint is rewritten."""
+    from src.memory.checkpoints import CHECKPOINT_PREFIX, Checkpoints, decode, fingerprint
+
+    memory = ProjectMemory("checkpoint_test", base_dir=str(tmp_path))
+    store = Checkpoints(memory, resume=True)
+    store.save("market_research", fingerprint("task", "ctx"), {"result": "old", "analysis": object()})
+    assert store.load("market_research", fingerprint("task", "ctx")) == {"result": "old"}
+    assert store.load("market_research", fingerprint("new task", "ctx")) is None
+    assert Checkpoints(memory).load("market_research", fingerprint("task", "ctx")) is None  # not resuming
+
+    class CountingWorker(FakeWorker):
+        runs = 0
+
+        def execute_task(self, task, project_memory: str):
+            self.runs += 1
+            return super().execute_task(task, project_memory)
+
+        def input_fingerprint(self, task, project_memory: str) -> str:
+            return fingerprint(self.worker_type, task)
+
+    worker_types = AgentLifecycleManager.PHASE_WORKERS[1]
+    workers = {t: CountingWorker(t, delay=0) for t in worker_types}
+    manager = _manager(tmp_path, workers, max_parallel_workers=4)
+    manager.checkpoints = store
+    tasks = {t: "v1" for t in worker_types}
+
+    manager.execute_phase(1, tasks)
+    stale = memory.read_section(CHECKPOINT_PREFIX + "phase1")
+    manager.execute_phase(1, tasks)
+    assert all(w.runs == 1 for w in workers.values())  # restored from the phase checkpoint
+
+    results = manager.execute_phase(1, dict(tasks, market_research="v2"))
+    assert [w.runs for w in workers.values()] == [2] + [1] * (len(worker_types) - 1)
+    assert results[0]["result"] == "done: v2"
+    fresh = memory.read_section(CHECKPOINT_PREFIX + "phase1")
+    assert fresh != stale and decode(fresh, json.loads(stale)["fingerprint"]) is None
+
+
+def test_resume_reruns_only_unfinished_workers():
+    """A run interrupted in phase 3 resumes from checkpoints with one API call."""
+    from tests.performance.benchmark import offline_environment, run_project
+    from tests.performance.fake_anthropic import FakeAnthropic, LatencyModel
+
+    client = FakeAnthropic(latency=LatencyModel("fixed", value=0), time_scale=0.0)
+    with offline_environment(client):
+        first = run_project("resume_test", "Resumable market analysis")
+        memory = ProjectMemory("resume_test")
+        assert memory.read_section("phase3_results")
+        # Crash before report_writer (the only phase 3 Worker) finished
+        memory.write_sections({"checkpoint_report_writer": "", "checkpoint_phase3": "", "phase3_results": ""})
+        memory.flush()
+
+        calls = client.messages.stats["calls"]
+        resumed = run_project("resume_test", "Resumable market analysis", resume=True)
+        assert client.messages.stats["calls"] - calls == 1
+        assert resumed["worker_failures"] == first["worker_failures"] == 0
+        assert memory.read_section("phase3_results")
+
+        # Without resume nothing is reused
+        calls = client.messages.stats["calls"]
+        run_project("resume_test", "Resumable market analysis")
+        assert client.messages.stats["calls"] - calls == 1 + 8
+
+
+def test_summoned_workers_share_pooled_client(tmp_path, monkeypatch):
+    """Every Worker (and the Master) reuses one client per API key."""
+    from src.core.client_pool import close_shared_clients
+    from src.core.master_agent import MasterAgent
+
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    memory = ProjectMemory("pool_test", base_dir=str(tmp_path))
+    manager = AgentLifecycleManager(memory)
+    phase1 = manager._summon_workers(manager._get_phase_workers(1))
+    phase2 = manager._summon_workers(manager._get_phase_workers(2))
+    master = MasterAgent(api_key="test-key")
+
+    clients = {id(w.client) for w in list(phase1.values()) + list(phase2.values())}
+    assert clients == {id(master.client)}
+    close_shared_clients()
+
+
+def test_worker_pool_capacity_and_idle_eviction():
+    """Parked shells are reset, capped per type and evicted when idle."""
+    from src.core.worker_agent import WorkerAgent
+    from src.lifecycle.worker_pool import WorkerPool
+
+    pool = WorkerPool(capacity_per_type=1, idle_timeout=0.05)
+    worker = WorkerAgent(api_key="test-key", worker_type="competition")
+    worker.last_task = "stale state"
+
+    assert pool.release(worker) is True
+    assert not hasattr(worker, "last_task")
+    assert pool.release(WorkerAgent(api_key="test-key", worker_type="competition")) is False
+    assert pool.acquire("competition") is worker
+
+    pool.release(worker)
+    time.sleep(0.1)
+    assert pool.acquire("competition") is None
+
+
+def test_lazy_retirement_reuses_workers_across_phases(tmp_path):
+    """Lazy strategy hands the same shell to the next phase that needs it."""
+    from src.lifecycle.worker_pool import WorkerPool
+
+    memory = ProjectMemory("lazy_test", base_dir=str(tmp_path))
+    pool = WorkerPool()
+    manager = AgentLifecycleManager(memory, retirement_strategy="lazy", worker_pool=pool)
+
+    first = manager._summon_workers(["market_research"])
+    shell = first["market_research"]
+    manager._retire_workers(first)
+    assert pool.idle_count("market_research") == 1
+
+    second = manager._summon_workers(["market_research"])
+    assert second["market_research"] is shell
+
+
+def test_execute_phase_exports_worker_metrics(tmp_path):
+    """Workers count as active while running; latency is labelled by outcome."""
+    from src.utils.metrics import REGISTRY
+
+    def sample(name, **labels):
+        return REGISTRY.get_sample_value(name, labels) or 0
+
+    worker_types = ["risk_analysis", "future_prediction", "new_business"]
+    workers = {t: FakeWorker(t, fail=(t == "new_business")) for t in worker_types}
+    seen_active = []
+    original = workers["risk_analysis"].execute_task
+
+    def probe(task, project_memory):
+        seen_active.append(sample("master_agent_active_workers", worker_type="risk_analysis"))
+        return original(task, project_memory)
+
+    workers["risk_analysis"].execute_task = probe
+    before_ok = sample("master_agent_worker_seconds_count", worker_type="risk_analysis", status="ok")
+    before_error = sample("master_agent_worker_seconds_count", worker_type="new_business", status="error")
+
+    _manager(tmp_path, workers, max_parallel_workers=3).execute_phase(2, {t: "task" for t in worker_types})
+
+    assert seen_active == [1]
+    assert sample("master_agent_active_workers", worker_type="risk_analysis") == 0
+    assert sample("master_agent_worker_seconds_count", worker_type="risk_analysis", status="ok") == before_ok + 1
+    assert sample("master_agent_worker_seconds_count", worker_type="new_business", status="error") == before_error + 1
+
+
+def test_execute_graph_starts_workers_when_their_inputs_are_ready(tmp_path):
+    """risk_analysis overlaps a slow patent_analysis it does not depend on."""
+    workers = {t: FakeWorker(t, delay=0.05) for t in AgentLifecycleManager.all_worker_types()}
+    workers["patent_analysis"].delay = 0.4
+    contexts = {}
+    original = workers["report_writer"].execute_task
+
+    def capture(task, project_memory):
+        contexts["report_writer"] = project_memory
+        return original(task, project_memory)
+
+    workers["report_writer"].execute_task = capture
+    manager = _manager(tmp_path, workers, max_parallel_workers=4)
+
+    results = manager.execute_graph({t: f"task {t}" for t in workers})
+
+    schedule = manager.schedule
+    assert set(results) == set(workers)
+    assert schedule["risk_analysis"][1] < schedule["patent_analysis"][1]
+    assert schedule["future_prediction"][0] >= schedule["patent_analysis"][1]
+    assert [step["worker_type"] for step in manager.critical_path()] == [
+        "patent_analysis", "future_prediction", "report_writer"
+    ]
+    assert "phase2_results (risk_analysis)" in contexts["report_writer"]
+    assert "phase1_results (market_research)" in contexts["report_writer"]
+
+
+def test_workers_past_their_deadline_are_abandoned(tmp_path):
+    """A hung Worker costs its worker_execution budget (or what is left of the project's), no more."""
+    from src.core.deadline import Deadline, deadline_scope
+
+    worker_types = ["market_research", "tech_analysis", "competition"]
+    workers = {t: FakeWorker(t, delay=1.0 if t == "tech_analysis" else 0.05)
+               for t in AgentLifecycleManager.PHASE_WORKERS[1]}
+    manager = _manager(tmp_path, workers, max_parallel_workers=3)
+    manager.worker_timeout = 0.2
+
+    start = time.perf_counter()
+    results = manager.execute_phase(1, {t: "task" for t in worker_types})
+    assert time.perf_counter() - start < 0.6
+    assert [r["worker_type"] for r in results] == worker_types
+    assert results[1]["error"].startswith("DeadlineExceeded")
+    assert "error" not in results[0] and "error" not in results[2]
+
+    workers = {t: FakeWorker(t, delay=0.05) for t in AgentLifecycleManager.all_worker_types()}
+    workers["patent_analysis"].delay = 1.0
+    manager = _manager(tmp_path, workers, max_parallel_workers=4)
+    start = time.perf_counter()
+    with deadline_scope(Deadline.after(0.3)):
+        results = manager.execute_graph({t: "task" for t in workers})
+    assert time.perf_counter() - start < 0.7
+    assert results["patent_analysis"]["error"].startswith("DeadlineExceeded")
+    assert "error" not in results["risk_analysis"]
+
+
+def test_worker_graph_derives_phases_and_rejects_cycles():
+    """Phases are dependency depths; cycles and unknown inputs fail fast."""
+    from src.lifecycle.worker_graph import WorkerGraph
+
+    graph = WorkerGraph({"a": (), "b": ("a",), "c": ("a", "b")})
+    assert graph.phases() == {1: ["a"], 2: ["b"], 3: ["c"]}
+    assert graph.ancestors("c") == ("a", "b")
+
+    with pytest.raises(ValueError, match="cycle: a -> b -> a"):
+        WorkerGraph({"a": ("b",), "b": ("a",)})
+    with pytest.raises(ValueError, match="undeclared"):
+        WorkerGraph({"a": ("z",)})
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
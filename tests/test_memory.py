@@ -0,0 +1,194 @@
+"""
+ProjectMemory storage tests for Master Agent V4.0-B
+"""
+
+import pytest
+from src.memory.project_memory import ProjectMemory
+
+
+def test_reads_are_served_from_section_index(tmp_path, monkeypatch):
+    """Repeated reads of an unchanged file parse it only once."""
+    memory = ProjectMemory("index_test", base_dir=str(tmp_path))
+    memory.write_section("user_query", "hydrogen fuel cells")
+    memory.write_section("phase1_plan", "Plan A")
+
+    parses = []
+    original = memory._store._load
+    monkeypatch.setattr(memory._store, "_load", lambda *a: parses.append(1) or original(*a))
+
+    for _ in range(5):
+        assert memory.read_section("user_query") == "hydrogen fuel cells"
+        assert "Plan A" in memory.get_summary()
+    assert parses == []
+
+
+def test_external_edits_invalidate_index(tmp_path):
+    """A change made outside the process is visible on the next read."""
+    memory = ProjectMemory("external_edit", base_dir=str(tmp_path))
+    memory.write_section("user_query", "old query")
+
+    other = ProjectMemory("external_edit", base_dir=str(tmp_path))
+    other.write_section("user_query", "a much longer new query")
+
+    assert memory.read_section("user_query") == "a much longer new query"
+
+
+def test_last_updated_timestamp_is_replaced(tmp_path):
+    """Each write replaces the footer timestamp instead of stacking them."""
+    memory = ProjectMemory("timestamp_test", base_dir=str(tmp_path))
+    for i in range(3):
+        memory.write_section("user_query", f"query {i}")
+
+    footer = [l for l in memory.read_all().split('\n') if l.startswith("**Last Updated**")]
+    assert len(footer) == 1
+    assert len(footer[0].split()) == 3
+
+
+def test_write_behind_coalesces_until_flush(tmp_path):
+    """Pending updates are readable immediately but hit disk in one write."""
+    with ProjectMemory("write_behind", base_dir=str(tmp_path), write_behind=True) as memory:
+        memory.write_section("user_query", "draft")
+        memory.write_section("user_query", "final")
+        memory.write_section("start_time", "now")
+
+        assert memory.read_section("user_query") == "final"
+        assert "## user_query" not in memory.file_path.read_text()
+
+    on_disk = ProjectMemory("write_behind", base_dir=str(tmp_path))
+    assert on_disk.read_section("user_query") == "final"
+    assert on_disk.read_section("start_time") == "now"
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_flush_merges_updates_from_other_writers(tmp_path):
+    """Section updates from two writers on one file are both kept."""
+    first = ProjectMemory("merge_test", base_dir=str(tmp_path), write_behind=True)
+    second = ProjectMemory("merge_test", base_dir=str(tmp_path), write_behind=True)
+
+    first.write_section("phase1_results", "from first")
+    second.write_section("phase2_results", "from second")
+    first.flush()
+    second.flush()
+
+    reader = ProjectMemory("merge_test", base_dir=str(tmp_path))
+    assert reader.read_section("phase1_results") == "from first"
+    assert reader.read_section("phase2_results") == "from second"
+
+
+def test_concurrent_writers_lock_the_memory_file_itself(tmp_path):
+    """Writers racing on one file (each replacing it) lose no update and leave no lock file."""
+    import threading
+
+    writers = [ProjectMemory("race_test", base_dir=str(tmp_path)) for _ in range(6)]
+    threads = [
+        threading.Thread(target=lambda w=w, i=i: [w.write_section(f"section_{i}_{n}", f"{i}:{n}") for n in range(5)])
+        for i, w in enumerate(writers)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    reader = ProjectMemory("race_test", base_dir=str(tmp_path))
+    assert all(reader.read_section(f"section_{i}_{n}") == f"{i}:{n}" for i in range(6) for n in range(5))
+    assert [p.name for p in tmp_path.iterdir()] == ["PROJECT_MEMORY_race_test.md"]
+
+
+def test_sqlite_backend_roundtrip_and_history(tmp_path):
+    """SQLite rows keep every version and render markdown on demand."""
+    from src.memory.sqlite_storage import SQLiteStorage
+
+    storage = SQLiteStorage(str(tmp_path / "memory.db"))
+    memory = ProjectMemory("sqlite_test", base_dir=str(tmp_path), storage=storage)
+    memory.write_section("user_query", "v1")
+    memory.write_section("user_query", "v2")
+    memory.write_section("phase1_plan", "Plan A")
+
+    assert memory.read_section("user_query") == "v2"
+    assert [v for v, _, _ in memory._store.history("user_query")] == [1, 2]
+
+    exported = memory.export_markdown().read_text()
+    assert "## user_query\nv2" in exported
+    assert exported.index("## user_query") < exported.index("## phase1_plan")
+
+
+def test_sqlite_backend_keeps_each_base_dir_separate(tmp_path, monkeypatch):
+    """A relative memory.sqlite_path lives under the ProjectMemory's base_dir."""
+    from src.memory import storage
+
+    settings = {("memory", "storage_backend"): "sqlite", ("memory", "sqlite_path"): "project_memory.db"}
+    monkeypatch.setattr(storage, "get_setting", lambda *keys, default=None: settings.get(keys, default))
+
+    first = ProjectMemory("isolated", base_dir=str(tmp_path / "a"))
+    second = ProjectMemory("isolated", base_dir=str(tmp_path / "b"))
+    first.write_section("user_query", "only in a")
+
+    assert first.storage is not second.storage
+    assert first.storage.db_path == tmp_path / "a" / "project_memory.db"
+    assert second.read_section("user_query") != "only in a"
+    absolute = storage.open_storage("sqlite", base_dir=str(tmp_path / "c"), sqlite_path=str(tmp_path / "shared.db"))
+    assert absolute.db_path == tmp_path / "shared.db"
+
+
+def test_cross_project_score_queries(tmp_path):
+    """'overall < 0.8' is an index lookup on SQLite and a scan on markdown."""
+    from src.memory.markdown_storage import MarkdownStorage
+    from src.memory.sqlite_storage import SQLiteStorage
+
+    for storage in (SQLiteStorage(str(tmp_path / "scores.db")), MarkdownStorage(str(tmp_path / "md"))):
+        for project_id, overall in [("low", 0.62), ("mid", 0.79), ("high", 0.91)]:
+            memory = ProjectMemory(project_id, base_dir=str(tmp_path), storage=storage)
+            memory.write_section("iam_sdai_scores", str({"impact": 0.9, "overall": overall, "passed": False}))
+
+        assert storage.list_projects() == ["high", "low", "mid"]
+        assert storage.find_projects("overall", below=0.8) == ["low", "mid"]
+        assert storage.find_projects("overall", at_least=0.9) == ["high"]
+
+
+def test_phase_sections_handle_multi_digit_phases(monkeypatch):
+    """A Worker sees earlier phases and its own plan, phase 10 included."""
+    from src.memory import context_packer
+
+    monkeypatch.setattr(context_packer, "CONTEXT_SECTIONS", context_packer.CONTEXT_SECTIONS + (
+        "phase10_plan", "phase10_results", "phase11_plan", "phase11_results",
+    ))
+    assert context_packer.phase_sections(2) == ("user_query", "phase1_plan", "phase1_results", "phase2_plan")
+    visible = context_packer.phase_sections(10)
+    assert "phase3_results" in visible and "phase10_plan" in visible
+    assert "phase10_results" not in visible and "phase11_plan" not in visible
+
+
+def test_worker_contexts_fill_budget_by_relevance(tmp_path):
+    """Each Worker type gets the phase results it depends on first, within budget."""
+    from src.memory.context_packer import _token_counter
+    from src.utils.tokens import estimate_tokens
+
+    memory = ProjectMemory("packer_test", base_dir=str(tmp_path))
+    memory.write_sections({
+        "user_query": "solid-state batteries",
+        "phase1_plan": "Plan B",
+        "phase1_results": str({
+            "workers": ["market_research", "tech_analysis", "competition", "patent_analysis"],
+            "results": [f"{name} finding " * 60 for name in ("market", "tech", "rival", "patent")],
+            "contradictions": [],
+            "validation_passed": True,
+        }),
+    })
+
+    misses = _token_counter.misses
+    contexts = memory.get_worker_contexts(["risk_analysis", "future_prediction"], budget_tokens=260)
+    assert _token_counter.misses - misses == 6  # query, plan, four results: measured once for both
+
+    risk, future = contexts["risk_analysis"], contexts["future_prediction"]
+    assert risk.startswith("**user_query**: solid-state batteries")
+    assert "rival finding" in risk and "tech finding" not in risk
+    assert "tech finding" in future and "rival finding" not in future
+    assert all(estimate_tokens(context) <= 260 + 40 for context in contexts.values())  # titles add a little
+
+    memory.get_worker_contexts(["new_business"], budget_tokens=260)
+    assert _token_counter.misses - misses == 6  # unchanged sections are not re-measured
+    assert len(memory.get_summary()) <= 1000  # memory.summary_max_chars
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,254 @@
+"""
+Quality validation tests for Master Agent V4.0-B
+"""
+
+import re
+
+import pytest
+from src.quality.document import analyze
+from src.quality.l1_self_check import SelfChecker
+from src.quality.l2_cross_validation import CrossValidator
+from src.quality.l2_claim_index import parse_claim
+from src.quality.l2_metric_index import MetricIndex, metric_phrase
+from src.quality.l3_batch import CorpusScores, reports_from_directory, reports_from_memory
+from src.quality.l3_iam_sdai import IAMSDAI
+from src.memory.markdown_storage import MarkdownStorage
+from src.memory.project_memory import ProjectMemory
+
+
+def test_incremental_l1_matches_full_check():
+    """Chunked L1 gives the same verdict as a full-text check, at any split."""
+    checker = SelfChecker()
+    text = (
+        "Market grew 10-20% [cite:1] according to Gartner Research. "
+        "Capex fell from 20 - 10 units [cite:2] [cite:3] in 2024."
+    )
+
+    for size in (1, 3, 7, len(text)):
+        check = checker.start("market_research")
+        for i in range(0, len(text), size):
+            check.feed(text[i:i + size])
+        assert check.finish() == checker.check(text, "market_research")
+        assert check.citations == ["[cite:1]", "[cite:2]", "[cite:3]"]
+        assert check.ranges_valid is False
+        assert check.document.numbers == analyze(text).numbers
+
+
+def test_analyzed_document_single_pass():
+    """One tokenizer pass collects everything the three tiers need."""
+    doc = analyze(
+        "Revenue should reach $5M [cite:1], for example 10-20% growth "
+        "according to IDC Data. However costs rose 1,200 - 1,500 units [cite:2]."
+    )
+
+    assert doc.citations == ["[cite:1]", "[cite:2]"]
+    assert doc.ranges == [(10.0, 20.0), (1200.0, 1500.0)]
+    assert doc.ranges_valid
+    assert doc.sources == ["IDC Data"]
+    assert (5.0, "$", 1e6) in [(n.value, n.unit, n.scale) for n in doc.numbers]
+    assert (10.0, "%", 20.0) in [(n.value, n.unit, n.high) for n in doc.numbers]
+    assert doc.markers["action"] == 1 and doc.markers["example"] == 1
+    assert doc.markers["viewpoint"] == 1
+    assert analyze(doc.text) is doc
+
+
+def test_iamsdai_scores_unchanged_by_shared_analysis():
+    """L3 marker counts match the per-dimension regex scans they replace."""
+    text = (
+        "We must act because demand grows; thus, as mentioned, we suggest a pilot. "
+        "Alternatively, such as in 2023 [cite:4], consequently SHOULD expand. " * 20
+    )
+    scores = IAMSDAI().validate(text)
+
+    actions = len(re.findall(r'(should|must|recommend|suggest)', text, re.IGNORECASE))
+    examples = len(re.findall(r'(for example|such as|specifically)', text, re.IGNORECASE))
+    analysis = len(re.findall(r'(because|therefore|consequently|thus|implies)', text, re.IGNORECASE))
+    assert scores["impact"] == round(min(1.0, actions * 0.05 + examples * 0.1), 2)
+    assert scores["depth"] == round(min(1.0, analysis * 0.05), 2)
+    assert scores["accuracy"] == round(min(1.0, 20 * 0.02), 2)
+
+
+def test_cross_validator_reuses_worker_analysis():
+    """L2 reads the Worker's analysis instead of re-tokenizing the result."""
+    raw = "Market is $10B [cite:1]. Growth is 15% [cite:2]."
+    doc = analyze(raw)
+    validator = CrossValidator()
+
+    result = {"worker_type": "market_research", "result": raw + "\n\n**L1 Validation Warnings:**", "analysis": doc}
+    assert validator._document(result) is doc
+    assert validator._document({"worker_type": "x", "result": raw}) is doc
+
+
+
+def test_numerical_contradictions_are_indexed_by_metric():
+    """Same (metric, unit, scale, period) with values apart beyond tolerance conflicts."""
+    results = [
+        {"worker_type": "market_research",
+         "result": "The global market size is $10B [cite:1]. Annual growth is 10-20% [cite:2]."},
+        {"worker_type": "financial_modeling",
+         "result": "Market sizes will reach $14B. Annual growth of 15% is expected."},
+        {"worker_type": "competitive_analysis",
+         "result": "Overall the market size stands at about $10.5B. Customer churn is 5%."},
+    ]
+
+    contradictions = CrossValidator(numerical_tolerance=0.1).validate(results)["contradictions"]
+    assert contradictions == [
+        "Numerical contradiction on 'market size': market_research reports $10B, financial_modeling reports $14B",
+        "Numerical contradiction on 'market size': financial_modeling reports $14B, competitive_analysis reports $10.5B",
+    ]
+
+    # A looser tolerance accepts the spread
+    assert CrossValidator(numerical_tolerance=0.5).validate(results)["validation_passed"]
+
+
+def test_metric_index_keys():
+    """Metric phrases drop filler words and stay inside their clause."""
+    text = "Revenue grew; the total addressable markets are about $5M"
+    assert metric_phrase(text, text.index("$")) == "addressable market"
+
+    index = MetricIndex()
+    index.add("a", analyze("Launched in 2021. Headcount is 120 people."))
+    assert index.keys() == [("headcount", "", 1.0, "")]
+
+
+def test_labels_and_periods_are_not_contradictions():
+    """Ordinals, labels and period tags name things; values of different periods never collide."""
+    pairs = [
+        ("Phase 1 covers sizing.", "Phase 2 covers pricing."),
+        ("We shortlist the top 3 vendors.", "We shortlist the top 5 vendors."),
+        ("Details: see Table 2.", "Details: see Table 4."),
+        ("Q1 revenue $2B", "Q3 revenue $3B"),
+        ("H1 revenue was $2B.", "H2 revenue was $3B."),
+        ("FY24 revenue was $2B.", "FY25 revenue was $3B."),
+        ("Revenue was $2B in 2024.", "Revenue will be $3B in 2030."),
+        ("The 5-year CAGR is 12%.", "The 10-year CAGR is 8%."),
+        ("The 3rd largest vendor holds 12%.", "The 5th largest vendor holds 12%."),
+        ("The H100 price is high.", "The A800 price is high."),
+    ]
+    for first, second in pairs:
+        index = MetricIndex(tolerance=0.0)
+        index.add("a", analyze(first))
+        assert index.add("b", analyze(second)) == [], (first, second)
+
+    index = MetricIndex(tolerance=0.0)
+    index.add("a", analyze("In 2024 revenue was $2B, and in 2030 revenue was $5B."))
+    assert index.keys() == [("revenue", "$", 1e9, "2024"), ("revenue", "$", 1e9, "2030")]
+    assert index.add("b", analyze("Q1 revenue $2B. In 2024 revenue was $2.4B.")) == [
+        "Numerical contradiction on 'revenue' (2024): a reports $2B, b reports $2.4B"
+    ]
+
+
+def test_claim_contradictions_by_direction_and_negation():
+    """Claims sharing a subject conflict on opposite direction or polarity."""
+    results = [
+        {"worker_type": "market_research",
+         "result": "The European market will grow rapidly. Regulation is not a barrier. Pricing power is strong."},
+        {"worker_type": "risk_assessment",
+         "result": "Analysts agree the European market will decline next year.\n- Regulation is a barrier\nChurn is low."},
+        {"worker_type": "technical_analysis",
+         "result": "Is pricing power strong? Latency is low."},
+    ]
+
+    contradictions = CrossValidator()._check_claim_contradictions(results)
+    assert contradictions == [
+        "Claim contradiction on 'european market': market_research says \"The European market will grow rapidly\", "
+        "risk_assessment says \"Analysts agree the European market will decline next year\"",
+        "Claim contradiction on 'regulation': market_research says \"Regulation is not a barrier\", "
+        "risk_assessment says \"Regulation is a barrier\"",
+    ]
+
+
+def test_claims_sharing_only_a_modifier_or_head_do_not_conflict():
+    """One shared noun is not a shared subject: the head noun must match and most terms overlap."""
+    pairs = [
+        ("Battery costs will decline.", "Battery demand will grow."),
+        ("Demand for lithium is high.", "Lithium prices are low."),
+        ("Regulatory risk is low.", "Competitive risk is high."),
+    ]
+    for first, second in pairs:
+        results = [{"worker_type": "a", "result": first}, {"worker_type": "b", "result": second}]
+        assert CrossValidator()._check_claim_contradictions(results) == [], (first, second)
+
+    results = [
+        {"worker_type": "a", "result": "Regulatory risk is low."},
+        {"worker_type": "b", "result": "Risk is high."},
+    ]
+    assert len(CrossValidator()._check_claim_contradictions(results)) == 1
+
+
+def test_claim_normalization_and_contradiction_tolerance():
+    """"won't shrink" asserts growth; tolerated contradictions still pass L2."""
+    claim = parse_claim("w", "The market won't shrink")
+    assert claim.subject == ("market",) and claim.stance == 1
+
+    results = [
+        {"worker_type": "a", "result": "The market will grow."},
+        {"worker_type": "b", "result": "The market will contract."},
+    ]
+    validator = CrossValidator()
+    assert validator.validate(results)["validation_passed"] is False
+    validator.contradiction_tolerance = 1
+    assert validator.validate(results)["validation_passed"] is True
+
+
+def test_incremental_cross_validation():
+    """Contradictions surface on the result that causes them; validate() only aggregates."""
+    first = {"worker_type": "a", "result": "Market size is $10B. The market will grow."}
+    second = {"worker_type": "b", "result": "Market size is $20B."}
+    third = {"worker_type": "c", "result": "The market will decline."}
+    validator = CrossValidator()
+
+    assert validator.add(first) == []
+    assert len(validator.add(second)) == 1
+    assert validator.add(third)[0].startswith("Claim contradiction on 'market'")
+
+    validator.add = None  # validate() must not re-index anything
+    aggregated = validator.validate([first, second, third])
+    assert aggregated["workers"] == ["a", "b", "c"]
+    assert len(aggregated["contradictions"]) == 2
+
+
+def test_batch_scores_match_single_report_scores():
+    """validate_batch gives, row by row, exactly what validate() gives."""
+    reports = [
+        "",
+        "We should act [cite:1]; however, thus, as mentioned. " * 9,
+        ("word " * 125) + "for example, such as, because [cite:2] [cite:3]",
+        "Must recommend. Alternatively, conversely, referring to " * 40,
+    ]
+    weights = {"impact": 2, "accuracy": 1, "coverage": 1, "diversity": 0.5, "depth": 1, "integration": 1}
+
+    for validator in (IAMSDAI(), IAMSDAI(threshold=0.3, weights=weights)):
+        batch = validator.validate_batch(reports)
+        for i, report in enumerate(reports):
+            single = validator.validate(report)
+            assert {k: batch[k][i] for k in single} == single
+
+
+def test_corpus_rescoring_from_directory_and_memory(tmp_path):
+    """Corpora stream from disk or ProjectMemory; rescoring never re-reads text."""
+    reports_dir = tmp_path / "reports"
+    reports_dir.mkdir()
+    (reports_dir / "a.md").write_text("We should act [cite:1]. However, thus.", encoding="utf-8")
+    (reports_dir / "b.md").write_text("Plain text.", encoding="utf-8")
+
+    corpus = CorpusScores.from_reports(reports_from_directory(reports_dir))
+    assert corpus.ids == ["a.md", "b.md"]
+    assert corpus.features.shape == (2, 7)
+    assert not corpus.scores["passed"].any()
+    assert corpus.rescore(threshold=0.01).scores["passed"].tolist() == [True, False]
+
+    corpus.save(tmp_path / "corpus.npz")
+    reloaded = CorpusScores.load(tmp_path / "corpus.npz")
+    assert reloaded.ids == corpus.ids
+    assert (reloaded.scores["overall"] == corpus.scores["overall"]).all()
+
+    memory_dir = tmp_path / "memories"
+    ProjectMemory("with_report", base_dir=str(memory_dir)).write_section("phase3_results", "Final [cite:1]")
+    ProjectMemory("no_report", base_dir=str(memory_dir))
+    reports = list(reports_from_memory(MarkdownStorage(str(memory_dir))))
+    assert reports == [("with_report", "Final [cite:1]")]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])